@@ -0,0 +1,212 @@
+"""
+Incremental backups for Kanban data - content-addressed chunks shared between backups
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from models import now_utc
+
+
+# Content-defined chunking: a chunk ends before a '{' whose next WINDOW bytes hash to
+# 0 mod DIVISOR. '{' starts every task/board/column in JSON (and history log entries),
+# and the bytes after it include the record's id, so an edit only changes its own chunk
+# instead of shifting every boundary behind it.
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 1024 * 1024
+WINDOW = 32
+DIVISOR = 256
+READ_SIZE = 4 * 1024 * 1024
+
+
+def split_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield the content-defined chunks of a stream, reading it in blocks"""
+    buf = b""
+    start = 0
+    eof = False
+    while True:
+        if not eof and len(buf) - start < MAX_CHUNK + WINDOW:
+            block = stream.read(READ_SIZE)
+            if block:
+                buf = buf[start:] + block
+                start = 0
+                continue
+            eof = True
+        if start >= len(buf):
+            return
+
+        end = min(len(buf), start + MAX_CHUNK)
+        cut = end
+        pos = buf.find(b"{", start + MIN_CHUNK, end)
+        while pos != -1:
+            if zlib.crc32(buf[pos:pos + WINDOW]) % DIVISOR == 0:
+                cut = pos
+                break
+            pos = buf.find(b"{", pos + 1, end)
+        yield buf[start:cut]
+        start = cut
+
+
+class BackupStore:
+    """A directory of zlib-compressed chunks named by their SHA-256, plus one manifest per backup
+
+    A manifest lists, for every backed-up file, its path relative to the
+    data directory and the hashes of its chunks in order. Chunks already in
+    the store are not written again, so a backup only costs what changed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.manifests_dir = root / "manifests"
+
+    @contextmanager
+    def _lock(self, shared: bool = False) -> Iterator[None]:
+        """Keep prune from deleting chunks a concurrent backup is about to reference"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.root / "lock", os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _write_atomic(self, path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp_')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def create(self, files: List[Tuple[str, Path]]) -> Dict[str, Any]:
+        """Back up `files` as (name relative to the data directory, path to read) pairs"""
+        with self._lock(shared=True):
+            created = now_utc()
+            backup_id = created.strftime("%Y%m%d_%H%M%S")
+            suffix = 1
+            while (self.manifests_dir / f"{backup_id}.json").exists():
+                suffix += 1
+                backup_id = f"{created.strftime('%Y%m%d_%H%M%S')}-{suffix}"
+
+            entries = []
+            new_chunks = new_bytes = total = 0
+            for name, path in files:
+                chunks = []
+                size = 0
+                with open(path, 'rb') as f:
+                    for chunk in split_chunks(f):
+                        digest = hashlib.sha256(chunk).hexdigest()
+                        target = self._object_path(digest)
+                        if not target.exists():
+                            compressed = zlib.compress(chunk)
+                            self._write_atomic(target, compressed)
+                            new_chunks += 1
+                            new_bytes += len(compressed)
+                        chunks.append(digest)
+                        size += len(chunk)
+                entries.append({"name": name, "size": size, "chunks": chunks})
+                total += size
+
+            manifest = {
+                "id": backup_id,
+                "created_at": created.isoformat(),
+                "files": entries,
+                "size": total,
+                "new_chunks": new_chunks,
+                "new_bytes": new_bytes,
+            }
+            # Written last: a backup exists only once all of its chunks do
+            self._write_atomic(
+                self.manifests_dir / f"{backup_id}.json",
+                json.dumps(manifest, indent=2).encode('utf-8')
+            )
+            return manifest
+
+    def list(self) -> List[Dict[str, Any]]:
+        """All manifests, oldest first"""
+        if not self.manifests_dir.exists():
+            return []
+        manifests = []
+        for path in self.manifests_dir.glob("*.json"):
+            try:
+                manifests.append(json.loads(path.read_bytes()))
+            except json.JSONDecodeError:
+                continue
+        return sorted(manifests, key=lambda m: (m["created_at"], m["id"]))
+
+    def get(self, backup_id: str) -> Optional[Dict[str, Any]]:
+        path = self.manifests_dir / f"{backup_id}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_bytes())
+
+    def restore(self, manifest: Dict[str, Any], base_dir: Path, current: List[str]) -> None:
+        """Reassemble the backed-up files under `base_dir`, one chunk at a time
+
+        Files named in `current` (the live file set) that the backup doesn't
+        contain are removed, so the result matches the backup exactly.
+        """
+        with self._lock(shared=True):
+            missing = [
+                digest for entry in manifest["files"] for digest in entry["chunks"]
+                if not self._object_path(digest).exists()
+            ]
+            if missing:
+                raise FileNotFoundError(f"Backup {manifest['id']} is missing {len(missing)} chunks")
+
+            for entry in manifest["files"]:
+                target = base_dir / entry["name"]
+                target.parent.mkdir(parents=True, exist_ok=True)
+                temp_fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix='.kanban_tmp_')
+                try:
+                    with os.fdopen(temp_fd, 'wb') as out:
+                        for digest in entry["chunks"]:
+                            chunk = zlib.decompress(self._object_path(digest).read_bytes())
+                            if hashlib.sha256(chunk).hexdigest() != digest:
+                                raise ValueError(f"Chunk {digest} is corrupted")
+                            out.write(chunk)
+                    os.replace(temp_path, target)
+                except Exception:
+                    if os.path.exists(temp_path):
+                        os.unlink(temp_path)
+                    raise
+
+            restored = {entry["name"] for entry in manifest["files"]}
+            for name in current:
+                if name not in restored:
+                    (base_dir / name).unlink(missing_ok=True)
+
+    def prune(self, keep: int) -> Tuple[List[str], int]:
+        """Delete all but the newest `keep` backups and the chunks only they used
+
+        Returns the removed backup ids and the number of chunks deleted.
+        """
+        with self._lock():
+            manifests = self.list()
+            doomed = manifests[:max(len(manifests) - keep, 0)]
+            for manifest in doomed:
+                (self.manifests_dir / f"{manifest['id']}.json").unlink(missing_ok=True)
+
+            live = {digest for m in manifests[len(doomed):] for entry in m["files"] for digest in entry["chunks"]}
+            removed = 0
+            if self.objects_dir.exists():
+                for path in self.objects_dir.glob("*/*"):
+                    if path.parent.name + path.name not in live:
+                        path.unlink()
+                        removed += 1
+            return [m["id"] for m in doomed], removed
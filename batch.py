@@ -0,0 +1,240 @@
+"""
+Batch operations for Kanban data - many changes applied in one load/save cycle
+
+Each operation is a JSON object on its own line (NDJSON), named by "op":
+
+    {"op": "add", "title": "...", "column": "todo", "priority": "high", "tags": ["x"]}
+    {"op": "move", "task_id": 7, "column": "done", "reason": "merged"}
+    {"op": "edit", "task_id": 7, "title": "...", "add_tags": ["y"], "remove_tags": ["x"]}
+    {"op": "agent-context", "task_id": 7, "key": "nextStep", "value": "deploy"}
+    {"op": "delete", "task_id": 7}
+
+The fields and checks are those of the CLI command of the same name
+(`board` is its --board). Operations run in order against one loaded
+KanbanData, so later ones see what earlier ones did. Each one is checked
+before it changes anything, so a failed operation leaves the data as it
+was.
+"""
+
+import json
+from typing import Annotated, Any, Dict, Iterable, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from models import KanbanData, Board, Task, Priority, KanbanError, BoardNotFoundError, TaskNotFoundError, ColumnError
+from models import now_utc
+
+
+class AddOp(BaseModel):
+    op: Literal["add"]
+    title: str
+    description: Optional[str] = None
+    priority: Priority = Priority.MEDIUM
+    tags: List[str] = Field(default_factory=list)
+    column: str = "todo"
+    board: Optional[str] = None
+    agent_context: Dict[str, Any] = Field(default_factory=dict)
+
+
+class MoveOp(BaseModel):
+    op: Literal["move"]
+    task_id: int
+    column: str
+    reason: Optional[str] = None
+    board: Optional[str] = None
+
+
+class EditOp(BaseModel):
+    op: Literal["edit"]
+    task_id: int
+    # Checked here because assigning to a task isn't validated
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    priority: Optional[Priority] = None
+    add_tags: List[str] = Field(default_factory=list)
+    remove_tags: List[str] = Field(default_factory=list)
+
+
+class ContextOp(BaseModel):
+    op: Literal["agent-context"]
+    task_id: int
+    key: str
+    value: Any
+
+
+class DeleteOp(BaseModel):
+    op: Literal["delete"]
+    task_id: int
+    board: Optional[str] = None
+
+
+Operation = Annotated[Union[AddOp, MoveOp, EditOp, ContextOp, DeleteOp], Field(discriminator="op")]
+OPERATION = TypeAdapter(Operation)
+
+
+class BatchAborted(KanbanError):
+    """Raised when an all-or-nothing batch hits a failed operation; carries every operation's result"""
+
+    def __init__(self, failed_line: int, results: List[Dict[str, Any]]):
+        super().__init__(f"Operation on line {failed_line} failed; nothing was applied")
+        self.failed_line = failed_line
+        self.results = results
+
+
+def _describe(exc: Exception) -> tuple[Optional[str], str]:
+    """(op, message) for a failed operation; op is None if the line didn't name a known one"""
+    if not isinstance(exc, ValidationError):
+        return None, str(exc)
+    op = None
+    messages = []
+    for err in exc.errors():
+        loc = list(err["loc"])
+        # Field errors are located under the op's tag
+        if loc and loc[0] in HANDLERS:
+            op = loc.pop(0)
+        messages.append(f"{'.'.join(str(part) for part in loc)}: {err['msg']}" if loc else err["msg"])
+    return op, "; ".join(messages)
+
+
+def _task_board(data: KanbanData, task_id: int, board_id: Optional[str]) -> Board:
+    """The board named, or else the board holding the task"""
+    if board_id is None:
+        board = data.locate_task(task_id)
+        if not board:
+            raise TaskNotFoundError(f"Task #{task_id} not found")
+        return board
+    board = data.get_board(board_id)
+    if not board:
+        raise BoardNotFoundError(f"Board '{board_id}' not found")
+    return board
+
+
+def _add(data: KanbanData, op: AddOp) -> Dict[str, Any]:
+    board = data.get_board(op.board)
+    if not board:
+        raise BoardNotFoundError(f"Board '{op.board}' not found")
+    can_add, error_msg = board.can_add_to_column(op.column)
+    if not can_add:
+        raise ColumnError(error_msg)
+
+    # Validated before the id is taken, so a rejected task doesn't use one up
+    task = Task(
+        id=data.next_task_id,
+        board_id=board.id,
+        column_id=op.column,
+        title=op.title,
+        description=op.description,
+        priority=op.priority,
+        tags=op.tags,
+        agent_context=op.agent_context
+    )
+    data.allocate_task_id()
+    board.add_task(task)
+    return {"task_id": task.id, "board": board.id}
+
+
+def _move(data: KanbanData, op: MoveOp) -> Dict[str, Any]:
+    board = _task_board(data, op.task_id, op.board)
+    task = board.get_task(op.task_id)
+    if not task:
+        raise TaskNotFoundError(f"Task #{op.task_id} not found")
+    old_column = task.column_id
+    if old_column != op.column:
+        can_add, error_msg = board.can_add_to_column(op.column)
+        if not can_add:
+            raise ColumnError(error_msg)
+        task.move_to(op.column, op.reason)
+    return {"task_id": task.id, "from_column": old_column, "to_column": op.column, "moved": old_column != op.column}
+
+
+def _edit(data: KanbanData, op: EditOp) -> Dict[str, Any]:
+    task = data.get_task(op.task_id)
+    if not task:
+        raise TaskNotFoundError(f"Task #{op.task_id} not found")
+    if op.title:
+        task.title = op.title
+    if op.description is not None:
+        task.description = op.description
+    if op.priority:
+        task.priority = op.priority
+    if op.add_tags:
+        task.tags = list(dict.fromkeys(task.tags + op.add_tags))
+    if op.remove_tags:
+        task.tags = [t for t in task.tags if t not in op.remove_tags]
+    task.updated_at = now_utc()
+    return {"task_id": task.id}
+
+
+def _agent_context(data: KanbanData, op: ContextOp) -> Dict[str, Any]:
+    task = data.get_task(op.task_id)
+    if not task:
+        raise TaskNotFoundError(f"Task #{op.task_id} not found")
+    task.agent_context[op.key] = op.value
+    task.updated_at = now_utc()
+    return {"task_id": task.id}
+
+
+def _delete(data: KanbanData, op: DeleteOp) -> Dict[str, Any]:
+    board = _task_board(data, op.task_id, op.board)
+    if not board.remove_task(op.task_id):
+        raise TaskNotFoundError(f"Task #{op.task_id} not found")
+    return {"task_id": op.task_id}
+
+
+HANDLERS = {
+    "add": _add,
+    "move": _move,
+    "edit": _edit,
+    "agent-context": _agent_context,
+    "delete": _delete,
+}
+
+
+def run_batch(data: KanbanData, lines: Iterable[str], atomic: bool = False) -> List[Dict[str, Any]]:
+    """Apply NDJSON operations to `data` in order and return one result per operation
+
+    A result holds the operation's line number, its "op", "ok" and either
+    what it did (task_id, ...) or an "error". Blank lines are skipped.
+    Without `atomic`, failed operations are reported and the rest still
+    run. With `atomic`, operations after the first failure are only
+    checked for syntax, and BatchAborted is raised with results marking
+    every operation as not applied; the caller must then discard `data`.
+    """
+    results = []
+    failed: Optional[int] = None
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        result: Dict[str, Any] = {"line": number, "op": None}
+        try:
+            op = OPERATION.validate_json(line)
+            result["op"] = op.op
+            if failed is None:
+                details = HANDLERS[op.op](data, op)
+                result["ok"] = True
+                result.update(details)
+        except (KanbanError, ValidationError, ValueError) as e:
+            op_name, error = _describe(e)
+            result["op"] = result["op"] or op_name
+            result.update(ok=False, error=error)
+            if atomic and failed is None:
+                failed = number
+        results.append(result)
+
+    if failed is not None:
+        raise BatchAborted(failed, [_not_applied(result, failed) for result in results])
+    return results
+
+
+def _not_applied(result: Dict[str, Any], failed_line: int) -> Dict[str, Any]:
+    """An aborted batch's result for an operation: its own error if it had one, else why it wasn't applied"""
+    if "error" in result:
+        return result
+    when = "Rolled back" if result["line"] < failed_line else "Not applied"
+    return {"line": result["line"], "op": result["op"], "ok": False,
+            "error": f"{when}: the operation on line {failed_line} failed"}
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """One NDJSON output line"""
+    return json.dumps(result, ensure_ascii=False, default=str)
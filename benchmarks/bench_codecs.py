@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the storage codecs on a synthetic board, with and without columnar loading
+
+Usage: python benchmarks/bench_codecs.py [--tasks 50000] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import KanbanData, Board, Task, Priority, DEFAULT_COLUMNS, DATA_NO_HISTORY
+from storage import JSONCodec, OrjsonCodec, orjson
+from snapshot import BinaryCodec
+
+
+def build_board(task_count: int) -> KanbanData:
+    """A single board with realistic-looking tasks (tags, agent context, one move each)"""
+    priorities = list(Priority)
+    columns = [c.id for c in DEFAULT_COLUMNS]
+    tags = ["backend", "frontend", "infra", "agent", "bug", "docs"]
+    tasks = []
+    for i in range(1, task_count + 1):
+        task = Task(
+            id=i,
+            column_id=columns[i % len(columns)],
+            title=f"Task {i}: investigate flaky pipeline step",
+            description="Longer description of the work to be done" if i % 3 == 0 else None,
+            priority=priorities[i % len(priorities)],
+            tags=[tags[i % len(tags)], tags[(i * 7) % len(tags)]],
+            agent_context={"lastAction": "triaged", "nextStep": "reproduce locally"} if i % 2 else {},
+        )
+        task.move_to(columns[(i + 1) % len(columns)], reason="benchmark")
+        tasks.append(task)
+    board = Board(columns=DEFAULT_COLUMNS, tasks=tasks)
+    return KanbanData(boards=[board], next_task_id=task_count + 1)
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def legacy_encode(data: KanbanData) -> bytes:
+    """What save() did before the codec layer"""
+    return json.dumps(data.model_dump(mode='json'), indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def legacy_decode(raw: bytes) -> KanbanData:
+    """What load() did before the codec layer"""
+    return KanbanData.model_validate(json.loads(raw))
+
+
+def legacy_encode_raw(payload: dict) -> bytes:
+    return json.dumps(payload, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = build_board(args.tasks)
+    codecs = [
+        ("legacy (json.dump indent=2)", legacy_encode, legacy_decode, legacy_encode_raw),
+    ]
+    # save() leaves task history to the history log, so the codecs are measured without it
+    def entry(name, codec):
+        return (name, lambda d: codec.encode(d, exclude=DATA_NO_HISTORY), codec.decode, codec.encode_raw)
+
+    for name, codec in (("pretty", JSONCodec(indent=2)), ("compact", JSONCodec(indent=None))):
+        codecs.append(entry(name, codec))
+    if orjson is not None:
+        codecs.append(entry("fast (orjson)", OrjsonCodec()))
+    else:
+        print("orjson not installed; skipping the fast codec\n")
+    codecs.append(entry("binary snapshot", BinaryCodec()))
+
+    # "compaction" encodes the plain dict produced by journal replay
+    payload = data.model_dump(mode='json')
+    print(f"{args.tasks} tasks, best of {args.repeat}")
+    print(f"{'codec':<30}{'size (MB)':>11}{'save (s)':>11}{'load (s)':>11}{'compaction (s)':>16}")
+    for name, encode, decode, encode_raw in codecs:
+        raw = encode(data)
+        enc = best_of(args.repeat, lambda: encode(data))
+        dec = best_of(args.repeat, lambda: decode(raw))
+        enc_raw = best_of(args.repeat, lambda: encode_raw(payload))
+        print(f"{name:<30}{len(raw) / 1e6:>11.2f}{enc:>11.3f}{dec:>11.3f}{enc_raw:>16.3f}")
+
+    # Columnar loads (KanbanStorage(columnar=True)) leave tasks in TaskStores instead of models
+    print(f"\n{'columnar load':<30}{'load (s)':>11}")
+    columnar = [("compact", JSONCodec(indent=None)), ("binary snapshot", BinaryCodec())]
+    if orjson is not None:
+        columnar.insert(1, ("fast (orjson)", OrjsonCodec()))
+    for name, codec in columnar:
+        raw = codec.encode(data, exclude=DATA_NO_HISTORY)
+        dec = best_of(args.repeat, lambda: codec.decode_columnar(raw))
+        print(f"{name:<30}{dec:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
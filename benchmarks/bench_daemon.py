@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Per-command latency of the CLI run directly and through `kanban.py serve`, on a synthetic journaled board
+
+Each command is run as its own process, as a shell or an agent would run
+it; the time is the best of --repeat runs.
+
+Usage: python benchmarks/bench_daemon.py [--tasks 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from storage import KanbanStorage
+from bench_codecs import build_board
+
+COMMANDS = [
+    ["info", "5"],
+    ["list-tasks", "--column", "done", "--tags", "bug"],
+    ["search", "flaky"],
+    ["move", "5", "review"],
+    ["agent-context", "5", "lastAction", "benchmarked"],
+    ["add", "Benchmark task", "--tags", "bench"],
+]
+
+
+def best_time(argv, env, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(ROOT / "kanban.py"), *argv], env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def wait_for_socket(path: Path, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(path))
+                return
+            except OSError:
+                time.sleep(0.05)
+    raise RuntimeError(f"Daemon didn't start listening on {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / "data.json"
+        socket_path = Path(tmp) / "daemon.sock"
+        KanbanStorage(str(data_path)).save(build_board(args.tasks))
+        env = dict(os.environ, KANBAN_DATA_PATH=str(data_path), KANBAN_SOCKET=str(socket_path), KANBAN_JOURNAL="1")
+
+        direct = {tuple(argv): best_time(argv, dict(env, KANBAN_NO_DAEMON="1"), args.repeat) for argv in COMMANDS}
+
+        daemon = subprocess.Popen([sys.executable, str(ROOT / "kanban.py"), "serve"], env=env, stdout=subprocess.DEVNULL)
+        try:
+            wait_for_socket(socket_path)
+            served = {tuple(argv): best_time(argv, env, args.repeat) for argv in COMMANDS}
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"{args.tasks} tasks, journaled, best of {args.repeat}\n")
+    print(f"{'command':<44}{'direct (ms)':>13}{'daemon (ms)':>13}")
+    for argv in COMMANDS:
+        key = tuple(argv)
+        print(f"{' '.join(argv):<44}{direct[key] * 1000:>13.0f}{served[key] * 1000:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Time to first byte, total time and peak memory of `show`/`list-tasks` with --json vs --ndjson on a synthetic board
+
+Each command runs as its own process, reading from a columnar load of a
+trusted JSON file; peak memory is the child's maximum resident set size.
+
+Usage: python benchmarks/bench_ndjson.py [--tasks 100000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from storage import KanbanStorage
+from bench_codecs import build_board
+
+COMMANDS = [
+    ["show", "--json"],
+    ["show", "--ndjson"],
+    ["list-tasks", "--json"],
+    ["list-tasks", "--ndjson"],
+]
+
+
+def run(argv, env):
+    """(seconds to first byte, total seconds, output bytes, peak RSS in MB)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(ROOT / "kanban.py"), *argv], env=env, stdout=subprocess.PIPE)
+    first = None
+    size = 0
+    while True:
+        chunk = proc.stdout.read1(1 << 16)
+        if not chunk:
+            break
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+    proc.stdout.close()
+    _, _, usage = os.wait4(proc.pid, 0)
+    proc.returncode = 0  # reaped above
+    return first or total, total, size, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / "data.json"
+        KanbanStorage(str(data_path)).save(build_board(args.tasks))
+        env = dict(os.environ, KANBAN_DATA_PATH=str(data_path), KANBAN_NO_DAEMON="1")
+
+        print(f"{args.tasks} tasks\n")
+        print(f"{'command':<24}{'first byte (s)':>16}{'total (s)':>11}{'output (MB)':>13}{'peak RSS (MB)':>15}")
+        for argv in COMMANDS:
+            first, total, size, rss = run(argv, env)
+            print(f"{' '.join(argv):<24}{first:>16.2f}{total:>11.2f}{size / 1e6:>13.1f}{rss:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
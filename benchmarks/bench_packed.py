@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Memory saved by interning task strings, and file size saved by packed JSON, on a synthetic board
+
+Memory is what tracemalloc still counts as allocated once a load returns,
+so it's deterministic for a given task count and Python version.
+
+Usage: python benchmarks/bench_packed.py [--tasks 100000]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import DATA_NO_HISTORY
+from storage import JSONCodec
+from snapshot import BinaryCodec
+from packed import PackedCodec
+from bench_codecs import build_board
+
+
+def allocated(fn):
+    """(result, bytes allocated by fn and still live afterwards)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def uninterned(data):
+    """`data` with a separate copy of each tag, column id and board id per task, as before interning"""
+    def copy(value: str) -> str:
+        return value[:1] + value[1:]
+    for board in data.boards:
+        for task in board.tasks:
+            fields = task.__dict__
+            fields["board_id"] = copy(fields["board_id"])
+            fields["column_id"] = copy(fields["column_id"])
+            fields["tags"] = [copy(tag) for tag in fields["tags"]]
+    return data
+
+
+def distinct_strings(data) -> int:
+    """Distinct string objects among the tasks' tags, column ids and board ids"""
+    seen = set()
+    for board in data.boards:
+        for task in board.tasks:
+            fields = task.__dict__
+            seen.add(id(fields["board_id"]))
+            seen.add(id(fields["column_id"]))
+            seen.update(id(tag) for tag in fields["tags"])
+    return len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    data = build_board(args.tasks)
+    compact = JSONCodec(indent=None)
+    raw = compact.encode(data, exclude=DATA_NO_HISTORY)
+
+    print(f"{args.tasks} tasks\n")
+    print(f"{'format':<24}{'size (MB)':>11}{'vs compact':>12}")
+    for name, codec in (("pretty", JSONCodec(indent=2)), ("compact", compact),
+                        ("packed", PackedCodec()), ("binary snapshot", BinaryCodec())):
+        size = len(codec.encode(data, exclude=DATA_NO_HISTORY))
+        print(f"{name:<24}{size / 1e6:>11.2f}{size / len(raw) - 1:>+12.0%}")
+
+    # The baseline is a trusted load as it was before interning: one string object per occurrence.
+    # Validation (pydantic's JSON parser) already reuses equal short strings.
+    loads = [
+        ("trusted, not interned", lambda: uninterned(compact.decode_trusted(raw))),
+        ("trusted", lambda: compact.decode_trusted(raw)),
+        ("validated", lambda: compact.decode(raw)),
+    ]
+    print(f"\n{'load':<24}{'memory (MB)':>13}{'vs baseline':>14}{'strings':>10}")
+    baseline = None
+    for name, load in loads:
+        data, size = allocated(load)
+        baseline = baseline or size
+        print(f"{name:<24}{size / 1e6:>13.1f}{size / baseline - 1:>+14.0%}{distinct_strings(data):>10}")
+        del data
+
+    # Columnar loads keep tags and columns as codes into per-board dictionaries
+    _, size = allocated(lambda: compact.decode_columnar(raw))
+    print(f"{'columnar':<24}{size / 1e6:>13.1f}{size / baseline - 1:>+14.0%}{'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+First page of a sorted task list: Paging's top-k selection vs sorting every task, on a synthetic board
+
+Both run in-process over the same loaded board with the same sort key, and
+are checked to return the same tasks; the time is the best of --repeat runs.
+The synthetic tasks are created, and so updated, in id order - the best
+case for a sort and the worst for a heap on -updated_at - so each sort is
+also timed with the tasks shuffled.
+
+Usage: python benchmarks/bench_paging.py [--tasks 100000] [--repeat 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from paging import Paging
+from bench_codecs import build_board
+
+SORTS = ["-priority,created_at", "-updated_at", "title"]
+LIMITS = [10, 100, 1000]
+
+
+def best_time(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    board = build_board(args.tasks).boards[0]
+    in_order = list(board.iter_tasks())
+    shuffled = random.Random(0).sample(in_order, len(in_order))
+
+    print(f"{args.tasks} tasks, best of {args.repeat}\n")
+    print(f"{'sort':<24}{'limit':>7}{'order':>10}{'full sort (ms)':>16}{'top-k (ms)':>12}")
+    for sort in SORTS:
+        for limit in LIMITS:
+            paging = Paging("list-tasks", sort=sort, limit=limit)
+            key = paging._sort_key
+            for order, tasks in (("board", in_order), ("shuffled", shuffled)):
+                expected = sorted(tasks, key=key)[:limit]
+                assert paging.page(tasks)[0] == expected
+                full = best_time(lambda: sorted(tasks, key=key)[:limit], args.repeat)
+                top = best_time(lambda: paging.page(tasks), args.repeat)
+                print(f"{sort:<24}{limit:>7}{order:>10}{full * 1000:>16.0f}{top * 1000:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Import-time check for the agent commands: fails if a cold `info --json` goes over budget
+
+Runs each command in a fresh interpreter with `-X importtime` (daemon
+bypassed, small data file) and sums the time spent importing modules,
+taking the best of --repeat runs. Exits with status 1 if a command imports
+a module from FORBIDDEN (the rendering and argument parsing libraries the
+JSON fast path exists to skip) or its import time exceeds --budget-ms.
+(tests/test_cli.py checks that the fast path parses and prints like the CLI.)
+
+Usage: python benchmarks/check_startup.py [--budget-ms 300] [--repeat 3]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from storage import KanbanStorage
+from bench_codecs import build_board
+
+COMMANDS = [
+    ["info", "1", "--json"],
+    ["show", "--json"],
+    ["list-tasks", "--json", "--tag", "bug"],
+]
+FORBIDDEN = ("typer", "click", "rich")
+
+# "import time: self [us] | cumulative [us] | <indent>module"; top-level imports have no indent
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_profile(argv: List[str], env: Dict[str, str]) -> Tuple[float, List[str]]:
+    """(seconds spent in imports, modules imported) for one cold run of the CLI"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "kanban.py"), *argv],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"kanban.py {' '.join(argv)} failed:\n{result.stderr[-2000:]}")
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        modules.append(match.group(4))
+        if not match.group(3):
+            total += int(match.group(2))
+    return total / 1e6, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / "data.json"
+        KanbanStorage(str(data_path)).save(build_board(20))
+        env = dict(os.environ, KANBAN_DATA_PATH=str(data_path), KANBAN_NO_DAEMON="1")
+        env.pop("KANBAN_BACKEND", None)
+
+        print(f"{'command':<36}{'imports (ms)':>14}  forbidden")
+        for argv in COMMANDS:
+            runs = [import_profile(argv, env) for _ in range(args.repeat)]
+            seconds = min(total for total, _ in runs)
+            forbidden = sorted({m.split(".")[0] for m in runs[0][1]} & set(FORBIDDEN))
+            print(f"{' '.join(argv):<36}{seconds * 1000:>14.0f}  {', '.join(forbidden) or '-'}")
+            if forbidden:
+                failures.append(f"{' '.join(argv)} imports {', '.join(forbidden)}")
+            if seconds * 1000 > args.budget_ms:
+                failures.append(f"{' '.join(argv)} spends {seconds * 1000:.0f} ms importing (budget {args.budget_ms:.0f} ms)")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print(f"\nOK: within {args.budget_ms:.0f} ms and no {', '.join(FORBIDDEN)}")
+
+
+if __name__ == "__main__":
+    main()
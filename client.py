@@ -0,0 +1,113 @@
+"""
+Client side of the Kanban daemon - hands a CLI command to a running `kanban.py serve`
+
+Imported by every CLI run before anything else, so it only uses the
+standard library modules that are quick to import. See daemon.py for the
+protocol.
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+
+TRUE_VALUES = ("1", "true", "yes")
+
+# Commands the client hands to a running daemon. The rest (backups, imports,
+# conversions, compaction) are rare, long-running or replace files wholesale,
+# so they always run in their own process.
+FORWARDED = {
+    "add", "move", "delete", "show", "list-tasks", "search", "info", "edit",
+    "agent-context", "batch", "status", "history-policy", "create-board",
+    "list-boards", "switch-board",
+}
+# Commands that ask before acting unless forced; the daemon can't prompt
+CONFIRMING = {"delete"}
+
+
+def default_socket_path() -> str:
+    """$KANBAN_SOCKET, or daemon.sock in ~/.kanban"""
+    path = os.environ.get("KANBAN_SOCKET")
+    return path or os.path.join(os.path.expanduser("~"), ".kanban", "daemon.sock")
+
+
+def storage_settings(backend: Optional[str] = None, strict: bool = False) -> Dict[str, Any]:
+    """open_storage() arguments from the KANBAN_* environment, with the data path made absolute
+
+    `backend` and `strict` are the CLI's global options (which default to
+    $KANBAN_BACKEND and $KANBAN_STRICT).
+    """
+    data_path = os.environ.get("KANBAN_DATA_PATH")
+    return {
+        "data_path": os.path.abspath(os.path.expanduser(data_path)) if data_path else None,
+        "backend": backend,
+        "journal": os.environ.get("KANBAN_JOURNAL", "").lower() in TRUE_VALUES,
+        "codec": os.environ.get("KANBAN_CODEC"),
+        # Tasks stay in compact arrays until a command needs the models
+        "columnar": os.environ.get("KANBAN_COLUMNAR", "").lower() in TRUE_VALUES,
+        "strict": strict or os.environ.get("KANBAN_STRICT", "").lower() in TRUE_VALUES,
+    }
+
+
+def _reads_stdin(argv: List[str]) -> bool:
+    """Whether the command reads its input from stdin (batch without a file)"""
+    return argv[0] == "batch" and not any(not arg.startswith("-") for arg in argv[1:])
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """Run a CLI command through a running daemon and return its exit status
+
+    Returns None when the command has to run in this process instead: no
+    daemon is listening, it serves other storage, the command isn't one
+    it runs, or $KANBAN_NO_DAEMON is set.
+    """
+    if os.environ.get("KANBAN_NO_DAEMON", "").lower() in TRUE_VALUES or not hasattr(socket, "AF_UNIX"):
+        return None
+    # Global options (--backend, --strict, --version) come before the command name
+    if not argv or argv[0] not in FORWARDED:
+        return None
+    if argv[0] in CONFIRMING and not {"-f", "--force"} & set(argv):
+        return None
+    # Streamed output would be collected whole into the daemon's reply
+    if "--ndjson" in argv:
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(default_socket_path())
+    except OSError:
+        # No socket, or a stale one left by a daemon that was killed
+        sock.close()
+        return None
+
+    with sock:
+        stdin = sys.stdin.read() if _reads_stdin(argv) else None
+        request = {
+            "argv": argv,
+            "settings": storage_settings(os.environ.get("KANBAN_BACKEND")),
+            "cwd": os.getcwd(),
+            "stdin": stdin,
+            "terminal": sys.stdout.isatty(),
+            "width": os.get_terminal_size(sys.stdout.fileno()).columns if sys.stdout.isatty() else 80,
+        }
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                reply = json.loads(f.readline() or b"null")
+        except (OSError, ValueError):
+            reply = None
+        if reply is None:
+            # The command may have run, so running it again here isn't safe
+            sys.stderr.write("Error: the kanban daemon stopped before answering; check the data before retrying\n")
+            return 1
+
+    if reply["status"] == "unserved":
+        if stdin is not None:
+            sys.stdin = io.StringIO(stdin)
+        return None
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    return reply["exit_code"]
@@ -0,0 +1,130 @@
+"""
+Resident daemon for the Kanban CLI - keeps the data loaded and runs commands sent over a Unix socket
+
+`kanban.py serve` loads the data once, with a parsed-data cache, and then
+runs the CLI commands other kanban.py processes send it. A client sends a
+single JSON line:
+
+    {"argv": [...], "settings": {...}, "cwd": "...", "stdin": "..." | null,
+     "terminal": false, "width": 80}
+
+and gets a single JSON line back: either {"status": "ok", "exit_code": 0,
+"stdout": "...", "stderr": "..."}, or {"status": "unserved"} if the client
+would open different storage (another data path, backend, codec, ...) and
+has to run the command itself.
+
+Commands run one at a time, so writes are serialized, and they go
+through the same KanbanStorage as a direct run: the file lock still keeps
+them apart from processes that don't use the daemon, and the cache's stat
+check picks up changes those processes make. The client side is in
+client.py.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+class DaemonError(Exception):
+    """Raised when the daemon can't start"""
+    pass
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        reply = self.server.execute(request)
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class KanbanDaemon(socketserver.UnixStreamServer):
+    """Serves CLI commands on a Unix socket, one at a time
+
+    `run(argv, terminal, width)` runs one command in this process, printing
+    to sys.stdout and sys.stderr (redirected here for each request) and
+    raising SystemExit like a typer app.
+    """
+
+    def __init__(self, path: Path, settings: Dict[str, Any], run: Callable[[List[str], bool, int], None]):
+        self.path = Path(path)
+        self.settings = settings
+        self._run = run
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        # Only this user may connect: a client can do anything the CLI can
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def _remove_stale_socket(self) -> None:
+        if not self.path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.path))
+        except OSError:
+            self.path.unlink()
+            return
+        finally:
+            probe.close()
+        raise DaemonError(f"A daemon is already listening on {self.path}")
+
+    def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one forwarded command and capture what it printed"""
+        if request.get("settings") != self.settings:
+            return {"status": "unserved"}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        cwd = os.getcwd()
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(request.get("stdin") or "")
+        try:
+            # Relative paths in the arguments are the client's
+            os.chdir(request["cwd"])
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    self._run(request["argv"], request.get("terminal", False), request.get("width", 80))
+                    exit_code = 0
+                except SystemExit as e:
+                    exit_code = _exit_code(e)
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+        finally:
+            sys.stdin = stdin
+            os.chdir(cwd)
+        return {"status": "ok", "exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def serve(self) -> None:
+        """Serve until interrupted (Ctrl-C or SIGTERM), then remove the socket"""
+        previous = signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            self.server_close()
+            self.path.unlink(missing_ok=True)
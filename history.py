@@ -0,0 +1,265 @@
+"""
+Task history log for Kanban data - one append-only file per board, indexed by task id
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+
+def _entry_time(entry: Dict[str, Any]) -> Optional[datetime]:
+    try:
+        when = datetime.fromisoformat(entry["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+
+
+def _moves(entry: Dict[str, Any]) -> int:
+    """Column moves an entry stands for (0 if it isn't a move or a collapsed run of them)"""
+    action = entry.get("action")
+    if action == "moved":
+        return 1
+    if action == "collapsed":
+        return entry.get("moves", 0)
+    return 0
+
+
+class HistoryPolicy(BaseModel):
+    """How much of a board's task history to keep
+
+    Whatever the limits, the first and the last move into each column are
+    always kept (cycle-time reporting depends on them), so a task can keep
+    more than `max_entries` if it visited many columns.
+    """
+    max_entries: Optional[int] = Field(None, ge=1, description="Keep at most this many entries per task")
+    max_age_days: Optional[float] = Field(None, gt=0, description="Drop entries older than this")
+    collapse: bool = Field(False, description="Merge runs of consecutive moves into one summary entry")
+
+    @property
+    def is_empty(self) -> bool:
+        return self.max_entries is None and self.max_age_days is None and not self.collapse
+
+    def apply(self, entries: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """The entries this policy keeps of one task's history (oldest first)"""
+        first: Dict[str, int] = {}
+        last: Dict[str, int] = {}
+        for i, entry in enumerate(entries):
+            if entry.get("action") == "moved":
+                column = entry.get("to_column")
+                first.setdefault(column, i)
+                last[column] = i
+        protected = set(first.values()) | set(last.values())
+        kept = [(entry, i in protected) for i, entry in enumerate(entries)]
+
+        if self.max_age_days is not None:
+            cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.max_age_days)
+            kept = [
+                (entry, keep) for entry, keep in kept
+                if keep or (_entry_time(entry) or cutoff) >= cutoff
+            ]
+
+        if self.collapse:
+            merged: List[Tuple[Dict[str, Any], bool]] = []
+            run: List[Dict[str, Any]] = []
+            for entry, keep in kept + [(None, True)]:
+                if entry is not None and not keep and _moves(entry):
+                    run.append(entry)
+                    continue
+                if len(run) > 1:
+                    merged.append(({
+                        "action": "collapsed",
+                        "moves": sum(_moves(e) for e in run),
+                        "from_column": run[0].get("from_column"),
+                        "to_column": run[-1].get("to_column"),
+                        "since": run[0].get("since", run[0].get("timestamp")),
+                        "timestamp": run[-1].get("timestamp"),
+                    }, False))
+                else:
+                    merged.extend((e, False) for e in run)
+                run = []
+                if entry is not None:
+                    merged.append((entry, keep))
+            kept = merged
+
+        if self.max_entries is not None and len(kept) > self.max_entries:
+            # Drop the oldest entries that aren't protected
+            excess = len(kept) - self.max_entries
+            trimmed = []
+            for entry, keep in kept:
+                if excess and not keep:
+                    excess -= 1
+                    continue
+                trimmed.append((entry, keep))
+            kept = trimmed
+
+        return [entry for entry, _ in kept]
+
+    def worth_applying(self, entries: List[Dict[str, Any]], now: Optional[datetime] = None) -> Optional[List[Dict[str, Any]]]:
+        """The kept entries if applying the policy at least halves the history, else None
+
+        Used on save: rewriting a task's history in an append-only log costs
+        a line per kept entry, so trimming waits until it pays for itself.
+        """
+        kept = self.apply(entries, now)
+        return kept if len(kept) * 2 <= len(entries) else None
+
+
+class HistoryLog:
+    """Append-only log of one board's task history
+
+    Each line is a JSON array `[task_id, entry]`. A `[task_id, null]` line
+    discards the task's earlier entries (written when a task's history is
+    replaced as a whole, e.g. when inline history is migrated).
+
+    Reads go through an in-memory index of line offsets per task id, which
+    is extended incrementally as the file grows, so fetching one task's
+    history doesn't parse the others.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        # task id -> (offset, length) of its entries since its last reset
+        self._index: Dict[int, List[Tuple[int, int]]] = {}
+        # (inode, bytes indexed so far)
+        self._indexed: Tuple[Optional[int], int] = (None, 0)
+
+    def append(self, records: List[Tuple[int, Optional[Dict[str, Any]]]]) -> None:
+        """Append (task_id, entry) records; an entry of None resets the task's history"""
+        if not records:
+            return
+        payload = b"".join(
+            json.dumps([task_id, entry], ensure_ascii=False, default=str).encode('utf-8') + b"\n"
+            for task_id, entry in records
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            # A crash can leave a torn last line; start a fresh one so it stays unreadable
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                payload = b"\n" + payload
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+    def _refresh(self) -> None:
+        """Index lines appended since the last call (or everything, if the file was replaced)"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._index, self._indexed = {}, (None, 0)
+            return
+
+        inode, offset = self._indexed
+        if inode != st.st_ino or st.st_size < offset:
+            self._index, offset = {}, 0
+        if st.st_size == offset:
+            self._indexed = (st.st_ino, offset)
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read(st.st_size - offset)
+
+        pos = 0
+        while True:
+            end = chunk.find(b"\n", pos)
+            if end < 0:
+                break  # Incomplete trailing line: index it once it's finished
+            line = chunk[pos:end]
+            try:
+                task_id = int(line[1:line.index(b",")])
+            except ValueError:
+                task_id = None  # Torn line left by a crash
+            if task_id is not None:
+                if line.endswith(b"null]"):
+                    self._index[task_id] = []
+                else:
+                    self._index.setdefault(task_id, []).append((offset + pos, end - pos))
+            pos = end + 1
+        self._indexed = (st.st_ino, offset + pos)
+
+    def entries(self, task_id: int) -> List[Dict[str, Any]]:
+        """History entries of one task, oldest first"""
+        self._refresh()
+        spans = self._index.get(task_id)
+        if not spans:
+            return []
+        entries = []
+        with open(self.path, 'rb') as f:
+            for offset, length in spans:
+                f.seek(offset)
+                entries.append(json.loads(f.read(length))[1])
+        return entries
+
+    def compacted(
+        self,
+        live: Set[int],
+        retain: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+    ) -> Tuple[bytes, int, int]:
+        """The log rewritten with `retain` applied to each task in `live`, and entry counts before/after
+
+        Superseded entries (before a reset) and tasks not in `live` are
+        dropped. Each task's lines end up together, in order of first
+        appearance.
+        """
+        histories: Dict[int, List[Dict[str, Any]]] = {}
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        task_id, entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn line left by a crash
+                    if entry is None:
+                        histories[task_id] = []
+                    else:
+                        histories.setdefault(task_id, []).append(entry)
+        except FileNotFoundError:
+            return b"", 0, 0
+
+        before = sum(len(entries) for entries in histories.values())
+        after = 0
+        lines = []
+        for task_id, entries in histories.items():
+            if task_id not in live:
+                continue
+            for entry in retain(entries):
+                lines.append(json.dumps([task_id, entry], ensure_ascii=False, default=str).encode('utf-8') + b"\n")
+                after += 1
+        return b"".join(lines), before, after
+
+    def rewrite(self, payload: bytes) -> None:
+        """Atomically replace the log (call with the exclusive lock held)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.kanban_tmp_')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        self._index, self._indexed = {}, (None, 0)
+
+    def size(self) -> int:
+        """Log size in bytes"""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def delete(self) -> None:
+        """Remove the log (when its board is deleted)"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._index, self._indexed = {}, (None, 0)
@@ -0,0 +1,213 @@
+"""
+Operation journal for Kanban data - append-only change log on top of a JSON snapshot
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from models import KanbanData, Board, TASK_NO_HISTORY, BOARD_NO_HISTORY, now_utc
+
+
+ROOT_FIELDS = ("version", "default_board", "next_task_id")
+
+
+def _board_meta(board: Board) -> Dict[str, Any]:
+    """Serialize everything about a board except its tasks"""
+    return board.model_dump(mode='json', exclude={'tasks'})
+
+
+def capture_board(board: Board) -> Dict[str, Any]:
+    """Record the persisted state of one board and mark its tasks clean"""
+    for task in board.tasks:
+        task._dirty = False
+    return {
+        "meta": _board_meta(board),
+        "task_ids": {t.id for t in board.tasks},
+    }
+
+
+def capture_base(data: KanbanData) -> Dict[str, Any]:
+    """Record the persisted state of `data` so later saves can be diffed against it"""
+    return {
+        "root": {name: getattr(data, name) for name in ROOT_FIELDS},
+        "boards": {board.id: capture_board(board) for board in data.boards},
+        "order": [b.id for b in data.boards],
+    }
+
+
+def board_ops(board: Board, board_base: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Operations that turn one board's captured state into its current state
+
+    Returns None if the board holds duplicate task ids and can't be diffed.
+    """
+    ops: List[Dict[str, Any]] = []
+
+    meta = _board_meta(board)
+    if meta != board_base["meta"]:
+        ops.append({"op": "put_board_meta", "board": board.id, "meta": meta})
+
+    current_task_ids = set()
+    for task in board.tasks:
+        current_task_ids.add(task.id)
+        if task._dirty or task.id not in board_base["task_ids"]:
+            ops.append({
+                "op": "put_task",
+                "board": board.id,
+                "task": task.model_dump(mode='json', exclude=TASK_NO_HISTORY)
+            })
+
+    if len(current_task_ids) != len(board.tasks):
+        return None
+
+    for task_id in board_base["task_ids"] - current_task_ids:
+        ops.append({"op": "delete_task", "board": board.id, "task": task_id})
+
+    return ops
+
+
+def diff_ops(base: Dict[str, Any], data: KanbanData) -> Optional[List[Dict[str, Any]]]:
+    """Compute the operations that turn `base` into `data`
+
+    Returns None when the change cannot be expressed as journal operations
+    (e.g. boards were reordered), in which case a full snapshot is needed.
+    """
+    ops: List[Dict[str, Any]] = []
+
+    root = {name: getattr(data, name) for name in ROOT_FIELDS}
+    changed_root = {k: v for k, v in root.items() if base["root"].get(k) != v}
+    if changed_root:
+        ops.append({"op": "set_root", "fields": changed_root})
+
+    current_ids = [b.id for b in data.boards]
+    current_set = set(current_ids)
+    if len(current_set) != len(current_ids):
+        return None
+
+    # Replay appends new boards and removes deleted ones; anything else needs a snapshot
+    expected_order = [bid for bid in base["order"] if bid in current_set]
+    expected_order += [bid for bid in current_ids if bid not in base["boards"]]
+    if expected_order != current_ids:
+        return None
+
+    for board_id in base["order"]:
+        if board_id not in current_set:
+            ops.append({"op": "delete_board", "board": board_id})
+
+    for board in data.boards:
+        board_base = base["boards"].get(board.id)
+        if board_base is None:
+            ops.append({"op": "put_board", "board": board.model_dump(mode='json', exclude=BOARD_NO_HISTORY)})
+            continue
+
+        changes = board_ops(board, board_base)
+        if changes is None:
+            return None
+        ops.extend(changes)
+
+    return ops
+
+
+def replay(raw: Dict[str, Any], records: Iterator[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Apply journal records in order to a raw (unvalidated) snapshot dict"""
+    boards: List[Dict[str, Any]] = raw.setdefault("boards", [])
+    task_positions: Dict[str, Dict[int, int]] = {}
+
+    def find_board(board_id: str) -> Optional[Dict[str, Any]]:
+        for board in boards:
+            if board.get("id") == board_id:
+                return board
+        return None
+
+    def positions(board: Dict[str, Any]) -> Dict[int, int]:
+        if board["id"] not in task_positions:
+            task_positions[board["id"]] = {
+                t["id"]: idx for idx, t in enumerate(board.setdefault("tasks", []))
+            }
+        return task_positions[board["id"]]
+
+    for ops in records:
+        for op in ops:
+            kind = op.get("op")
+            if kind == "set_root":
+                raw.update(op["fields"])
+            elif kind == "put_board":
+                existing = find_board(op["board"]["id"])
+                if existing is not None:
+                    boards.remove(existing)
+                boards.append(op["board"])
+                task_positions.pop(op["board"]["id"], None)
+            elif kind == "delete_board":
+                existing = find_board(op["board"])
+                if existing is not None:
+                    boards.remove(existing)
+                task_positions.pop(op["board"], None)
+            elif kind == "put_board_meta":
+                board = find_board(op["board"])
+                if board is not None:
+                    board.update(op["meta"])
+            elif kind == "put_task":
+                board = find_board(op["board"])
+                if board is None:
+                    continue
+                pos = positions(board)
+                task = op["task"]
+                if task["id"] in pos:
+                    board["tasks"][pos[task["id"]]] = task
+                else:
+                    pos[task["id"]] = len(board["tasks"])
+                    board["tasks"].append(task)
+            elif kind == "delete_task":
+                board = find_board(op["board"])
+                if board is None:
+                    continue
+                board["tasks"] = [t for t in board.get("tasks", []) if t["id"] != op["task"]]
+                task_positions.pop(board["id"], None)
+
+    return raw
+
+
+class Journal:
+    """Append-only NDJSON log; each line holds the operations of one save"""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def append(self, ops: List[Dict[str, Any]]) -> None:
+        """Append one record with a single write so a crash can't interleave records"""
+        line = json.dumps(
+            {"ts": now_utc().isoformat(), "ops": ops},
+            ensure_ascii=False,
+            default=str
+        ) + "\n"
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def records(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the operations of each record, skipping a torn trailing line"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    yield json.loads(line)["ops"]
+                except (json.JSONDecodeError, KeyError):
+                    continue
+
+    def size(self) -> int:
+        """Current journal size in bytes"""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def truncate(self) -> None:
+        """Drop all records (after they have been folded into a snapshot)"""
+        if self.path.exists():
+            os.truncate(self.path, 0)
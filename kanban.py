@@ -10,26 +10,73 @@ from typing import Optional, List
 from datetime import datetime
 from pathlib import Path
 
+from client import forward, default_socket_path, storage_settings
+
+if __name__ == "__main__":
+    # Let a running `kanban.py serve` handle the command before paying for the imports below
+    _exit_code = forward(sys.argv[1:])
+    if _exit_code is None:
+        # JSON output of the read-only commands needs neither typer nor rich (see queries.py)
+        from queries import run_json_command
+        _exit_code = run_json_command(sys.argv[1:])
+    if _exit_code is not None:
+        sys.exit(_exit_code)
+
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
+from typer.core import TyperGroup
 
 from models import KanbanData, Board, Task, Column, Priority, DEFAULT_COLUMNS, now_utc
 from models import KanbanError, BoardNotFoundError, TaskNotFoundError, ColumnError
-from storage import KanbanStorage, KanbanStorageLocked
+from storage import KanbanStorage, KanbanStorageLocked, open_storage
+import queries
+from paging import Paging
+
+
+class LazyConsole:
+    """A rich Console created on first use, so commands that print no rich output never import rich"""
+    
+    def __init__(self, **options):
+        self._options = options
+        self._console = None
+    
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(**self._options)
+        return getattr(self._console, name)
+
+
+class KanbanGroup(TyperGroup):
+    """Reports Kanban errors from any command with handle_exception() instead of a traceback"""
+    
+    def invoke(self, ctx):
+        try:
+            return super().invoke(ctx)
+        except (KanbanError, KanbanStorageLocked) as e:
+            handle_exception(e)
 
 
-app = typer.Typer(help="Kanban CLI - Personal task board for AI agent collaboration")
-console = Console()
+app = typer.Typer(cls=KanbanGroup, help="Kanban CLI - Personal task board for AI agent collaboration")
+backup_app = typer.Typer(help="Create, list, restore and prune backups")
+app.add_typer(backup_app, name="backup")
+console = LazyConsole()
 
 DEFAULT_DATA_PATH = Path.home() / ".kanban" / "data.json"
+# Option flags of the commands queries.py can answer without typer, shared with its parser
+FLAGS = queries.OPTION_FLAGS
+
+
+_storage: Optional[KanbanStorage] = None
+_backend: Optional[str] = os.environ.get("KANBAN_BACKEND")
+_strict: bool = os.environ.get("KANBAN_STRICT", "").lower() in ("1", "true", "yes")
 
 
 def get_storage() -> KanbanStorage:
-    data_path = os.environ.get("KANBAN_DATA_PATH")
-    return KanbanStorage(data_path)
+    # One instance per process so journaled saves can diff against the loaded data
+    global _storage
+    if _storage is None:
+        _storage = open_storage(**storage_settings(_backend, _strict))
+    return _storage
 
 
 def get_data() -> KanbanData:
@@ -37,9 +84,14 @@ def get_data() -> KanbanData:
     return storage.load()
 
 
-def save_data(data: KanbanData) -> None:
-    storage = get_storage()
-    storage.save(data)
+def get_paging(kind: str, sort: Optional[str], limit: Optional[int], offset: int, cursor: Optional[str]) -> Optional[Paging]:
+    """Paging for --sort/--limit/--offset/--cursor, or None if none was given"""
+    if sort is None and limit is None and not offset and cursor is None:
+        return None
+    try:
+        return Paging(kind, sort=sort, limit=limit, offset=offset, cursor=cursor)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
 
 
 @app.command()
@@ -52,28 +104,27 @@ def add(
     board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID (uses default if not specified)")
 ):
     """Add a new task to the board"""
-    data = get_data()
-    board = data.get_board(board_id)
-    
-    if not board:
-        raise BoardNotFoundError(f"Board '{board_id}' not found")
-    
-    can_add, error_msg = board.can_add_to_column(column)
-    if not can_add:
-        raise ColumnError(error_msg)
-    
-    task = Task(
-        id=board.get_next_task_id(data),
-        board_id=board.id,
-        column_id=column,
-        title=title,
-        description=description,
-        priority=priority,
-        tags=tags or []
-    )
-    
-    board.tasks.append(task)
-    save_data(data)
+    with get_storage().transaction() as data:
+        board = data.get_board(board_id)
+        
+        if not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        
+        can_add, error_msg = board.can_add_to_column(column)
+        if not can_add:
+            raise ColumnError(error_msg)
+        
+        task = Task(
+            id=board.get_next_task_id(data),
+            board_id=board.id,
+            column_id=column,
+            title=title,
+            description=description,
+            priority=priority,
+            tags=tags or []
+        )
+        
+        board.add_task(task)
     
     console.print(f"[green]Created task #{task.id}: {title}[/green]")
 
@@ -83,31 +134,15 @@ def move(
     task_id: int = typer.Argument(..., help="Task ID to move"),
     column: str = typer.Argument(..., help="Target column"),
     reason: Optional[str] = typer.Option(None, "--reason", "-r", help="Reason for moving"),
-    board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID (uses default if not specified)")
+    board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID (default: the board holding the task)")
 ):
     """Move a task to a different column"""
-    data = get_data()
-    board = data.get_board(board_id)
-    
-    if not board:
-        raise BoardNotFoundError(f"Board '{board_id}' not found")
+    task, old_column = get_storage().move_task(task_id, column, reason, board_id)
     
-    task = data.get_task(task_id)
-    if not task:
-        raise TaskNotFoundError(f"Task #{task_id} not found")
-    
-    if task.column_id == column:
+    if old_column == column:
         console.print(f"[yellow]Task #{task_id} is already in '{column}'[/yellow]")
         return
     
-    can_add, error_msg = board.can_add_to_column(column)
-    if not can_add:
-        raise ColumnError(error_msg)
-    
-    old_column = task.column_id
-    task.move_to(column, reason)
-    save_data(data)
-    
     console.print(f"[green]Moved task #{task_id} from '{old_column}' to '{column}'[/green]")
 
 
@@ -115,54 +150,60 @@ def move(
 def delete(
     task_id: int = typer.Argument(..., help="Task ID to delete"),
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation"),
-    board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID (uses default if not specified)")
+    board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID (default: the board holding the task)")
 ):
     """Delete a task from the board"""
-    data = get_data()
-    board = data.get_board(board_id)
-    
-    if not board:
-        raise BoardNotFoundError(f"Board '{board_id}' not found")
-    
-    task = data.get_task(task_id, board_id)
-    if not task:
-        raise TaskNotFoundError(f"Task #{task_id} not found")
-    
     if not force:
-        confirm = typer.confirm(f"Delete task #{task_id}: '{task.title}'?")
+        # Ask before taking the lock so a waiting prompt doesn't block other writers
+        _, tasks = get_storage().find_tasks(board_id, task_id=task_id)
+        if not tasks:
+            raise TaskNotFoundError(f"Task #{task_id} not found")
+        confirm = typer.confirm(f"Delete task #{task_id}: '{tasks[0].title}'?")
         if not confirm:
             console.print("Cancelled")
             return
     
-    board.tasks = [t for t in board.tasks if t.id != task_id]
-    save_data(data)
+    with get_storage().transaction() as data:
+        board = data.get_board(board_id) if board_id else data.locate_task(task_id)
+        
+        if board_id and not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        
+        if not board or not board.remove_task(task_id):
+            raise TaskNotFoundError(f"Task #{task_id} not found")
     
     console.print(f"[green]Deleted task #{task_id}[/green]")
 
 
 @app.command()
 def show(
-    board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID"),
-    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON (for AI agents)")
+    board_id: Optional[str] = typer.Option(None, *FLAGS["board_id"], help="Board ID"),
+    json_output: bool = typer.Option(False, *queries.JSON_FLAGS, help="Output as JSON (for AI agents)"),
+    ndjson: bool = typer.Option(False, queries.NDJSON_FLAG, help="Stream NDJSON: a board line, then one task per line"),
+    sort: Optional[str] = typer.Option(None, *FLAGS["sort"], help="Sort each column by fields, e.g. -priority,created_at"),
+    limit: Optional[int] = typer.Option(None, *FLAGS["limit"], min=1, help="Show at most this many tasks per column"),
+    offset: int = typer.Option(0, *FLAGS["offset"], min=0, help="Skip this many tasks per column"),
+    cursor: Optional[str] = typer.Option(None, *FLAGS["cursor"], help="Continue from a previous page's next cursor"),
+    no_history: bool = typer.Option(False, queries.NO_HISTORY_FLAG, help="Leave task history out of JSON output")
 ):
     """Display the Kanban board"""
+    paging = get_paging("show", sort, limit, offset, cursor)
+    if ndjson:
+        queries.print_lines(queries.show_lines(get_storage(), board_id, paging, history=not no_history))
+        return
+    if json_output:
+        queries.print_json(queries.show_output(get_storage(), board_id, paging, history=not no_history))
+        return
+    
+    from rich import box
+    from rich.table import Table
+    
     data = get_data()
     board = data.get_board(board_id)
     
     if not board:
         raise BoardNotFoundError(f"Board '{board_id}' not found")
     
-    if json_output:
-        output = {
-            "board": board.model_dump(mode='json'),
-            "tasks_by_column": {
-                col.id: [t.model_dump(mode='json') for t in board.get_tasks_in_column(col.id)]
-                for col in board.columns
-            }
-        }
-        print(json.dumps(output, indent=2))
-        return
-    
     table = Table(
         title=f"📋 {board.name}",
         box=box.ROUNDED,
@@ -170,21 +211,23 @@ def show(
         header_style="bold"
     )
     
-    for col in sorted(board.columns, key=lambda c: c.order):
-        col_tasks = board.get_tasks_in_column(col.id)
+    columns = sorted(board.columns, key=lambda c: c.order)
+    next_cursor = None
+    if paging:
+        pages, next_cursor = paging.page_columns(board)
+        column_tasks = [pages[col.id] for col in columns]
+    else:
+        column_tasks = [board.get_tasks_in_column(col.id) for col in columns]
+    for col, col_tasks in zip(columns, column_tasks):
         count = len(col_tasks)
         limit_text = f"/{col.limit}" if col.limit else ""
         table.add_column(f"{col.name} ({count}{limit_text})", no_wrap=False)
     
-    max_rows = max(
-        len(board.get_tasks_in_column(col.id))
-        for col in board.columns
-    ) if board.columns else 0
+    max_rows = max(len(tasks) for tasks in column_tasks) if columns else 0
     
     for row_idx in range(max_rows):
         row_cells = []
-        for col in sorted(board.columns, key=lambda c: c.order):
-            tasks = board.get_tasks_in_column(col.id)
+        for tasks in column_tasks:
             if row_idx < len(tasks):
                 task = tasks[row_idx]
                 priority_color = {
@@ -205,35 +248,45 @@ def show(
     
     if board.tasks:
         console.print(f"\n[dim]Total tasks: {len(board.tasks)}[/dim]")
+    if next_cursor:
+        console.print(f"[dim]More: --cursor {next_cursor}[/dim]", soft_wrap=True)
 
 
 @app.command()
 def list_tasks(
-    column: Optional[str] = typer.Option(None, "--column", "-c", help="Filter by column"),
-    priority: Optional[Priority] = typer.Option(None, "--priority", "-p", help="Filter by priority"),
-    tag: Optional[str] = typer.Option(None, "--tag", "-t", help="Filter by tag"),
-    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON")
+    column: Optional[str] = typer.Option(None, *FLAGS["column"], help="Filter by column"),
+    priority: Optional[Priority] = typer.Option(None, *FLAGS["priority"], help="Filter by priority"),
+    tags: Optional[List[str]] = typer.Option(None, *FLAGS["tags"], help="Filter by tag (repeat to require several)"),
+    json_output: bool = typer.Option(False, *queries.JSON_FLAGS, help="Output as JSON"),
+    ndjson: bool = typer.Option(False, queries.NDJSON_FLAG, help="Stream NDJSON, one task per line"),
+    sort: Optional[str] = typer.Option(None, *FLAGS["sort"], help="Sort by fields, e.g. -priority,created_at"),
+    limit: Optional[int] = typer.Option(None, *FLAGS["limit"], min=1, help="List at most this many tasks"),
+    offset: int = typer.Option(0, *FLAGS["offset"], min=0, help="Skip this many tasks"),
+    cursor: Optional[str] = typer.Option(None, *FLAGS["cursor"], help="Continue from a previous page's next cursor"),
+    no_history: bool = typer.Option(False, queries.NO_HISTORY_FLAG, help="Leave task history out of JSON output")
 ):
     """List all tasks with optional filters"""
-    data = get_data()
-    board = data.get_board()
-    
-    if not board:
-        raise BoardNotFoundError("No board found")
-    
-    tasks = board.tasks
-    
-    if column:
-        tasks = [t for t in tasks if t.column_id == column]
-    if priority:
-        tasks = [t for t in tasks if t.priority == priority]
-    if tag:
-        tasks = [t for t in tasks if tag in t.tags]
-    
+    paging = get_paging("list-tasks", sort, limit, offset, cursor)
+    if ndjson:
+        queries.print_lines(
+            queries.list_tasks_lines(get_storage(), column, priority, tags, paging, history=not no_history)
+        )
+        return
     if json_output:
-        print(json.dumps([t.model_dump(mode='json') for t in tasks], indent=2))
+        queries.print_json(
+            queries.list_tasks_output(get_storage(), column, priority, tags, paging, history=not no_history)
+        )
         return
     
+    if paging:
+        board, tasks, next_cursor = queries.find_page(get_storage(), column, priority, tags, paging)
+    else:
+        try:
+            board, tasks = get_storage().find_tasks(column=column, priority=priority, tags=tags)
+        except BoardNotFoundError:
+            raise BoardNotFoundError("No board found")
+        next_cursor = None
+    
     if not tasks:
         console.print("[dim]No tasks found[/dim]")
         return
@@ -251,25 +304,58 @@ def list_tasks(
         
         tags_str = f" [dim]({', '.join(task.tags)})[/dim]" if task.tags else ""
         console.print(f"[{priority_color}]#{task.id}[/] [{task.column_id}]{col_display}[/{task.column_id}] - {task.title}{tags_str}")
+    
+    if next_cursor:
+        console.print(f"[dim]More: --cursor {next_cursor}[/dim]", soft_wrap=True)
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Words to search for in titles, descriptions and agent context"),
+    board_id: Optional[str] = typer.Option(None, *FLAGS["board_id"], help="Board ID (uses default if not specified)"),
+    limit: int = typer.Option(20, *FLAGS["limit"], help="Maximum number of results"),
+    json_output: bool = typer.Option(False, *queries.JSON_FLAGS, help="Output as JSON"),
+    no_history: bool = typer.Option(False, queries.NO_HISTORY_FLAG, help="Leave task history out of JSON output")
+):
+    """Search tasks by text, best matches first"""
+    if json_output:
+        queries.print_json(queries.search_output(get_storage(), query, board_id, limit, history=not no_history))
+        return
+    
+    board, results = get_storage().search_tasks(query, board_id, limit)
+    
+    if not results:
+        console.print("[dim]No tasks found[/dim]")
+        return
+    
+    for task, score in results:
+        col = board.get_column(task.column_id)
+        col_display = col.name if col else task.column_id
+        tags_str = f" [dim]({', '.join(task.tags)})[/dim]" if task.tags else ""
+        console.print(f"#{task.id} [{task.column_id}]{col_display}[/{task.column_id}] - {task.title}{tags_str} [dim]{score:.2f}[/dim]")
 
 
 @app.command()
 def info(
     task_id: int = typer.Argument(..., help="Task ID"),
-    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON")
+    json_output: bool = typer.Option(False, *queries.JSON_FLAGS, help="Output as JSON")
 ):
     """Show detailed information about a task"""
-    data = get_data()
-    task = data.get_task(task_id)
-    
-    if not task:
-        raise TaskNotFoundError(f"Task #{task_id} not found")
-    
     if json_output:
-        print(json.dumps(task.model_dump(mode='json'), indent=2))
+        queries.print_json(queries.info_output(get_storage(), task_id))
         return
     
-    board = data.get_board()
+    from rich.panel import Panel
+    
+    try:
+        board, tasks = get_storage().find_tasks(task_id=task_id)
+    except BoardNotFoundError:
+        board, tasks = None, []
+    
+    if not tasks:
+        raise TaskNotFoundError(f"Task #{task_id} not found")
+    task = tasks[0]
+    
     col = board.get_column(task.column_id) if board else None
     col_name = col.name if col else task.column_id
     
@@ -309,25 +395,24 @@ def edit(
     remove_tags: Optional[List[str]] = typer.Option(None, "--remove-tag", help="Remove tags")
 ):
     """Edit a task's properties"""
-    data = get_data()
-    task = data.get_task(task_id)
-    
-    if not task:
-        raise TaskNotFoundError(f"Task #{task_id} not found")
-    
-    if title:
-        task.title = title
-    if description is not None:
-        task.description = description
-    if priority:
-        task.priority = priority
-    if add_tags:
-        task.tags = list(set(task.tags + add_tags))
-    if remove_tags:
-        task.tags = [t for t in task.tags if t not in remove_tags]
-    
-    task.updated_at = now_utc()
-    save_data(data)
+    with get_storage().transaction() as data:
+        task = data.get_task(task_id)
+        
+        if not task:
+            raise TaskNotFoundError(f"Task #{task_id} not found")
+        
+        if title:
+            task.title = title
+        if description is not None:
+            task.description = description
+        if priority:
+            task.priority = priority
+        if add_tags:
+            task.tags = list(set(task.tags + add_tags))
+        if remove_tags:
+            task.tags = [t for t in task.tags if t not in remove_tags]
+        
+        task.updated_at = now_utc()
     
     console.print(f"[green]Updated task #{task_id}[/green]")
 
@@ -339,17 +424,43 @@ def agent_context(
     value: str = typer.Argument(..., help="Context value")
 ):
     """Set agent context for a task (AI agent integration)"""
-    data = get_data()
-    task = data.get_task(task_id)
+    with get_storage().transaction() as data:
+        task = data.get_task(task_id)
+        
+        if not task:
+            raise TaskNotFoundError(f"Task #{task_id} not found")
+        
+        task.agent_context[key] = value
+        task.updated_at = now_utc()
     
-    if not task:
-        raise TaskNotFoundError(f"Task #{task_id} not found")
+    console.print(f"[green]Set agent context for task #{task_id}: {key} = {value}[/green]")
+
+
+@app.command()
+def batch(
+    source: Optional[Path] = typer.Argument(None, help="NDJSON file of operations (default: stdin)"),
+    atomic: bool = typer.Option(False, "--atomic", help="All or nothing: apply no operation if any fails")
+):
+    """Apply many add/move/edit/agent-context/delete operations with one load and one save
     
-    task.agent_context[key] = value
-    task.updated_at = now_utc()
-    save_data(data)
+    Reads one JSON operation per line (see batch.py) and prints one JSON
+    result per operation. Exits with status 1 if any operation failed.
+    """
+    from batch import BatchAborted, run_batch, format_result
     
-    console.print(f"[green]Set agent context for task #{task_id}: {key} = {value}[/green]")
+    # Read before taking the lock so a slow producer doesn't block other writers
+    lines = source.read_text().splitlines() if source else sys.stdin.read().splitlines()
+    
+    try:
+        with get_storage().transaction() as data:
+            results = run_batch(data, lines, atomic=atomic)
+    except BatchAborted as e:
+        results = e.results
+    
+    for result in results:
+        print(format_result(result))
+    if not all(result["ok"] for result in results):
+        raise typer.Exit(1)
 
 
 @app.command()
@@ -358,7 +469,7 @@ def init_board(
     data_path: Optional[str] = typer.Option(None, "--path", help="Custom data path")
 ):
     """Initialize a new Kanban board"""
-    storage = KanbanStorage(data_path)
+    storage = open_storage(data_path, backend=_backend)
     
     board = Board(
         id="main",
@@ -376,41 +487,316 @@ def init_board(
     console.print(f"[dim]Data stored at: {storage.data_path}[/dim]")
 
 
-@app.command()
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@backup_app.callback(invoke_without_command=True)
 def backup(
-    output: Optional[str] = typer.Option(None, "--output", "-o", help="Backup file path")
+    ctx: typer.Context,
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Backup file path"),
+    incremental: bool = typer.Option(False, "--incremental", "-i", help="Store only changed chunks in the backup store")
 ):
     """Create a backup of the Kanban data"""
+    if ctx.invoked_subcommand is not None:
+        return
+    
+    storage = get_storage()
+    if not incremental:
+        backup_path = storage.backup(output)
+        console.print(f"[green]Backup created: {backup_path}[/green]")
+        return
+    
+    if output:
+        raise KanbanError("--output applies to full backups; incremental ones go to the backup store")
+    manifest = storage.incremental_backup()
+    console.print(
+        f"[green]Backup {manifest['id']} created: {format_size(manifest['size'])} of data, "
+        f"{format_size(manifest['new_bytes'])} new ({manifest['new_chunks']} chunks)[/green]"
+    )
+
+
+@backup_app.command("list")
+def backup_list(
+    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON")
+):
+    """List incremental backups"""
+    manifests = get_storage().list_backups()
+    
+    if json_output:
+        output = [
+            {**{k: m[k] for k in ("id", "created_at", "size", "new_chunks", "new_bytes")}, "files": len(m["files"])}
+            for m in manifests
+        ]
+        print(json.dumps(output, indent=2))
+        return
+    
+    if not manifests:
+        console.print("[dim]No incremental backups (create one with: backup --incremental)[/dim]")
+        return
+    
+    from rich import box
+    from rich.table import Table
+    
+    table = Table(title="💾 Backups", box=box.ROUNDED)
+    table.add_column("ID", style="dim")
+    table.add_column("Created")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Added", justify="right")
+    for m in manifests:
+        created = datetime.fromisoformat(m["created_at"]).strftime('%Y-%m-%d %H:%M:%S')
+        table.add_row(m["id"], created, str(len(m["files"])), format_size(m["size"]), format_size(m["new_bytes"]))
+    console.print(table)
+
+
+@backup_app.command("restore")
+def backup_restore(
+    backup_id: str = typer.Argument(..., help="Backup ID (see `backup list`)"),
+    force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation")
+):
+    """Replace the current data with an incremental backup"""
+    if not force:
+        confirm = typer.confirm(f"Replace the current data with backup {backup_id}? Changes since then are lost.")
+        if not confirm:
+            console.print("Cancelled")
+            return
+    
+    manifest = get_storage().restore_backup(backup_id)
+    console.print(f"[green]Restored backup {manifest['id']} ({len(manifest['files'])} files)[/green]")
+
+
+@backup_app.command("prune")
+def backup_prune(
+    keep: int = typer.Option(..., "--keep", "-k", min=0, help="Number of newest backups to keep")
+):
+    """Delete old incremental backups and the chunks only they used"""
+    removed, chunks = get_storage().prune_backups(keep)
+    if not removed and not chunks:
+        console.print("[dim]Nothing to prune[/dim]")
+        return
+    console.print(f"[green]Removed {len(removed)} backups and {chunks} unused chunks[/green]")
+
+
+@app.command()
+def import_json(
+    json_path: str = typer.Argument(..., help="Existing data.json file to import")
+):
+    """Import a JSON data file into the configured backend (replaces its contents)"""
     storage = get_storage()
-    backup_path = storage.backup(output)
-    console.print(f"[green]Backup created: {backup_path}[/green]")
+    data = storage.import_json(json_path)
+    task_count = sum(b.task_count for b in data.boards)
+    console.print(f"[green]Imported {len(data.boards)} boards and {task_count} tasks into {storage.data_path}[/green]")
 
 
 @app.command()
-def status(
+def convert(
+    output: str = typer.Argument(..., help="Target data path (.kbin = binary snapshot, .json, .db, .d)"),
+    codec: Optional[str] = typer.Option(None, "--codec", help="pretty, compact, fast, packed or binary (default: from the output suffix)"),
+    force: bool = typer.Option(False, "--force", "-f", help="Overwrite an existing target")
+):
+    """Copy the current data into another file format or backend"""
+    target = open_storage(output, codec=codec)
+    if target.data_path.exists() and not force:
+        raise KanbanError(f"{target.data_path} already exists (use --force to overwrite)")
+    
+    data = target.import_data(get_data())
+    task_count = sum(len(b.tasks) for b in data.boards)
+    size = target.data_path.stat().st_size if target.data_path.is_file() else None
+    size_str = f", {size / 1024:.1f} KB" if size is not None else ""
+    console.print(f"[green]Converted {len(data.boards)} boards and {task_count} tasks to {target.data_path}{size_str}[/green]")
+    console.print(f"[dim]Use it with: export KANBAN_DATA_PATH={target.data_path}[/dim]")
+
+
+@app.command()
+def compact():
+    """Fold the operation journal into the data file"""
+    from sqlite_storage import SQLiteKanbanStorage
+    
+    storage = get_storage()
+    if isinstance(storage, SQLiteKanbanStorage):
+        storage.compact()
+        console.print(f"[green]Vacuumed {storage.data_path}[/green]")
+        return
+    if not storage.journaled:
+        console.print("[dim]Journaling is off (set KANBAN_JOURNAL=1); nothing to compact[/dim]")
+        return
+    
+    size = storage.journal_size()
+    storage.compact()
+    console.print(f"[green]Compacted journal ({size} bytes folded into {storage.data_path.name})[/green]")
+
+
+@app.command()
+def history_policy(
+    board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID (uses default if not specified)"),
+    max_entries: Optional[int] = typer.Option(None, "--max-entries", help="Keep at most this many entries per task"),
+    max_age: Optional[float] = typer.Option(None, "--max-age", help="Drop entries older than this many days"),
+    collapse: Optional[bool] = typer.Option(None, "--collapse/--no-collapse", help="Merge runs of consecutive moves into a summary entry"),
+    clear: bool = typer.Option(False, "--clear", help="Remove the board's policy (keep all history)"),
     json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON")
 ):
-    """Show Kanban system status and data file info"""
+    """Show or set a board's task history retention policy
+    
+    The first and last move into each column are always kept. The policy
+    is applied on save to tasks whose history it would at least halve,
+    and to every task by `compact-history`.
+    """
+    from history import HistoryPolicy
+    
     storage = get_storage()
-    data = get_data()
+    board = get_data().get_board(board_id)
+    if not board:
+        raise BoardNotFoundError(f"Board '{board_id}' not found")
+    
+    policy = storage.history_policies().get(board.id)
+    if clear:
+        policy = None
+        storage.set_history_policy(board.id, None)
+    elif max_entries is not None or max_age is not None or collapse is not None:
+        updates = {"max_entries": max_entries, "max_age_days": max_age, "collapse": collapse}
+        current = policy.model_dump() if policy else {}
+        policy = HistoryPolicy.model_validate({**current, **{k: v for k, v in updates.items() if v is not None}})
+        storage.set_history_policy(board.id, policy)
     
     if json_output:
-        output = {
-            "data_path": str(storage.data_path),
-            "data_file_exists": storage.data_path.exists(),
-            "boards_count": len(data.boards),
-            "default_board": data.default_board,
-            "total_tasks": sum(len(b.tasks) for b in data.boards)
-        }
-        print(json.dumps(output, indent=2))
+        print(json.dumps({"board": board.id, "policy": policy.model_dump(exclude_none=True) if policy else None}, indent=2))
+        return
+    
+    if policy is None or policy.is_empty:
+        console.print(f"[dim]{board.name}: all task history is kept[/dim]")
+        return
+    rules = []
+    if policy.max_entries is not None:
+        rules.append(f"at most {policy.max_entries} entries per task")
+    if policy.max_age_days is not None:
+        rules.append(f"entries from the last {policy.max_age_days:g} days")
+    if policy.collapse:
+        rules.append("runs of moves collapsed")
+    console.print(f"[bold]{board.name}[/bold] keeps: {', '.join(rules)} (plus the first and last move into each column)")
+
+
+@app.command()
+def compact_history(
+    board_id: Optional[str] = typer.Option(None, "--board", "-b", help="Board ID (default: all boards)"),
+    dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Only report what would be reclaimed"),
+    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON")
+):
+    """Apply the history retention policies to all stored history and reclaim the space"""
+    results = get_storage().compact_history(board_id, dry_run=dry_run)
+    
+    if json_output:
+        print(json.dumps({"dry_run": dry_run, "boards": results}, indent=2))
         return
     
+    from rich import box
+    from rich.table import Table
+    
+    table = Table(title="History compaction (dry run)" if dry_run else "History compaction", box=box.ROUNDED)
+    table.add_column("Board")
+    table.add_column("Entries", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Reclaimed", justify="right")
+    for result in results:
+        table.add_row(
+            result["board"] + ("" if result["policy"] else " [dim](no policy)[/dim]"),
+            f"{result['entries_before']} → {result['entries_after']}",
+            f"{result['bytes_before']} → {result['bytes_after']}",
+            f"{result['bytes_before'] - result['bytes_after']}",
+        )
+    console.print(table)
+    reclaimed = sum(r["bytes_before"] - r["bytes_after"] for r in results)
+    if dry_run:
+        console.print(f"[dim]Would reclaim {reclaimed} bytes; run without --dry-run to apply[/dim]")
+    else:
+        console.print(f"[green]Reclaimed {reclaimed} bytes[/green]")
+
+
+@app.command()
+def status(
+    json_output: bool = typer.Option(False, *queries.JSON_FLAGS, help="Output as JSON")
+):
+    """Show Kanban system status and data file info"""
+    storage = get_storage()
+    if json_output:
+        queries.print_json(queries.status_output(storage))
+        return
+    
+    data = get_data()
+    trusted = storage.trusted_load_report()
+    
     console.print(f"[bold]Kanban Status[/bold]")
     console.print(f"Data file: {storage.data_path}")
     console.print(f"File exists: {'[green]Yes[/green]' if storage.data_path.exists() else '[red]No[/red]'}")
+    if storage.journaled:
+        console.print(f"Journal: {storage.journal_path} ({storage.journal_size()} bytes)")
+    console.print(f"History log: {storage.history_size()} bytes")
+    if trusted is not None:
+        timing = (
+            f"{trusted['trusted_seconds'] * 1000:.0f} ms unvalidated vs "
+            f"{trusted['validated_seconds'] * 1000:.0f} ms validated"
+        )
+        if trusted["trusted"]:
+            console.print(f"Trusted load: [green]Yes[/green], saves {trusted['saved_seconds'] * 1000:.0f} ms ({timing})")
+        elif trusted["strict"]:
+            console.print(f"Trusted load: [yellow]Off[/yellow] (strict validation; {timing})")
+        else:
+            console.print(f"Trusted load: [yellow]No[/yellow] (checksum doesn't match; the next save restores it)")
     console.print(f"Boards: {len(data.boards)}")
     console.print(f"Default board: {data.default_board}")
-    console.print(f"Total tasks: {sum(len(b.tasks) for b in data.boards)}")
+    console.print(f"Total tasks: {sum(b.task_count for b in data.boards)}")
+
+
+_command = None
+
+
+def run_forwarded(argv: List[str], terminal: bool, width: int) -> None:
+    """Run one command sent to the daemon; output goes to the (redirected) sys.stdout"""
+    global console, _command
+    if _command is None:
+        # Built once: typer rebuilds it from the signatures on every app() call
+        _command = typer.main.get_command(app)
+    saved = console
+    # No file: rich writes to whatever sys.stdout is when it prints
+    console = LazyConsole(force_terminal=terminal, width=width)
+    try:
+        _command.main(args=argv, prog_name="kanban.py")
+    finally:
+        console = saved
+
+
+@app.command()
+def serve(
+    socket_path: Optional[Path] = typer.Option(None, "--socket", help="Socket to listen on (default: $KANBAN_SOCKET or ~/.kanban/daemon.sock)")
+):
+    """Keep the data loaded and run commands from other kanban.py processes
+    
+    While it runs, commands that read or change tasks and boards are sent
+    here over a Unix socket and skip startup and loading. Stop it with
+    Ctrl-C.
+    """
+    from daemon import KanbanDaemon, DaemonError
+    
+    global _storage
+    settings = storage_settings(_backend, _strict)
+    # Cached, so commands reuse the parsed data until the file changes
+    _storage = open_storage(**settings, cache=True)
+    data = _storage.load()
+    
+    try:
+        server = KanbanDaemon(socket_path or default_socket_path(), settings, run_forwarded)
+    except DaemonError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    
+    task_count = sum(b.task_count for b in data.boards)
+    console.print(f"[green]Serving {_storage.data_path} ({task_count} tasks) on {server.path}[/green]")
+    console.print("[dim]Press Ctrl-C to stop[/dim]")
+    server.serve()
 
 
 @app.command()
@@ -419,27 +805,25 @@ def create_board(
     set_default: bool = typer.Option(True, "--default/--no-default", help="Set as default board")
 ):
     """Create a new Kanban board"""
-    data = get_data()
-    
-    # Generate unique board ID
-    base_id = name.lower().replace(" ", "-")[:20]
-    board_id = base_id
-    counter = 1
-    while any(b.id == board_id for b in data.boards):
-        board_id = f"{base_id}-{counter}"
-        counter += 1
-    
-    new_board = Board(
-        id=board_id,
-        name=name,
-        columns=DEFAULT_COLUMNS.copy()
-    )
-    data.boards.append(new_board)
-    
-    if set_default or len(data.boards) == 1:
-        data.default_board = board_id
+    with get_storage().transaction() as data:
+        # Generate unique board ID
+        base_id = name.lower().replace(" ", "-")[:20]
+        board_id = base_id
+        counter = 1
+        while any(b.id == board_id for b in data.boards):
+            board_id = f"{base_id}-{counter}"
+            counter += 1
+        
+        new_board = Board(
+            id=board_id,
+            name=name,
+            columns=DEFAULT_COLUMNS.copy()
+        )
+        data.boards.append(new_board)
+        
+        if set_default or len(data.boards) == 1:
+            data.default_board = board_id
     
-    save_data(data)
     console.print(f"[green]Created board: {name} ({board_id})[/green]")
     if set_default:
         console.print(f"[dim]Set as default board[/dim]")
@@ -447,19 +831,18 @@ def create_board(
 
 @app.command()
 def list_boards(
-    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON")
+    json_output: bool = typer.Option(False, *queries.JSON_FLAGS, help="Output as JSON"),
+    no_history: bool = typer.Option(False, queries.NO_HISTORY_FLAG, help="Leave task history out of JSON output")
 ):
     """List all Kanban boards"""
-    data = get_data()
-    
     if json_output:
-        output = {
-            "boards": [b.model_dump(mode='json') for b in data.boards],
-            "default_board": data.default_board
-        }
-        print(json.dumps(output, indent=2))
+        queries.print_json(queries.list_boards_output(get_storage(), history=not no_history))
         return
     
+    from rich import box
+    from rich.table import Table
+    
+    data = get_data()
     table = Table(title="📋 Boards", box=box.ROUNDED)
     table.add_column("ID", style="dim")
     table.add_column("Name")
@@ -468,7 +851,7 @@ def list_boards(
     
     for board in data.boards:
         is_default = "✓" if board.id == data.default_board else ""
-        task_count = len(board.tasks)
+        task_count = board.task_count
         table.add_row(board.id, board.name, str(task_count), is_default)
     
     console.print(table)
@@ -479,14 +862,12 @@ def switch_board(
     board_id: str = typer.Argument(..., help="Board ID to switch to")
 ):
     """Set the default board"""
-    data = get_data()
-    
-    board = data.get_board(board_id)
-    if not board:
-        raise BoardNotFoundError(f"Board '{board_id}' not found")
-    
-    data.default_board = board_id
-    save_data(data)
+    with get_storage().transaction() as data:
+        board = data.get_board(board_id)
+        if not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        
+        data.default_board = board_id
     console.print(f"[green]Switched to board: {board.name} ({board_id})[/green]")
 
 
@@ -496,30 +877,35 @@ def delete_board(
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation")
 ):
     """Delete a Kanban board and all its tasks"""
-    data = get_data()
-    
-    board = data.get_board(board_id)
-    if not board:
-        raise BoardNotFoundError(f"Board '{board_id}' not found")
-    
-    if len(data.boards) <= 1:
-        raise KanbanError("Cannot delete the only board. Create another board first.")
-    
     if not force:
-        task_count = len(board.tasks)
+        # Ask before taking the lock so a waiting prompt doesn't block other writers
+        data = get_data()
+        board = data.get_board(board_id)
+        if not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        if len(data.boards) <= 1:
+            raise KanbanError("Cannot delete the only board. Create another board first.")
+        task_count = board.task_count
         warning = f" with {task_count} tasks" if task_count > 0 else ""
         confirm = typer.confirm(f"Delete board '{board.name}'{warning}? This cannot be undone.")
         if not confirm:
             console.print("Cancelled")
             return
     
-    data.boards = [b for b in data.boards if b.id != board_id]
-    
-    # If we deleted the default board, set a new default
-    if data.default_board == board_id and data.boards:
-        data.default_board = data.boards[0].id
+    with get_storage().transaction() as data:
+        board = data.get_board(board_id)
+        if not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        
+        if len(data.boards) <= 1:
+            raise KanbanError("Cannot delete the only board. Create another board first.")
+        
+        data.boards = [b for b in data.boards if b.id != board_id]
+        
+        # If we deleted the default board, set a new default
+        if data.default_board == board_id and data.boards:
+            data.default_board = data.boards[0].id
     
-    save_data(data)
     console.print(f"[green]Deleted board: {board.name} ({board_id})[/green]")
 
 
@@ -542,19 +928,20 @@ def handle_exception(exc: Exception) -> None:
 
 @app.callback()
 def main(
-    version: Optional[bool] = typer.Option(None, "--version", "-v", help="Show version")
+    version: Optional[bool] = typer.Option(None, "--version", "-v", help="Show version"),
+    backend: Optional[str] = typer.Option(None, "--backend", help="Storage backend: json, sqlite or sharded (default: from data path)"),
+    strict: bool = typer.Option(False, "--strict", help="Validate all loaded data, even files unchanged since they were saved")
 ):
     """Kanban CLI - Personal task board for AI agent collaboration"""
     if version:
         console.print("Kanban CLI v1.0.0")
         raise typer.Exit()
     
-    # Add exception handler for all commands
-    from typing import get_type_hints
-    app.registered_commands = getattr(app, 'registered_commands', [])
-    
-    # Register exception handling wrapper
-    pass
+    global _backend, _strict
+    if backend:
+        _backend = backend
+    if strict:
+        _strict = True
 
 
 if __name__ == "__main__":
@@ -264,8 +264,9 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-from models import KanbanData, Board, Task, Column, Priority, now_utc
+from models import Board, Task, Column, Priority, ColumnError, now_utc
 from storage import KanbanStorage
+from versions import DataVersion, Draft, VersionCache
 from streamlit_sortables import sort_items
 
 
@@ -344,14 +345,18 @@ def build_sortable_items(board: Board, search: str = "", tag_filter: str = "all"
     tag_filter = tag_filter or "all"
     items = []
     
+    # Full-text index lookup; the index is kept on disk and updated incrementally
+    matches = None
+    if search.strip():
+        _, results = get_storage().search_tasks(search, board.id)
+        matches = {t.id for t, _ in results}
+    
     for col in sorted(board.columns, key=lambda x: x.order):
         # Filter tasks for this column
-        tasks = board.get_tasks_in_column(col.id)
+        tasks = board.find_tasks(column=col.id, tags=[tag_filter] if tag_filter != "all" else ())
         
-        if search:
-            tasks = [t for t in tasks if search.lower() in t.title.lower()]
-        if tag_filter != "all":
-            tasks = [t for t in tasks if tag_filter in t.tags]
+        if matches is not None:
+            tasks = [t for t in tasks if t.id in matches]
         
         # Build task items with display info
         task_items = []
@@ -380,15 +385,17 @@ def _parse_task_id(item_str: str) -> Optional[int]:
         return None
 
 
-def process_sortable_movement(original_items: list, sorted_items: list, board: Board, data: KanbanData) -> tuple:
+def process_sortable_movement(original_items: list, sorted_items: list, board: Board, draft: Draft) -> tuple:
     """Process drag-and-drop movements and update task positions
     
+    All cards moved in one drag are admitted or rejected together, against
+    the WIP limits after the whole batch (raises ColumnError if rejected).
+    The moves are made in `draft`; `board` is only read.
+    
     Returns: (moved_tasks_count, updated_board)
     """
-    moved_count = 0
-    
     if not sorted_items or len(original_items) != len(sorted_items):
-        return moved_count, board
+        return 0, board
     
     # Build original column mapping
     original_mapping = {}  # task_id -> column_id
@@ -399,7 +406,8 @@ def process_sortable_movement(original_items: list, sorted_items: list, board: B
             if task_id is not None:
                 original_mapping[task_id] = column_id
     
-    # Check for movements in sorted result
+    # Collect the moves in the sorted result
+    moves = {}  # task_id -> new column_id
     for container in sorted_items:
         column_id = container.get('column_id')
         for item in container.get('items', []):
@@ -409,28 +417,28 @@ def process_sortable_movement(original_items: list, sorted_items: list, board: B
             original_column = original_mapping.get(task_id)
             
             # Task moved to a different column
-            if original_column and original_column != column_id:
-                task = data.get_task(task_id)
-                if task:
-                    ok, err = board.can_add_to_column(column_id)
-                    if ok:
-                        task.move_to(column_id)
-                        moved_count += 1
-                    else:
-                        # Log warning but don't fail
-                        pass
-    
-    return moved_count, board
-
-@st.cache_data
-def load_data() -> KanbanData:
-    storage = KanbanStorage()
-    return storage.load()
-
-def save_data(data: KanbanData):
-    storage = KanbanStorage()
-    storage.save(data)
-    st.cache_data.clear()
+            if original_column and original_column != column_id and board.get_task(task_id):
+                moves[task_id] = column_id
+    
+    moved = draft.move_tasks(moves, board.id)
+    return len(moved), draft.data.get_board(board.id)
+
+@st.cache_resource
+def get_storage() -> KanbanStorage:
+    # Shared across reruns so its parsed-data cache survives; load() skips parsing unchanged files
+    return KanbanStorage(cache=True)
+
+@st.cache_resource
+def get_versions() -> VersionCache:
+    # One immutable version of the data for every session and rerun, never copied:
+    # edits go through a copy-on-write draft (see versions.py)
+    return VersionCache(get_storage())
+
+def load_data() -> DataVersion:
+    return get_versions().current()
+
+def save_data(draft: Draft) -> DataVersion:
+    return get_versions().commit(draft)
 
 # Initialize session state
 if 'show_add' not in st.session_state:
@@ -453,8 +461,10 @@ if 'sortable_key' not in st.session_state:
     st.session_state.sortable_key = "kanban_sortable"
 if 'delete_confirm' not in st.session_state:
     st.session_state.delete_confirm = None  # Task ID pending confirmation
+if 'move_error' not in st.session_state:
+    st.session_state.move_error = None  # Why the last drag was rejected
 
-def render_task_card(task: Task, board: Board, data: KanbanData):
+def render_task_card(task: Task, board: Board, version: DataVersion):
     """Render minimal task card with click-to-edit"""
     priority_class = f"priority-{task.priority.value}"
     
@@ -506,8 +516,9 @@ def render_task_card(task: Task, board: Board, data: KanbanData):
             c_confirm, c_cancel = st.columns(2)
             with c_confirm:
                 if st.button("✓ delete", key=f"del_yes_{task.id}", type="primary"):
-                    board.tasks = [t for t in board.tasks if t.id != task.id]
-                    save_data(data)
+                    draft = version.edit()
+                    draft.board(board.id).remove_task(task.id)
+                    save_data(draft)
                     st.session_state.delete_confirm = None
                     st.rerun()
             with c_cancel:
@@ -530,14 +541,15 @@ def render_task_card(task: Task, board: Board, data: KanbanData):
                     if st.button(col_label, key=f"to_{task.id}_{col_dest.id}", use_container_width=True):
                         ok, err = board.can_add_to_column(col_dest.id)
                         if ok:
-                            task.move_to(col_dest.id)
+                            draft = version.edit()
+                            draft.task(task.id, board.id).move_to(col_dest.id)
                             st.session_state.show_move_menu = None
-                            save_data(data)
+                            save_data(draft)
                             st.rerun()
                         else:
                             st.error(err)
 
-def render_add_form(board: Board, data: KanbanData):
+def render_add_form(board: Board, version: DataVersion):
     """Render minimal add form"""
     with st.form("add"):
         st.markdown("**new task**")
@@ -565,8 +577,9 @@ def render_add_form(board: Board, data: KanbanData):
             cid = col[1]
             ok, err = board.can_add_to_column(cid)
             if ok:
+                draft = version.edit()
                 task = Task(
-                    id=board.get_next_task_id(data),
+                    id=board.get_next_task_id(draft.data),
                     board_id=board.id,
                     column_id=cid,
                     title=title,
@@ -574,8 +587,8 @@ def render_add_form(board: Board, data: KanbanData):
                     priority=Priority(pri),
                     tags=[t.strip() for t in tags.split(",") if t.strip()]
                 )
-                board.tasks.append(task)
-                save_data(data)
+                draft.board(board.id).add_task(task)
+                save_data(draft)
                 st.session_state.show_add = False
                 st.rerun()
             else:
@@ -585,7 +598,7 @@ def render_add_form(board: Board, data: KanbanData):
             st.session_state.show_add = False
             st.rerun()
 
-def render_edit_form(task: Task, board: Board, data: KanbanData):
+def render_edit_form(task: Task, board: Board, version: DataVersion):
     """Render edit form for existing task"""
     with st.form("edit"):
         st.markdown(f"**edit task #{task.id}**")
@@ -604,15 +617,15 @@ def render_edit_form(task: Task, board: Board, data: KanbanData):
         tags = st.text_input("tags", value=", ".join(task.tags), label_visibility="collapsed")
         
         # Agent context editor
-        if task.agent_context:
+        context = dict(task.agent_context)
+        if context:
             st.markdown("<div style='font-size:0.7rem;color:#666;margin-top:8px;'>agent context</div>", unsafe_allow_html=True)
-            for key in list(task.agent_context.keys()):
+            for key in list(context.keys()):
                 c_key, c_val = st.columns([1, 3])
                 with c_key:
                     st.markdown(f"<span style='font-size:0.7rem;color:#888;'>{key}</span>", unsafe_allow_html=True)
                 with c_val:
-                    new_val = st.text_input(f"ctx_{key}", value=task.agent_context[key], label_visibility="collapsed")
-                    task.agent_context[key] = new_val
+                    context[key] = st.text_input(f"ctx_{key}", value=context[key], label_visibility="collapsed")
         
         c_save, c_cancel = st.columns(2)
         with c_save:
@@ -621,13 +634,16 @@ def render_edit_form(task: Task, board: Board, data: KanbanData):
             cancelled = st.form_submit_button("✕ cancel", use_container_width=True)
         
         if submitted:
+            draft = version.edit()
+            task = draft.task(task.id)
             task.title = title
             task.description = desc if desc else None
             task.priority = Priority(pri)
             task.column_id = col[1]
             task.tags = [t.strip() for t in tags.split(",") if t.strip()]
+            task.agent_context = context
             task.updated_at = now_utc()
-            save_data(data)
+            save_data(draft)
             st.session_state.show_edit = False
             st.session_state.editing_task_id = None
             st.rerun()
@@ -637,7 +653,7 @@ def render_edit_form(task: Task, board: Board, data: KanbanData):
             st.session_state.editing_task_id = None
             st.rerun()
 
-def render_create_board_form(data: KanbanData):
+def render_create_board_form(version: DataVersion):
     """Render form to create a new board"""
     with st.form("create_board"):
         st.markdown("**create new board**")
@@ -655,7 +671,7 @@ def render_create_board_form(data: KanbanData):
             base_id = name.lower().replace(" ", "-")[:20]
             board_id = base_id
             counter = 1
-            while any(b.id == board_id for b in data.boards):
+            while any(b.id == board_id for b in version.data.boards):
                 board_id = f"{base_id}-{counter}"
                 counter += 1
             
@@ -665,9 +681,10 @@ def render_create_board_form(data: KanbanData):
                 name=name,
                 columns=DEFAULT_COLUMNS.copy()
             )
-            data.boards.append(new_board)
-            data.default_board = board_id
-            save_data(data)
+            draft = version.edit()
+            draft.add_board(new_board)
+            draft.data.default_board = board_id
+            save_data(draft)
             
             st.session_state.current_board_id = board_id
             st.session_state.show_create_board = False
@@ -677,7 +694,7 @@ def render_create_board_form(data: KanbanData):
             st.session_state.show_create_board = False
             st.rerun()
 
-def render_task_detail(task: Task, board: Board, data: KanbanData):
+def render_task_detail(task: Task, board: Board, version: DataVersion):
     st.markdown(f"### #{task.id}")
     st.markdown(f"**{task.title}**")
     
@@ -700,7 +717,7 @@ def render_task_detail(task: Task, board: Board, data: KanbanData):
         st.rerun()
 
 
-def render_task_actions_list(board: Board, data: KanbanData):
+def render_task_actions_list(board: Board, version: DataVersion):
     cols = st.columns(len(board.columns))
     for idx, col in enumerate(sorted(board.columns, key=lambda x: x.order)):
         tasks = board.get_tasks_in_column(col.id)
@@ -740,8 +757,9 @@ def render_task_actions_list(board: Board, data: KanbanData):
                     c_del_yes, c_del_no = st.columns([1, 1])
                     with c_del_yes:
                         if st.button("✓", key=f"act_del_yes_{task.id}", type="primary"):
-                            board.tasks = [t for t in board.tasks if t.id != task.id]
-                            save_data(data)
+                            draft = version.edit()
+                            draft.board(board.id).remove_task(task.id)
+                            save_data(draft)
                             st.session_state.delete_confirm = None
                             st.rerun()
                     with c_del_no:
@@ -749,15 +767,25 @@ def render_task_actions_list(board: Board, data: KanbanData):
                             st.session_state.delete_confirm = None
                             st.rerun()
 
+FIVE_COLUMNS = {
+    "backlog": ("Backlog", 0),
+    "todo": ("To Do", 1),
+    "inprogress": ("In Progress", 2),
+    "testing": ("Testing", 3),
+    "done": ("Done", 4),
+}
+
+def needs_five_columns(board: Board) -> bool:
+    """Whether ensure_five_columns() would change the board (without changing it)"""
+    existing = {c.id: (c.name, c.order) for c in board.columns}
+    if any(existing.get(col_id) != expected for col_id, expected in FIVE_COLUMNS.items()):
+        return True
+    orders = [c.order for c in board.columns]
+    return orders != sorted(orders)
+
 def ensure_five_columns(board: Board):
     """Ensure board has all 5 columns with correct order"""
-    expected_columns = {
-        "backlog": ("Backlog", 0),
-        "todo": ("To Do", 1),
-        "inprogress": ("In Progress", 2),
-        "testing": ("Testing", 3),
-        "done": ("Done", 4),
-    }
+    expected_columns = FIVE_COLUMNS
     
     existing_ids = {c.id for c in board.columns}
     changed = False
@@ -776,7 +804,7 @@ def ensure_five_columns(board: Board):
     # Add missing columns
     for col_id, (col_name, order) in expected_columns.items():
         if col_id not in existing_ids:
-            board.columns.append(Column(
+            board.add_column(Column(
                 id=col_id,
                 name=col_name,
                 limit=3 if col_id == "inprogress" else None,
@@ -790,7 +818,8 @@ def ensure_five_columns(board: Board):
     return changed
 
 def main():
-    data = load_data()
+    version = load_data()
+    data = version.data  # shared with every other run: read only, edit through version.edit()
     
     # Get current board (from session state or default)
     current_board_id = st.session_state.current_board_id or data.default_board
@@ -801,8 +830,12 @@ def main():
         return
     
     # Ensure board has all 5 columns with correct order, save if changed
-    if ensure_five_columns(board):
-        save_data(data)
+    if needs_five_columns(board):
+        draft = version.edit()
+        ensure_five_columns(draft.board(board.id))
+        version = save_data(draft)
+        data = version.data
+        board = data.get_board(current_board_id)
     
     # Title
     st.markdown(f"<h1>◼ {board.name}</h1>", unsafe_allow_html=True)
@@ -811,7 +844,7 @@ def main():
     if st.session_state.viewing_task:
         task = data.get_task(st.session_state.viewing_task)
         if task:
-            render_task_detail(task, board, data)
+            render_task_detail(task, board, version)
             return
         else:
             del st.session_state.viewing_task
@@ -821,7 +854,7 @@ def main():
         task = data.get_task(st.session_state.editing_task_id)
         if task:
             st.markdown("---")
-            render_edit_form(task, board, data)
+            render_edit_form(task, board, version)
             st.markdown("---")
             return
         else:
@@ -831,13 +864,13 @@ def main():
     # Handle add new task
     if st.session_state.show_add:
         st.markdown("---")
-        render_add_form(board, data)
+        render_add_form(board, version)
         st.markdown("---")
     
     # Handle create new board
     if st.session_state.show_create_board:
         st.markdown("---")
-        render_create_board_form(data)
+        render_create_board_form(version)
         st.markdown("---")
         return
     
@@ -850,7 +883,7 @@ def main():
                 st.rerun()
         with c3:
             if st.button("refresh"):
-                st.cache_data.clear()
+                # Every run re-checks the data file; this just forces a run
                 st.rerun()
     
     # Sidebar filters
@@ -885,7 +918,7 @@ def main():
         
         st.markdown("**stats**")
         for col in sorted(board.columns, key=lambda x: x.order):
-            count = len(board.get_tasks_in_column(col.id))
+            count = board.column_task_count(col.id)
             limit = f"/{col.limit}" if col.limit else ""
             st.markdown(f"<div style='font-size:0.7rem;color:#666'>{col.name.lower()}: <span style='color:#888'>{count}{limit}</span></div>", unsafe_allow_html=True)
         
@@ -910,11 +943,9 @@ def main():
         search = st.text_input("search", value=search, placeholder="...", label_visibility="collapsed")
         st.session_state.search_filter = search
         
-        all_tags = set()
-        for t in board.tasks:
-            all_tags.update(t.tags)
+        all_tags = board.all_tags()
         if all_tags:
-            tag_filter = st.selectbox("tag", ["all"] + sorted(list(all_tags)), index=0 if tag_filter == "all" else sorted(list(all_tags)).index(tag_filter) + 1 if tag_filter in all_tags else 0, label_visibility="collapsed")
+            tag_filter = st.selectbox("tag", ["all"] + all_tags, index=0 if tag_filter == "all" else all_tags.index(tag_filter) + 1 if tag_filter in all_tags else 0, label_visibility="collapsed")
         else:
             tag_filter = "all"
         st.session_state.tag_filter = tag_filter
@@ -922,6 +953,11 @@ def main():
     # Build sortable items from current board state
     original_items = build_sortable_items(board, str(search) if search else "", str(tag_filter) if tag_filter else "all")
     
+    # A drag rejected on the previous run (see below)
+    if st.session_state.move_error:
+        st.warning(st.session_state.move_error)
+        st.session_state.move_error = None
+    
     # Render draggable columns
     sorted_items = sort_items(
         original_items,
@@ -933,16 +969,22 @@ def main():
     
     # Process any drag-and-drop movements
     if sorted_items != original_items:
-        moved_count, board = process_sortable_movement(original_items, sorted_items, board, data)
+        draft = version.edit()
+        try:
+            moved_count, board = process_sortable_movement(original_items, sorted_items, board, draft)
+        except ColumnError as e:
+            # Nothing was moved: put the cards back and say why on the next run
+            st.session_state.move_error = str(e)
+            st.session_state.sortable_key = f"kanban_sortable_{hash(str(sorted_items))}"
+            st.rerun()
         if moved_count > 0:
-            save_data(data)
-            st.cache_data.clear()
+            save_data(draft)
         # Increment key to force re-render with fresh state
             st.session_state.sortable_key = f"kanban_sortable_{hash(str(sorted_items))}"
             st.rerun()
 
     # Actions list for view/edit/delete
-    render_task_actions_list(board, data)
+    render_task_actions_list(board, version)
 
 if __name__ == "__main__":
     main()
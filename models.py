@@ -4,13 +4,15 @@ Kanban Tracker - Personal Kanban Board for AI Agent Collaboration
 
 from __future__ import annotations
 
+import copy
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Set, Any, Callable, Iterable, Iterator, TYPE_CHECKING
+from pydantic import BaseModel, Field, PrivateAttr, model_serializer
 from enum import Enum
 
 if TYPE_CHECKING:
     from models import KanbanData
+    from taskstore import TaskStore
 
 
 def now_utc() -> datetime:
@@ -76,13 +78,121 @@ class Task(BaseModel):
         description="Change history"
     )
 
+    # Set whenever a field is reassigned; lets journaled storage write only changed tasks
+    _dirty: bool = PrivateAttr(default=False)
+
+    # History kept out of line by the storage: read through the loader on first access.
+    # Entries added before that are held in _history_pending.
+    _history_loader: Optional[Callable[["Task"], List[Dict[str, Any]]]] = PrivateAttr(default=None)
+    _history_pending: Optional[List[Dict[str, Any]]] = PrivateAttr(default=None)
+    # Number of leading `history` entries already written to the storage's history log
+    _history_logged: int = PrivateAttr(default=0)
+
+    # The board whose indexes hold this task, and its position in them (see Board._index)
+    _board: Optional["Board"] = PrivateAttr(default=None)
+    _board_seq: int = PrivateAttr(default=0)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        old_value = self.__dict__.get(name)
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dirty = True
+            if name in INDEXED_TASK_FIELDS:
+                board = self.__pydantic_private__["_board"]
+                if board is not None and old_value != value:
+                    board._task_changed(self, name, old_value)
+            if name == "history":
+                # A replaced history is written out in full
+                self._history_loader = None
+                self._history_pending = None
+                self._history_logged = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes missing from __dict__, e.g. deferred history
+        if name == "history" and self.__pydantic_private__ and self.__pydantic_private__["_history_loader"]:
+            return self.load_history()
+        return super().__getattr__(name)
+
+    def defer_history(self, loader: Callable[["Task"], List[Dict[str, Any]]]) -> None:
+        """Drop the (empty) in-memory history; `loader` returns the stored entries on first access
+
+        Tasks that still carry inline history (older data files) keep it, so
+        the storage can migrate it to its history log.
+        """
+        # Called for every task on load, so skip pydantic's (slow) private attribute access
+        if self.__dict__.get("history"):
+            return
+        self.__dict__.pop("history", None)
+        self.__pydantic_private__["_history_loader"] = loader
+
+    @property
+    def history_loaded(self) -> bool:
+        """False while the history is deferred to the storage's history log"""
+        return self._history_loader is None
+
+    def load_history(self) -> List[Dict[str, Any]]:
+        """Return the full history, reading deferred entries from storage if needed"""
+        loader = self._history_loader
+        if loader is not None:
+            stored = loader(self)
+            self._history_loader = None
+            self.__dict__["history"] = stored + (self._history_pending or [])
+            self._history_pending = None
+            self._history_logged = len(stored)
+        return self.__dict__["history"]
+
+    def add_history(self, entry: Dict[str, Any]) -> None:
+        """Record a history entry without loading deferred history"""
+        if self._history_loader is not None:
+            if self._history_pending is None:
+                self._history_pending = []
+            self._history_pending.append(entry)
+        else:
+            self.history.append(entry)
+
+    def unlogged_history(self) -> tuple[bool, List[Dict[str, Any]]]:
+        """(replace, entries) not yet in the storage's history log
+
+        `replace` means earlier logged entries for this task are superseded.
+        """
+        private = self.__pydantic_private__  # called for every task on save
+        if private["_history_loader"] is not None:
+            return False, private["_history_pending"] or []
+        logged = private["_history_logged"]
+        return logged == 0, self.__dict__["history"][logged:]
+
+    def mark_history_logged(self) -> None:
+        """Note that unlogged_history() has been written to the history log"""
+        if self._history_loader is not None:
+            self._history_pending = None
+        else:
+            self._history_logged = len(self.__dict__["history"])
+
+    def fork(self) -> "Task":
+        """A copy to change instead of this task, sharing no mutable values with it (see versions.py)
+
+        Deferred history stays deferred: the fork reads it through the same
+        loader.
+        """
+        forked = self.model_copy()
+        fields = forked.__dict__
+        fields["tags"] = list(fields["tags"])
+        fields["agent_context"] = copy.deepcopy(fields["agent_context"])
+        if "history" in fields:
+            fields["history"] = list(fields["history"])
+        private = forked.__pydantic_private__
+        if private["_history_pending"] is not None:
+            private["_history_pending"] = list(private["_history_pending"])
+        private["_board"] = None
+        return forked
+
     def move_to(self, column_id: str, reason: Optional[str] = None):
         """Move task to a different column and log the change"""
         old_column = self.column_id
         self.column_id = column_id
         self.updated_at = now_utc()
         
-        self.history.append({
+        self.add_history({
             "action": "moved",
             "from_column": old_column,
             "to_column": column_id,
@@ -91,6 +201,10 @@ class Task(BaseModel):
         })
 
 
+# Task fields the owning board indexes (see Board._index)
+INDEXED_TASK_FIELDS = frozenset({"column_id", "priority", "tags"})
+
+
 class Board(BaseModel):
     """A Kanban board containing columns and tasks"""
     id: str = Field(default="main", description="Board identifier")
@@ -100,20 +214,537 @@ class Board(BaseModel):
     created_at: datetime = Field(default_factory=now_utc)
     updated_at: datetime = Field(default_factory=now_utc)
 
+    # Set on boards created by Board.lazy(); fills in the missing fields on first access
+    _loader: Optional[Callable[["Board"], None]] = PrivateAttr(default=None)
+    _task_count_hint: int = PrivateAttr(default=0)
+
+    # Set on boards created by Board.with_store(): the tasks live in a columnar TaskStore
+    # until the task list itself is needed. Rows materialized on the way are kept in
+    # _store_tasks (so they stay the same objects) and passed to _store_hook once.
+    _store: Optional["TaskStore"] = PrivateAttr(default=None)
+    _store_tasks: Dict[int, Task] = PrivateAttr(default_factory=dict)
+    _store_hook: Optional[Callable[[Task], None]] = PrivateAttr(default=None)
+
+    # Lookup indexes, built on first use: task id -> task, column id -> its tasks in list
+    # order, column id -> column, and tag / priority -> task ids. Kept current by
+    # add_task/remove_task/add_column and by tasks changing column, priority or tags
+    # (reassigned, not mutated in place); a task list replaced or appended to directly
+    # is re-indexed.
+    _tasks_by_id: Optional[Dict[int, Task]] = PrivateAttr(default=None)
+    _column_tasks: Optional[Dict[str, List[Task]]] = PrivateAttr(default=None)
+    _columns_by_id: Optional[Dict[str, Column]] = PrivateAttr(default=None)
+    _tag_ids: Optional[Dict[str, Set[int]]] = PrivateAttr(default=None)
+    _priority_ids: Optional[Dict[Priority, Set[int]]] = PrivateAttr(default=None)
+    # (list, length) of the tasks and columns the indexes describe
+    _indexed: Optional[tuple] = PrivateAttr(default=None)
+    _next_seq: int = PrivateAttr(default=0)
+
+    # The KanbanData whose task locator covers this board, told about added/removed tasks
+    _owner: Optional["KanbanData"] = PrivateAttr(default=None)
+
+    # Ids of tasks added or removed since the last save; see changed_task_ids()
+    _changed_ids: Set[int] = PrivateAttr(default_factory=set)
+
+    @classmethod
+    def lazy(cls, board_id: str, name: str, loader: Callable[["Board"], None], task_count: int = 0) -> "Board":
+        """Create a board stub whose columns and tasks are loaded on first access
+
+        `loader` receives the stub and must fill in its missing fields.
+        """
+        board = cls.model_construct(id=board_id, name=name)
+        for field in cls.model_fields:
+            if field not in ("id", "name"):
+                board.__dict__.pop(field, None)
+        board._loader = loader
+        board._task_count_hint = task_count
+        return board
+
+    @classmethod
+    def with_store(cls, store: "TaskStore", **fields: Any) -> "Board":
+        """Create a board whose tasks are read from a TaskStore row by row, as needed"""
+        board = cls.model_construct(**fields)
+        board.__dict__.pop("tasks", None)
+        board._store = store
+        return board
+
+    @property
+    def has_task_store(self) -> bool:
+        """True while the tasks are still held in a TaskStore rather than a list"""
+        return self.__pydantic_private__["_store"] is not None
+
+    def on_task_materialized(self, hook: Callable[[Task], None]) -> None:
+        """Call `hook` on each task as it's materialized from the TaskStore"""
+        self._store_hook = hook
+
+    def _store_task(self, row: int) -> Task:
+        """The Task for a TaskStore row, materialized once"""
+        private = self.__pydantic_private__
+        cached = private["_store_tasks"]
+        task = cached.get(row)
+        if task is None:
+            task = private["_store"].task(row)
+            task_private = task.__pydantic_private__
+            task_private["_board"] = self
+            task_private["_board_seq"] = row
+            hook = private["_store_hook"]
+            if hook is not None:
+                hook(task)
+            cached[row] = task
+        return task
+
+    def _materialize_tasks(self) -> None:
+        """Replace the TaskStore with a list of Task models"""
+        private = self.__pydantic_private__
+        store = private["_store"]
+        if store is None:
+            return
+        self.__dict__["tasks"] = [self._store_task(row) for row in range(len(store))]
+        private["_store"] = None
+        private["_store_tasks"] = {}
+
+    def _materialized_tasks(self) -> Iterable[Task]:
+        """Tasks that exist as models: a TaskStore's materialized rows only, none while lazy"""
+        private = self.__pydantic_private__
+        if private["_loader"] is not None:
+            return ()
+        if private["_store"] is not None:
+            return private["_store_tasks"].values()
+        return self.__dict__.get("tasks", ())
+
+    def changed_task_ids(self) -> Set[int]:
+        """Ids of tasks added, removed or with a field reassigned since the board was loaded or last saved"""
+        ids = set(self.__pydantic_private__["_changed_ids"])
+        ids.update(task.__dict__["id"] for task in self._materialized_tasks() if task.__pydantic_private__["_dirty"])
+        return ids
+
+    def unsaved_tasks(self) -> List[Task]:
+        """Tasks a save would write to or mark written: reassigned fields or history not yet logged"""
+        return [
+            task for task in self._materialized_tasks()
+            if task.__pydantic_private__["_dirty"] or task.unlogged_history()[1]
+        ]
+
+    def mark_saved(self) -> None:
+        """Clear what changed_task_ids() reports, once the storage has written the board
+
+        Objects with nothing to clear aren't written to, so boards and tasks
+        shared with older data versions (see versions.py) stay untouched.
+        """
+        private = self.__pydantic_private__
+        if private["_changed_ids"]:
+            private["_changed_ids"] = set()
+        for task in self._materialized_tasks():
+            task_private = task.__pydantic_private__
+            if task_private["_dirty"]:
+                task_private["_dirty"] = False
+
+    def task_ids(self) -> Iterable[int]:
+        """Ids of the board's tasks in order, without materializing a TaskStore"""
+        store = self.__pydantic_private__["_store"]
+        if store is not None:
+            return store.ids
+        return [task.__dict__["id"] for task in self.tasks]
+
+    @property
+    def is_loaded(self) -> bool:
+        """False for a lazy stub that hasn't been materialized yet"""
+        return self._loader is None
+
+    @property
+    def task_count(self) -> int:
+        """Number of tasks, without materializing a lazy board"""
+        store = self.__pydantic_private__["_store"]
+        if store is not None:
+            return len(store)
+        return len(self.tasks) if self.is_loaded else self._task_count_hint
+
+    def materialize(self) -> None:
+        """Load the fields of a lazy board stub (no-op once loaded)"""
+        loader = self._loader
+        if loader is not None:
+            self._loader = None
+            loader(self)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for fields missing from __dict__: on a lazy stub, or tasks held in a TaskStore
+        private = self.__pydantic_private__
+        if name in type(self).model_fields and private:
+            if private["_loader"] is not None:
+                self.materialize()
+            if name == "tasks" and private["_store"] is not None:
+                self._materialize_tasks()
+            if name in self.__dict__:
+                return self.__dict__[name]
+        return super().__getattr__(name)
+
+    @model_serializer(mode='wrap')
+    def _serialize(self, handler):
+        self.materialize()
+        self._materialize_tasks()
+        return handler(self)
+
     def get_next_task_id(self, data: "KanbanData") -> int:
         """Generate next available task ID using global monotonic counter"""
         return data.allocate_task_id()
 
+    def _index(self) -> None:
+        """(Re)build the lookup indexes unless they still match the task and column lists"""
+        tasks = self.tasks
+        columns = self.columns
+        private = self.__pydantic_private__
+        indexed = private["_indexed"]
+        if (indexed is not None and indexed[0] is tasks and indexed[1] == len(tasks)
+                and indexed[2] is columns and indexed[3] == len(columns)):
+            return
+
+        by_id: Dict[int, Task] = {}
+        buckets: Dict[str, List[Task]] = {}
+        tag_ids: Dict[str, Set[int]] = {}
+        priority_ids: Dict[Priority, Set[int]] = {}
+        for seq, task in enumerate(tasks):
+            task_private = task.__pydantic_private__
+            task_private["_board"] = self
+            task_private["_board_seq"] = seq
+            fields = task.__dict__
+            task_id = fields["id"]
+            by_id.setdefault(task_id, task)
+            column_id = fields["column_id"]
+            bucket = buckets.get(column_id)
+            if bucket is None:
+                buckets[column_id] = [task]
+            else:
+                bucket.append(task)
+            for tag in fields["tags"]:
+                ids = tag_ids.get(tag)
+                if ids is None:
+                    tag_ids[tag] = {task_id}
+                else:
+                    ids.add(task_id)
+            priority_ids.setdefault(Priority(fields["priority"]), set()).add(task_id)
+
+        private["_tasks_by_id"] = by_id
+        private["_column_tasks"] = buckets
+        private["_columns_by_id"] = {col.id: col for col in columns}
+        private["_tag_ids"] = tag_ids
+        private["_priority_ids"] = priority_ids
+        private["_indexed"] = (tasks, len(tasks), columns, len(columns))
+        private["_next_seq"] = len(tasks)
+
+    def _bucket_position(self, bucket: List[Task], seq: int) -> int:
+        """Where a task with this sequence number sits (or belongs) in a column bucket"""
+        lo, hi = 0, len(bucket)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bucket[mid].__pydantic_private__["_board_seq"] < seq:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _index_values(self, task_id: int, field: str, old: Iterable[Any], new: Iterable[Any]) -> None:
+        """Move a task id between the tag or priority index sets"""
+        if field == "tags":
+            index = self.__pydantic_private__["_tag_ids"]
+        else:
+            index = self.__pydantic_private__["_priority_ids"]
+            old = [Priority(v) for v in old]
+            new = [Priority(v) for v in new]
+        for value in old:
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del index[value]
+        for value in new:
+            index.setdefault(value, set()).add(task_id)
+
+    def _task_changed(self, task: Task, field: str, old_value: Any) -> None:
+        """Update the indexes after an indexed field of a task was reassigned"""
+        private = self.__pydantic_private__
+        store = private["_store"]
+        if store is not None:
+            row = task.__pydantic_private__["_board_seq"]
+            if private["_store_tasks"].get(row) is task:
+                store.update(row, field, getattr(task, field))
+            return
+        by_id = private["_tasks_by_id"]
+        if by_id is None or by_id.get(task.id) is not task:
+            return  # Not indexed (yet), or a copy of an indexed task
+
+        if field == "tags":
+            self._index_values(task.id, field, old_value or (), task.tags)
+        elif field == "priority":
+            self._index_values(task.id, field, [old_value], [task.priority])
+        else:
+            seq = task.__pydantic_private__["_board_seq"]
+            buckets = private["_column_tasks"]
+            bucket = buckets.get(old_value)
+            if bucket is not None:
+                pos = self._bucket_position(bucket, seq)
+                if pos < len(bucket) and bucket[pos] is task:
+                    del bucket[pos]
+            bucket = buckets.setdefault(task.column_id, [])
+            bucket.insert(self._bucket_position(bucket, seq), task)
+
+    def add_task(self, task: Task) -> None:
+        """Append a task to the board"""
+        self._index()
+        private = self.__pydantic_private__
+        seq = private["_next_seq"]
+        private["_next_seq"] = seq + 1
+        task.__pydantic_private__["_board"] = self
+        task.__pydantic_private__["_board_seq"] = seq
+
+        self.tasks.append(task)
+        private["_tasks_by_id"][task.id] = task
+        private["_column_tasks"].setdefault(task.column_id, []).append(task)
+        self._index_values(task.id, "tags", (), task.tags)
+        self._index_values(task.id, "priority", (), [task.priority])
+        tasks, _, columns, n_columns = private["_indexed"]
+        private["_indexed"] = (tasks, len(tasks), columns, n_columns)
+        private["_changed_ids"].add(task.id)
+        owner = private["_owner"]
+        if owner is not None:
+            owner._task_added(self, task.id)
+
+    def remove_task(self, task_id: int) -> Optional[Task]:
+        """Remove a task from the board and return it (None if it isn't on the board)"""
+        self._index()
+        task = self.get_task(task_id)
+        if task is None:
+            return None
+        private = self.__pydantic_private__
+        tasks = self.tasks
+        for pos, candidate in enumerate(tasks):
+            if candidate is task:
+                del tasks[pos]
+                break
+
+        del private["_tasks_by_id"][task_id]
+        bucket = private["_column_tasks"][task.column_id]
+        del bucket[self._bucket_position(bucket, task.__pydantic_private__["_board_seq"])]
+        self._index_values(task_id, "tags", task.tags, ())
+        self._index_values(task_id, "priority", [task.priority], ())
+        # A task a forked board shares still belongs to the board it was forked from
+        if task.__pydantic_private__["_board"] is self:
+            task.__pydantic_private__["_board"] = None
+        _, _, columns, n_columns = private["_indexed"]
+        private["_indexed"] = (tasks, len(tasks), columns, n_columns)
+        private["_changed_ids"].add(task_id)
+        owner = private["_owner"]
+        if owner is not None:
+            owner._task_removed(self, task_id)
+        return task
+
+    def add_column(self, column: Column) -> None:
+        """Append a column to the board"""
+        self._index()
+        private = self.__pydantic_private__
+        self.columns.append(column)
+        private["_columns_by_id"][column.id] = column
+        tasks, n_tasks, columns, _ = private["_indexed"]
+        private["_indexed"] = (tasks, n_tasks, columns, len(columns))
+
+    def fork(self) -> "Board":
+        """A copy to change instead of this board, sharing its tasks (see versions.py)
+
+        The copy has its own task list, columns and indexes, so adding,
+        removing or reordering there leaves this board as it was. The tasks
+        in it are still this board's: replace one with fork_task() before
+        changing it.
+        """
+        self.materialize()
+        self._materialize_tasks()
+        self._index()
+        private = self.__pydantic_private__
+        tasks = list(self.__dict__["tasks"])
+        columns = [col.model_copy() for col in self.__dict__["columns"]]
+        forked = self.model_copy(update={"tasks": tasks, "columns": columns})
+        from taskstore import private_defaults  # taskstore imports this module
+        object.__setattr__(forked, '__pydantic_private__', private_defaults(type(self)))
+        # Copied rather than rebuilt: re-indexing would renumber the shared tasks
+        forked.__pydantic_private__.update(
+            _tasks_by_id=dict(private["_tasks_by_id"]),
+            _column_tasks={col: list(bucket) for col, bucket in private["_column_tasks"].items()},
+            _columns_by_id={col.id: col for col in columns},
+            _tag_ids={tag: set(ids) for tag, ids in private["_tag_ids"].items()},
+            _priority_ids={p: set(ids) for p, ids in private["_priority_ids"].items()},
+            _indexed=(tasks, len(tasks), columns, len(columns)),
+            _next_seq=private["_next_seq"],
+        )
+        return forked
+
+    def fork_task(self, task_id: int) -> Optional[Task]:
+        """Replace a task with a fork of it (see Task.fork) and return the fork, or None if it isn't on the board"""
+        task = self.get_task(task_id)
+        if task is None:
+            return None
+        private = self.__pydantic_private__
+        seq = task.__pydantic_private__["_board_seq"]
+        forked = task.fork()
+        forked.__pydantic_private__["_board"] = self
+        forked.__pydantic_private__["_board_seq"] = seq
+
+        tasks = self.tasks
+        for pos, candidate in enumerate(tasks):
+            if candidate is task:
+                tasks[pos] = forked
+                break
+        private["_tasks_by_id"][task_id] = forked
+        bucket = private["_column_tasks"][task.column_id]
+        bucket[self._bucket_position(bucket, seq)] = forked
+        return forked
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get task by ID"""
+        store = self.__pydantic_private__["_store"]
+        if store is not None:
+            row = store.row_of(task_id)
+            return None if row is None else self._store_task(row)
+        self._index()
+        return self.__pydantic_private__["_tasks_by_id"].get(task_id)
+
     def get_tasks_in_column(self, column_id: str) -> List[Task]:
         """Get all tasks in a specific column"""
-        return [t for t in self.tasks if t.column_id == column_id]
+        if self.__pydantic_private__["_store"] is not None:
+            return self.find_tasks(column=column_id)
+        self._index()
+        return list(self.__pydantic_private__["_column_tasks"].get(column_id, ()))
+
+    def find_tasks(
+        self,
+        task_id: Optional[int] = None,
+        column: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        tags: Iterable[str] = ()
+    ) -> List[Task]:
+        """Tasks matching all given filters (every one of `tags`), in board order
+
+        Each filter is an index lookup; their id sets are intersected
+        starting from the smallest, so a selective filter keeps the
+        whole query cheap.
+        """
+        private = self.__pydantic_private__
+        store = private["_store"]
+        if store is not None:
+            return [self._store_task(row) for row in store.rows(task_id, column, priority, tags)]
+        self._index()
+        by_id = private["_tasks_by_id"]
+
+        id_sets: List[Set[int]] = []
+        if task_id is not None:
+            id_sets.append({task_id} if task_id in by_id else set())
+        if priority is not None:
+            id_sets.append(private["_priority_ids"].get(Priority(priority), set()))
+        for tag in tags:
+            id_sets.append(private["_tag_ids"].get(tag, set()))
+        bucket = private["_column_tasks"].get(column, []) if column else None
+
+        if not id_sets:
+            return list(self.tasks if bucket is None else bucket)
+        id_sets.sort(key=len)
+        if bucket is not None and len(bucket) <= len(id_sets[0]):
+            return [t for t in bucket if all(t.id in ids for ids in id_sets)]
+
+        matches = [by_id[i] for i in id_sets[0].intersection(*id_sets[1:])]
+        if column:
+            matches = [t for t in matches if t.column_id == column]
+        matches.sort(key=lambda t: t.__pydantic_private__["_board_seq"])
+        return matches
+
+    def iter_tasks(
+        self,
+        column: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        tags: Iterable[str] = ()
+    ) -> Iterator[Task]:
+        """find_tasks() one task at a time, for streaming output
+
+        Rows of a TaskStore that weren't materialized yet are materialized
+        for the caller only and not kept, so iterating a columnar board
+        doesn't end up holding every task.
+        """
+        private = self.__pydantic_private__
+        store = private["_store"]
+        if store is None:
+            yield from self.find_tasks(column=column, priority=priority, tags=tags)
+            return
+        cached = private["_store_tasks"]
+        hook = private["_store_hook"]
+        for row in store.rows(None, column, priority, tags):
+            task = cached.get(row)
+            if task is None:
+                task = store.task(row)
+                # Set up like a kept row, e.g. to read its history from the storage's log
+                if hook is not None:
+                    hook(task)
+            yield task
+
+    def all_tags(self) -> List[str]:
+        """Tags used by at least one task, sorted"""
+        store = self.__pydantic_private__["_store"]
+        if store is not None:
+            return store.tags_in_use()
+        self._index()
+        return sorted(self.__pydantic_private__["_tag_ids"])
+
+    def column_task_count(self, column_id: str) -> int:
+        """Number of tasks in a column"""
+        store = self.__pydantic_private__["_store"]
+        if store is not None:
+            return store.column_count(column_id)
+        self._index()
+        return len(self.__pydantic_private__["_column_tasks"].get(column_id, ()))
 
     def get_column(self, column_id: str) -> Optional[Column]:
         """Get column by ID"""
-        for col in self.columns:
-            if col.id == column_id:
-                return col
-        return None
+        if self.__pydantic_private__["_store"] is not None:
+            return next((col for col in self.columns if col.id == column_id), None)
+        self._index()
+        return self.__pydantic_private__["_columns_by_id"].get(column_id)
+
+    def admit_moves(self, moves: Dict[int, str]) -> List[tuple[Task, str]]:
+        """Check a batch of moves (task id -> target column) against the WIP limits as a whole
+
+        A column's limit is checked against its count after the whole batch,
+        so tasks moved out of a column make room for tasks moved into it.
+        Returns the (task, target column) pairs that change column; raises
+        TaskNotFoundError or ColumnError, naming every violated limit, if
+        the batch can't be applied.
+        """
+        planned = []
+        delta: Dict[str, int] = {}
+        for task_id, column_id in moves.items():
+            task = self.get_task(task_id)
+            if task is None:
+                raise TaskNotFoundError(f"Task #{task_id} not found")
+            if self.get_column(column_id) is None:
+                raise ColumnError(f"Column '{column_id}' not found")
+            old_column = task.column_id
+            if old_column == column_id:
+                continue
+            planned.append((task, column_id))
+            delta[old_column] = delta.get(old_column, 0) - 1
+            delta[column_id] = delta.get(column_id, 0) + 1
+
+        errors = []
+        for column_id, change in delta.items():
+            col = self.get_column(column_id)
+            if change <= 0 or col is None or col.limit is None:
+                continue
+            count = self.column_task_count(column_id) + change
+            if count > col.limit:
+                errors.append(f"WIP limit ({col.limit}) for '{col.name}' would be exceeded ({count} tasks)")
+        if errors:
+            raise ColumnError("; ".join(errors))
+        return planned
+
+    def move_tasks(self, moves: Dict[int, str], reason: Optional[str] = None) -> List[Task]:
+        """Move a batch of tasks at once, all or none (see admit_moves); returns the tasks moved"""
+        planned = self.admit_moves(moves)
+        for task, column_id in planned:
+            task.move_to(column_id, reason)
+        return [task for task, _ in planned]
 
     def can_add_to_column(self, column_id: str) -> tuple[bool, Optional[str]]:
         """Check if a task can be added to a column (WIP limit)"""
@@ -124,7 +755,7 @@ class Board(BaseModel):
         if col.limit is None:
             return True, None
         
-        current_count = len(self.get_tasks_in_column(column_id))
+        current_count = self.column_task_count(column_id)
         if current_count >= col.limit:
             return False, f"WIP limit ({col.limit}) reached for '{col.name}'"
         
@@ -138,23 +769,146 @@ class KanbanData(BaseModel):
     default_board: str = Field(default="main", description="Default board ID")
     next_task_id: int = Field(default=1, description="Monotonic counter for task IDs")
     
+    # Board id -> board, and the (boards list, length) it describes
+    _boards_by_id: Optional[Dict[str, Board]] = PrivateAttr(default=None)
+    _boards_indexed: Optional[tuple] = PrivateAttr(default=None)
+    # Task locator: task id -> id of the board holding it, across all boards. Built on the
+    # first lookup by task id alone; Board.add_task/remove_task keep it current. Boards
+    # added or removed directly rebuild it, and tasks added to a board's list directly
+    # (or on lazy boards not read yet) are found by rescanning when a lookup misses.
+    _task_boards: Optional[Dict[int, str]] = PrivateAttr(default=None)
+    # (boards list, length) the locator describes, and each scanned board's task count
+    _located: Optional[tuple] = PrivateAttr(default=None)
+    _located_counts: Dict[str, int] = PrivateAttr(default_factory=dict)
+    
+    def _board_index(self) -> Dict[str, Board]:
+        """Board id -> board (the first, if duplicated), rebuilt if the board list changed"""
+        boards = self.boards
+        private = self.__pydantic_private__
+        indexed = private["_boards_indexed"]
+        if indexed is None or indexed[0] is not boards or indexed[1] != len(boards):
+            by_id: Dict[str, Board] = {}
+            for board in boards:
+                by_id.setdefault(board.id, board)
+            private["_boards_by_id"] = by_id
+            private["_boards_indexed"] = (boards, len(boards))
+        return private["_boards_by_id"]
+    
+    def _locator(self) -> Dict[int, str]:
+        """The task locator, (re)built unless it still matches the board list"""
+        boards = self.boards
+        by_id = self._board_index()
+        private = self.__pydantic_private__
+        located = private["_located"]
+        if located is not None and located[0] is boards and located[1] == len(boards):
+            return private["_task_boards"]
+        
+        private["_task_boards"] = {}
+        private["_located_counts"] = {}
+        private["_located"] = (boards, len(boards))
+        for board in boards:
+            # Lazy boards are only read if a lookup misses everywhere else
+            if board.is_loaded and by_id[board.id] is board:
+                self._scan(board)
+        return private["_task_boards"]
+    
+    def _scan(self, board: Board) -> None:
+        """Add a board's tasks to the locator"""
+        private = self.__pydantic_private__
+        locator = private["_task_boards"]
+        board_id = board.id
+        for task_id in board.task_ids():
+            locator[task_id] = board_id
+        private["_located_counts"][board_id] = board.task_count
+        board.__pydantic_private__["_owner"] = self
+    
+    def _is_located(self, board: Board) -> bool:
+        """Whether the locator currently covers this board"""
+        private = self.__pydantic_private__
+        return (private["_task_boards"] is not None and board.id in private["_located_counts"]
+                and self._board_index().get(board.id) is board)
+    
+    def _task_added(self, board: Board, task_id: int) -> None:
+        if not self._is_located(board):
+            return
+        private = self.__pydantic_private__
+        private["_task_boards"][task_id] = board.id
+        private["_located_counts"][board.id] = board.task_count
+    
+    def _task_removed(self, board: Board, task_id: int) -> None:
+        if not self._is_located(board):
+            return
+        private = self.__pydantic_private__
+        if private["_task_boards"].get(task_id) == board.id:
+            del private["_task_boards"][task_id]
+        private["_located_counts"][board.id] = board.task_count
+    
     def get_board(self, board_id: Optional[str] = None) -> Optional[Board]:
         """Get board by ID (or default if not specified)"""
-        target_id = board_id or self.default_board
+        return self._board_index().get(board_id or self.default_board)
+    
+    def fork(self) -> "KanbanData":
+        """A copy to change instead of this data, with its own board list sharing the boards
+        
+        Replace a board with fork_board() before changing it (see versions.py).
+        """
+        forked = self.model_copy(update={"boards": list(self.boards)})
+        from taskstore import private_defaults  # taskstore imports this module
+        object.__setattr__(forked, '__pydantic_private__', private_defaults(type(self)))
+        return forked
+    
+    def fork_board(self, board_id: Optional[str] = None) -> Optional[Board]:
+        """Replace a board with a fork of it (see Board.fork) and return the fork, or None if there's no such board"""
+        board = self.get_board(board_id)
+        if board is None:
+            return None
+        forked = board.fork()
+        boards = self.boards
+        for pos, candidate in enumerate(boards):
+            if candidate is board:
+                boards[pos] = forked
+                break
+        # Same list and length, so the board index and locator stay valid once updated in place
+        self.__pydantic_private__["_boards_by_id"][board.id] = forked
+        if self._is_located(forked):
+            forked.__pydantic_private__["_owner"] = self
+        return forked
+    
+    def locate_task(self, task_id: int) -> Optional[Board]:
+        """The board holding a task, whichever board that is (None if none does)
+        
+        Task ids are global, so this needs no board id. The default board is
+        checked first, for data from before ids were global.
+        """
+        default = self.get_board()
+        if default is not None and default.get_task(task_id) is not None:
+            return default
+        
+        locator = self._locator()
+        by_id = self._board_index()
+        board = by_id.get(locator.get(task_id))
+        if board is not None and board.get_task(task_id) is not None:
+            return board
+        
+        # Missed, or the entry is stale: rescan boards not scanned yet or changed behind our back
+        counts = self.__pydantic_private__["_located_counts"]
         for board in self.boards:
-            if board.id == target_id:
+            if by_id[board.id] is not board or counts.get(board.id) == board.task_count:
+                continue
+            self._scan(board)
+            if board.get_task(task_id) is not None:
                 return board
         return None
     
     def get_task(self, task_id: int, board_id: Optional[str] = None) -> Optional[Task]:
-        """Get task by ID"""
-        board = self.get_board(board_id)
+        """Get task by ID, from any board unless `board_id` is given"""
+        if board_id is None:
+            board = self.locate_task(task_id)
+        else:
+            board = self.get_board(board_id)
         if not board:
             return None
-        for task in board.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return board.get_task(task_id)
     
     def allocate_task_id(self) -> int:
         """Allocate and return the next monotonic task ID"""
@@ -163,6 +917,36 @@ class KanbanData(BaseModel):
         return task_id
 
 
+# model_dump() `exclude` specs: task history is kept in the storage's history log, not in documents
+TASK_NO_HISTORY = {"history"}
+BOARD_NO_HISTORY = {"tasks": {"__all__": TASK_NO_HISTORY}}
+DATA_NO_HISTORY = {"boards": {"__all__": BOARD_NO_HISTORY}}
+
+
+def intern_strings(boards: Iterable[Board], table: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Make equal tags, column ids and board ids of the boards' tasks one shared string object
+
+    Validation builds a new string for every occurrence, so a handful of
+    tags repeated across 100k tasks would otherwise be 100k+ strings.
+    Returns `table` (value -> its shared object), to pass on for more
+    boards. Lazy boards not loaded yet and TaskStores (already dictionary
+    coded) are skipped.
+    """
+    if table is None:
+        table = {}
+    intern = table.setdefault
+    for board in boards:
+        if not board.is_loaded or board.has_task_store:
+            continue
+        for task in board.tasks:
+            # Equal values, so no index or dirty flag needs to know
+            fields = task.__dict__
+            fields["board_id"] = intern(fields["board_id"], fields["board_id"])
+            fields["column_id"] = intern(fields["column_id"], fields["column_id"])
+            fields["tags"] = [intern(tag, tag) for tag in fields["tags"]]
+    return table
+
+
 DEFAULT_COLUMNS = [
     Column(id="backlog", name="Backlog", limit=None, order=0),
     Column(id="todo", name="To Do", limit=None, order=1),
@@ -0,0 +1,213 @@
+"""
+Sorting and paging of task lists - the --sort, --limit, --offset and --cursor options
+
+A sort spec is a comma-separated list of fields, each optionally prefixed
+with "-" for descending: `-priority,created_at` puts the most urgent tasks
+first and, within a priority, the oldest. Priorities rank low < medium <
+high < critical. The task id always breaks ties, so the order is total
+and pages never overlap or skip a task.
+
+A bounded page (--limit) is picked by top-k selection: a heap of
+offset + limit + 1 tasks rather than a sort of every match. The extra
+task tells whether there's a next page.
+
+A cursor is an opaque token holding the sort spec and the sort key of
+the last task returned (per column, for `show`). The next page starts
+after that key, so tasks added or removed in between don't shift pages
+the way they would with --offset.
+"""
+
+import base64
+import binascii
+import heapq
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models import Board, Task
+from taskstore import PRIORITY_CODES, to_micros
+
+
+CURSOR_VERSION = 1
+
+# Sort field -> the raw (JSON-serializable) key of a task
+SORT_FIELDS = {
+    "id": lambda task: task.id,
+    "priority": lambda task: PRIORITY_CODES[task.priority],
+    "created_at": lambda task: to_micros(task.created_at),
+    "updated_at": lambda task: to_micros(task.updated_at),
+    "title": lambda task: task.title.casefold(),
+}
+
+
+class _Descending:
+    """Reverses the order of a key that can't be negated (a string)"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __gt__(self, other: "_Descending") -> bool:
+        return other.value > self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def parse_sort(spec: str) -> Tuple[Tuple[str, bool], ...]:
+    """(field, descending) pairs of a sort spec, ending with the id tie-breaker; raises ValueError"""
+    keys = []
+    for part in spec.split(","):
+        part = part.strip()
+        name = part.lstrip("-")
+        if name not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field '{name}' (expected one of: {', '.join(SORT_FIELDS)})")
+        keys.append((name, part.startswith("-")))
+    if "id" not in (name for name, _ in keys):
+        keys.append(("id", False))
+    return tuple(keys)
+
+
+def _format_sort(keys: Tuple[Tuple[str, bool], ...]) -> str:
+    return ",".join(("-" if descending else "") + name for name, descending in keys)
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    raw = json.dumps({"v": CURSOR_VERSION, **payload}, separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """The payload of a cursor; raises ValueError if it isn't one"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or payload.get("v") != CURSOR_VERSION:
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def _field_key(name: str, descending: bool) -> Callable[[Task], Any]:
+    raw = SORT_FIELDS[name]
+    if not descending:
+        return raw
+    if name == "title":
+        return lambda task: _Descending(raw(task))
+    return lambda task: -raw(task)
+
+
+def _compile_key(keys: Tuple[Tuple[str, bool], ...]) -> Callable[[Task], tuple]:
+    """The sort key of a task, equal to Paging._key(Paging._raw(task)) but built once per sort
+
+    Computing the key dominates a top-k selection, so the common one- and
+    two-field specs get a key without a loop.
+    """
+    getters = [_field_key(name, descending) for name, descending in keys]
+    if len(getters) == 1:
+        first, = getters
+        return lambda task: (first(task),)
+    if len(getters) == 2:
+        first, second = getters
+        return lambda task: (first(task), second(task))
+    return lambda task: tuple([getter(task) for getter in getters])
+
+
+class Paging:
+    """Sort, limit, offset and cursor of one command; raises ValueError for invalid options
+
+    `kind` names the command ("list-tasks" or "show"), so a cursor can't be
+    passed to the other. Without --sort, pages are in id order.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ):
+        if limit is not None and limit < 1:
+            raise ValueError("--limit must be at least 1")
+        if offset < 0:
+            raise ValueError("--offset can't be negative")
+        self.kind = kind
+        self.keys = parse_sort(sort) if sort else (("id", False),)
+        self._sort_key = _compile_key(self.keys)
+        self.limit = limit
+        self.offset = offset
+        self.after: Any = None
+        if cursor is not None:
+            payload = decode_cursor(cursor)
+            if payload.get("kind") != kind:
+                raise ValueError(f"That cursor is for {payload.get('kind')}, not {kind}")
+            if payload.get("sort") != _format_sort(self.keys):
+                raise ValueError(f"That cursor is for --sort {payload.get('sort')}")
+            self.after = payload.get("after")
+            # A key for list-tasks, a key per column for show
+            if kind == "show":
+                keys = list(self.after.values()) if isinstance(self.after, dict) else [None]
+            else:
+                keys = [self.after]
+            if not all(isinstance(raw, list) and len(raw) == len(self.keys) for raw in keys):
+                raise ValueError("Invalid cursor")
+        self.cursor = cursor
+
+    @property
+    def paged(self) -> bool:
+        """Whether the output is a page that carries a next cursor"""
+        return self.limit is not None or self.cursor is not None
+
+    def _raw(self, task: Task) -> List[Any]:
+        return [SORT_FIELDS[name](task) for name, _ in self.keys]
+
+    def _key(self, raw: List[Any]) -> tuple:
+        return tuple(
+            (_Descending(value) if isinstance(value, str) else -value) if descending else value
+            for value, (_, descending) in zip(raw, self.keys)
+        )
+
+    def _select(self, tasks: Iterable[Task], after: Optional[List[Any]]) -> Tuple[List[Task], Optional[List[Any]]]:
+        """(page, raw key to continue after, or None if it's the last page)"""
+        key = self._sort_key
+        if after is not None:
+            bound = self._key(after)
+            tasks = (task for task in tasks if key(task) > bound)
+        if self.limit is None:
+            return sorted(tasks, key=key)[self.offset:], None
+        wanted = self.offset + self.limit
+        top = heapq.nsmallest(wanted + 1, tasks, key=key)
+        page = top[self.offset:wanted]
+        return page, (self._raw(page[-1]) if len(top) > wanted and page else None)
+
+    def page(self, tasks: Iterable[Task]) -> Tuple[List[Task], Optional[str]]:
+        """(this page of `tasks`, cursor of the next page or None)"""
+        page, after = self._select(tasks, self.after)
+        if after is None:
+            return page, None
+        return page, encode_cursor({"kind": self.kind, "sort": _format_sort(self.keys), "after": after})
+
+    def page_columns(self, board: Board) -> Tuple[Dict[str, List[Task]], Optional[str]]:
+        """This page of each of the board's columns, and the cursor of the next page or None
+
+        Each column is paged on its own; the next page continues the columns
+        that had more, and the others come back empty.
+        """
+        pending = self.after
+        columns: Dict[str, List[Task]] = {}
+        next_after: Dict[str, List[Any]] = {}
+        for col in board.columns:
+            if pending is not None and col.id not in pending:
+                columns[col.id] = []
+                continue
+            page, after = self._select(board.iter_tasks(column=col.id), pending.get(col.id) if pending else None)
+            columns[col.id] = page
+            if after is not None:
+                next_after[col.id] = after
+        if not next_after:
+            return columns, None
+        return columns, encode_cursor({"kind": self.kind, "sort": _format_sort(self.keys), "after": next_after})
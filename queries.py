@@ -0,0 +1,348 @@
+"""
+JSON output of the read-only commands, and a fast path that runs them without typer or rich
+
+Agents mostly call `show`, `list-tasks`, `search`, `info`, `status` and
+`list-boards` with --json. kanban.py's commands build that output here,
+and run_json_command() runs the same calls straight from argv, before
+kanban.py imports typer and rich. The fast path only parses the plain
+forms of the arguments (`--opt value`, `--opt=value`, `-o value`); for
+anything else (--help, a bad value, an option it doesn't know) it steps
+aside and the full CLI handles, or reports, the command.
+
+`show` and `list-tasks` can also stream NDJSON (--ndjson): one task per
+line, written as the board is iterated, so the first line goes out at
+once and memory doesn't grow with the output. `show` starts with a
+{"board": ...} line holding everything about the board but its tasks.
+
+Both also take --sort, --limit, --offset and --cursor (see paging.py).
+A paged call (--limit or --cursor) returns {"tasks": [...],
+"next_cursor": ...} from list-tasks --json and adds "next_cursor" to
+show --json, whose "board" then leaves out the tasks; NDJSON ends with a
+{"next_cursor": ...} line when there's another page.
+
+Tasks are output with their history, read from the storage's history
+logs; --no-history leaves it out and skips reading the logs.
+"""
+
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from models import Board, Priority, Task, TASK_NO_HISTORY, BOARD_NO_HISTORY
+from models import KanbanError, BoardNotFoundError, TaskNotFoundError
+from storage import KanbanStorage, KanbanStorageLocked, open_storage
+from client import storage_settings
+from paging import Paging
+
+
+def _board(storage: KanbanStorage, board_id: Optional[str]) -> Board:
+    board = storage.load().get_board(board_id)
+    if not board:
+        raise BoardNotFoundError(f"Board '{board_id}' not found")
+    return board
+
+
+def _board_meta(board: Board) -> Dict[str, Any]:
+    """A board's fields except its tasks, without materializing a TaskStore (dumping the board would)"""
+    fields = {name: getattr(board, name) for name in Board.model_fields if name != "tasks"}
+    return Board.model_construct(**fields).model_dump(mode='json', exclude={'tasks'})
+
+
+def _task_json(task: Task, history: bool = True) -> Dict[str, Any]:
+    if not history:
+        return task.model_dump(mode='json', exclude=TASK_NO_HISTORY)
+    task.load_history()
+    return task.model_dump(mode='json')
+
+
+def _task_line(task: Task, history: bool = True) -> str:
+    if not history:
+        return task.model_dump_json(exclude=TASK_NO_HISTORY)
+    task.load_history()
+    return task.model_dump_json()
+
+
+def _board_json(board: Board, history: bool = True) -> Dict[str, Any]:
+    if not history:
+        return board.model_dump(mode='json', exclude=BOARD_NO_HISTORY)
+    for task in board.tasks:
+        task.load_history()
+    return board.model_dump(mode='json')
+
+
+def find_page(
+    storage: KanbanStorage,
+    column: Optional[str] = None,
+    priority: Optional[Priority] = None,
+    tags: Optional[List[str]] = None,
+    paging: Optional[Paging] = None
+) -> tuple[Board, Iterable[Task], Optional[str]]:
+    """(board, matching tasks, next page's cursor) for list-tasks; without paging, every match in board order"""
+    try:
+        board, tasks = storage.iter_tasks(column=column, priority=priority, tags=tags)
+    except BoardNotFoundError:
+        raise BoardNotFoundError("No board found")
+    if paging is None:
+        return board, tasks, None
+    page, next_cursor = paging.page(tasks)
+    return board, page, next_cursor
+
+
+def show_output(
+    storage: KanbanStorage,
+    board_id: Optional[str] = None,
+    paging: Optional[Paging] = None,
+    history: bool = True
+) -> Dict[str, Any]:
+    """show --json; with --limit or --cursor, "board" leaves out the tasks and "next_cursor" is added"""
+    board = _board(storage, board_id)
+    if paging is None:
+        columns = {col.id: board.get_tasks_in_column(col.id) for col in board.columns}
+        next_cursor = None
+    else:
+        columns, next_cursor = paging.page_columns(board)
+    output = {
+        "board": _board_meta(board) if paging and paging.paged else _board_json(board, history),
+        "tasks_by_column": {
+            col_id: [_task_json(t, history) for t in tasks]
+            for col_id, tasks in columns.items()
+        }
+    }
+    if paging and paging.paged:
+        output["next_cursor"] = next_cursor
+    return output
+
+
+def list_tasks_output(
+    storage: KanbanStorage,
+    column: Optional[str] = None,
+    priority: Optional[Priority] = None,
+    tags: Optional[List[str]] = None,
+    paging: Optional[Paging] = None,
+    history: bool = True
+) -> Any:
+    """list-tasks --json: a list of tasks, or {"tasks": [...], "next_cursor": ...} with --limit or --cursor"""
+    _, tasks, next_cursor = find_page(storage, column, priority, tags, paging)
+    output = [_task_json(t, history) for t in tasks]
+    if paging and paging.paged:
+        return {"tasks": output, "next_cursor": next_cursor}
+    return output
+
+
+def _line(payload: Dict[str, Any]) -> str:
+    # Compact like the task lines, which pydantic writes
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+
+
+def show_lines(
+    storage: KanbanStorage,
+    board_id: Optional[str] = None,
+    paging: Optional[Paging] = None,
+    history: bool = True
+) -> Iterator[str]:
+    """show as NDJSON: the board's metadata, then its tasks column by column, then any {"next_cursor": ...}"""
+    board = _board(storage, board_id)
+    yield _line({"board": _board_meta(board)})
+    if paging is None:
+        for col in board.columns:
+            for task in board.iter_tasks(column=col.id):
+                yield _task_line(task, history)
+        return
+    columns, next_cursor = paging.page_columns(board)
+    for tasks in columns.values():
+        for task in tasks:
+            yield _task_line(task, history)
+    if next_cursor:
+        yield _line({"next_cursor": next_cursor})
+
+
+def list_tasks_lines(
+    storage: KanbanStorage,
+    column: Optional[str] = None,
+    priority: Optional[Priority] = None,
+    tags: Optional[List[str]] = None,
+    paging: Optional[Paging] = None,
+    history: bool = True
+) -> Iterator[str]:
+    """list-tasks as NDJSON, one task per line, then any {"next_cursor": ...}"""
+    _, tasks, next_cursor = find_page(storage, column, priority, tags, paging)
+    for task in tasks:
+        yield _task_line(task, history)
+    if next_cursor:
+        yield _line({"next_cursor": next_cursor})
+
+
+def search_output(
+    storage: KanbanStorage,
+    query: str,
+    board_id: Optional[str] = None,
+    limit: int = 20,
+    history: bool = True
+) -> List[Dict[str, Any]]:
+    _, results = storage.search_tasks(query, board_id, limit)
+    return [
+        {**_task_json(t, history), "score": round(score, 4)}
+        for t, score in results
+    ]
+
+
+def info_output(storage: KanbanStorage, task_id: int) -> Dict[str, Any]:
+    try:
+        _, tasks = storage.find_tasks(task_id=task_id)
+    except BoardNotFoundError:
+        tasks = []
+    if not tasks:
+        raise TaskNotFoundError(f"Task #{task_id} not found")
+    task = tasks[0]
+    task.load_history()
+    return task.model_dump(mode='json')
+
+
+def status_output(storage: KanbanStorage) -> Dict[str, Any]:
+    data = storage.load()
+    return {
+        "data_path": str(storage.data_path),
+        "data_file_exists": storage.data_path.exists(),
+        "journal_bytes": storage.journal_size() if storage.journaled else None,
+        "history_bytes": storage.history_size(),
+        "trusted_load": storage.trusted_load_report(),
+        "boards_count": len(data.boards),
+        "default_board": data.default_board,
+        "total_tasks": sum(b.task_count for b in data.boards)
+    }
+
+
+def list_boards_output(storage: KanbanStorage, history: bool = True) -> Dict[str, Any]:
+    data = storage.load()
+    return {
+        "boards": [_board_json(b, history) for b in data.boards],
+        "default_board": data.default_board
+    }
+
+
+def print_json(output: Any) -> None:
+    print(json.dumps(output, indent=2))
+
+
+def print_lines(lines: Iterable[str]) -> None:
+    """Write NDJSON lines as they're produced"""
+    write = sys.stdout.write
+    for line in lines:
+        write(line)
+        write("\n")
+
+
+# Parameter -> flags of the options the JSON commands take. kanban.py's typer commands declare
+# their options with these flags, so the fast path accepts the same spellings as the CLI.
+OPTION_FLAGS: Dict[str, tuple[str, ...]] = {
+    "board_id": ("--board", "-b"),
+    "column": ("--column", "-c"),
+    "priority": ("--priority", "-p"),
+    "tags": ("--tag", "-t"),
+    "sort": ("--sort",),
+    "limit": ("--limit", "-n"),
+    "offset": ("--offset",),
+    "cursor": ("--cursor",),
+}
+JSON_FLAGS = ("--json", "-j")
+NDJSON_FLAG = "--ndjson"
+NO_HISTORY_FLAG = "--no-history"
+PAGING_PARAMETERS = ("sort", "limit", "offset", "cursor")
+# Command name -> (output function, positional parameters, option parameters), the parameters
+# of kanban.py's typer command by name (benchmarks/check_startup.py checks they still match).
+# Values are converted by CONVERTERS; "tags" collects every occurrence, other options keep the last.
+JSON_COMMANDS: Dict[str, tuple[Callable[..., Any], List[str], List[str]]] = {
+    "show": (show_output, [], ["board_id", *PAGING_PARAMETERS]),
+    "list-tasks": (list_tasks_output, [], ["column", "priority", "tags", *PAGING_PARAMETERS]),
+    "search": (search_output, ["query"], ["board_id", "limit"]),
+    "info": (info_output, ["task_id"], []),
+    "status": (status_output, [], []),
+    "list-boards": (list_boards_output, [], []),
+}
+# Commands with --ndjson, and the function producing their lines
+NDJSON_COMMANDS: Dict[str, Callable[..., Iterator[str]]] = {"show": show_lines, "list-tasks": list_tasks_lines}
+# Commands with --no-history
+HISTORY_COMMANDS = ("show", "list-tasks", "search", "list-boards")
+CONVERTERS: Dict[str, Callable[[str], Any]] = {"task_id": int, "limit": int, "offset": int, "priority": Priority}
+
+
+def json_command_options(command: str) -> Dict[str, str]:
+    """{flag: parameter} for the options of one of JSON_COMMANDS"""
+    return {flag: name for name in JSON_COMMANDS[command][2] for flag in OPTION_FLAGS[name]}
+
+
+def parse_json_command(argv: List[str]) -> Optional[tuple[Callable[..., Any], Dict[str, Any], bool]]:
+    """(output function, keyword arguments, whether it streams lines) for a --json or --ndjson call, else None"""
+    if not argv or argv[0] not in JSON_COMMANDS:
+        return None
+    output, positional, _ = JSON_COMMANDS[argv[0]]
+    options = json_command_options(argv[0])
+    kwargs: Dict[str, Any] = {}
+    values: List[str] = []
+    json_flag = ndjson = False
+    args = iter(argv[1:])
+    for arg in args:
+        if arg in JSON_FLAGS:
+            json_flag = True
+            continue
+        if arg == NDJSON_FLAG and argv[0] in NDJSON_COMMANDS:
+            ndjson = True
+            continue
+        if arg == NO_HISTORY_FLAG and argv[0] in HISTORY_COMMANDS:
+            kwargs["history"] = False
+            continue
+        if not arg.startswith("-") or arg == "-":
+            values.append(arg)
+            continue
+        flag, eq, value = arg.partition("=")
+        name = options.get(flag)
+        if name is None or (eq and not flag.startswith("--")):
+            return None
+        if not eq:
+            value = next(args, None)
+            if value is None:
+                return None
+        if name == "tags":
+            kwargs.setdefault("tags", []).append(value)
+        else:
+            kwargs[name] = value
+    if not (json_flag or ndjson) or len(values) != len(positional):
+        return None
+    kwargs.update(zip(positional, values))
+    try:
+        for name, convert in CONVERTERS.items():
+            if name in kwargs:
+                kwargs[name] = convert(kwargs[name])
+        if argv[0] in NDJSON_COMMANDS and any(name in kwargs for name in PAGING_PARAMETERS):
+            # An invalid sort, limit or cursor is reported by the full CLI
+            kwargs["paging"] = Paging(argv[0], **{name: kwargs.pop(name) for name in PAGING_PARAMETERS if name in kwargs})
+    except ValueError:
+        return None
+    if ndjson:
+        # As in kanban.py, --ndjson wins over --json
+        return NDJSON_COMMANDS[argv[0]], kwargs, True
+    return output, kwargs, False
+
+
+def run_json_command(argv: List[str]) -> Optional[int]:
+    """Run a --json (or --ndjson) call of a read-only command without the full CLI; None if it needs the CLI
+
+    Only for calls without global options, so the storage is the one the
+    KANBAN_* environment selects. Errors are reported like kanban.py's
+    handle_exception() does: one "Error: ..." line and exit status 1.
+    """
+    parsed = parse_json_command(argv)
+    if parsed is None:
+        return None
+    output, kwargs, streams = parsed
+    try:
+        storage = open_storage(**storage_settings(os.environ.get("KANBAN_BACKEND")))
+        if streams:
+            print_lines(output(storage, **kwargs))
+        else:
+            print_json(output(storage, **kwargs))
+    except (KanbanError, KanbanStorageLocked) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
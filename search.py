@@ -0,0 +1,335 @@
+"""
+Full-text search for Kanban data - a BM25-ranked inverted index over task text
+"""
+
+import json
+import marshal
+import math
+import os
+import re
+import tempfile
+import zlib
+from bisect import bisect_left
+from collections import Counter
+from heapq import nlargest
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from models import Task
+
+
+FORMAT_VERSION = 2
+CHANGE_LOG_NAME = "changes.log"
+TOKEN_RE = re.compile(r"\w+")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# The last query word also matches up to this many longer indexed words (the most common ones)
+MAX_PREFIX_MATCHES = 32
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def task_text(task: Task) -> str:
+    """The searchable text of a task: title, description and agent context values"""
+    fields = task.__dict__
+    parts = [fields["title"]]
+    if fields["description"]:
+        parts.append(fields["description"])
+    for value in fields["agent_context"].values():
+        parts.append(value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str))
+    return "\n".join(parts)
+
+
+class SearchIndex:
+    """Inverted index of one board's tasks, ranked with BM25
+
+    Every indexed task keeps a CRC of its text, so sync() re-tokenizes only
+    tasks whose text changed since the index was built or last saved.
+    `source_key` identifies the stored data the index was last synced
+    against; the storage skips syncing while it still matches.
+    `log_position` is where the storage's ChangeLog stood at that point,
+    so the next sync can update() just the tasks written since.
+    """
+
+    def __init__(self):
+        # term -> {task id: term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        # task id -> (text CRC, token count, distinct terms)
+        self.docs: Dict[int, Tuple[int, int, Tuple[str, ...]]] = {}
+        self.total_length = 0
+        self.source_key: Any = None
+        self.log_position: Any = None
+        self._vocabulary: Optional[List[str]] = None  # sorted terms, for prefix matches
+
+    def _add(self, task_id: int, signature: int, text: str) -> None:
+        counts = Counter(tokenize(text))
+        postings = self.postings
+        for term, tf in counts.items():
+            docs = postings.get(term)
+            if docs is None:
+                postings[term] = {task_id: tf}
+                self._vocabulary = None
+            else:
+                docs[task_id] = tf
+        length = sum(counts.values())
+        self.docs[task_id] = (signature, length, tuple(counts))
+        self.total_length += length
+
+    def _remove(self, task_id: int) -> None:
+        _, length, terms = self.docs.pop(task_id)
+        postings = self.postings
+        for term in terms:
+            docs = postings[term]
+            del docs[task_id]
+            if not docs:
+                del postings[term]
+                self._vocabulary = None
+        self.total_length -= length
+
+    def _put(self, task: Task) -> bool:
+        """(Re)index one task unless its text is unchanged; returns whether it was"""
+        task_id = task.id
+        text = task_text(task)
+        signature = zlib.crc32(text.encode('utf-8'))
+        doc = self.docs.get(task_id)
+        if doc is not None:
+            if doc[0] == signature:
+                return False
+            self._remove(task_id)
+        self._add(task_id, signature, text)
+        return True
+
+    def sync(self, tasks: Iterable[Task]) -> bool:
+        """Bring the index in line with `tasks`; returns whether anything changed"""
+        docs = self.docs
+        seen = set()
+        changed = False
+        for task in tasks:
+            seen.add(task.id)
+            if self._put(task):
+                changed = True
+
+        for task_id in [i for i in docs if i not in seen]:
+            self._remove(task_id)
+            changed = True
+        return changed
+
+    def update(self, task_ids: Iterable[int], get_task: Callable[[int], Optional[Task]]) -> bool:
+        """sync() for only these tasks: re-index them, dropping those `get_task` no longer finds"""
+        changed = False
+        for task_id in task_ids:
+            task = get_task(task_id)
+            if task is None:
+                if task_id in self.docs:
+                    self._remove(task_id)
+                    changed = True
+            elif self._put(task):
+                changed = True
+        return changed
+
+    def _expand(self, term: str) -> List[str]:
+        """`term` plus the most common indexed words it's a prefix of (so a partly typed word matches)"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        longer = []
+        pos = bisect_left(vocabulary, term)
+        if pos < len(vocabulary) and vocabulary[pos] == term:
+            pos += 1
+        while pos < len(vocabulary) and vocabulary[pos].startswith(term):
+            longer.append(vocabulary[pos])
+            pos += 1
+        if len(longer) > MAX_PREFIX_MATCHES:
+            longer = nlargest(MAX_PREFIX_MATCHES, longer, key=lambda t: len(self.postings[t]))
+        return [term] + longer if term in self.postings else longer
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(task id, score) of tasks containing every query word, best first
+
+        The last word may also be the start of a word, as while typing.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.docs:
+            return []
+
+        n_docs = len(self.docs)
+        avg_length = self.total_length / n_docs or 1.0
+        docs = self.docs
+        scores: Optional[Dict[int, float]] = None
+        for position, term in enumerate(terms):
+            if position == len(terms) - 1:
+                matches = self._expand(term)
+            else:
+                matches = [term] if term in self.postings else []
+            term_scores: Dict[int, float] = {}
+            for match in matches:
+                postings = self.postings[match]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for task_id, tf in postings.items():
+                    if scores is not None and task_id not in scores:
+                        continue
+                    norm = K1 * (1 - B + B * docs[task_id][1] / avg_length)
+                    score = idf * tf * (K1 + 1) / (tf + norm)
+                    # A word matching several indexed terms counts once, by its best match
+                    if score > term_scores.get(task_id, 0.0):
+                        term_scores[task_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {task_id: score + scores[task_id] for task_id, score in term_scores.items()}
+            if not scores:
+                return []
+
+        ranked = scores.items()
+        if limit is not None:
+            return nlargest(limit, ranked, key=lambda item: (item[1], -item[0]))
+        return sorted(ranked, key=lambda item: (-item[1], item[0]))
+
+    def dumps(self) -> bytes:
+        return marshal.dumps(
+            (FORMAT_VERSION, self.source_key, self.log_position, self.total_length, self.docs, self.postings)
+        )
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "SearchIndex":
+        """Rebuild an index from dumps(); raises ValueError if `raw` isn't one"""
+        try:
+            fields = marshal.loads(raw)
+            version = fields[0]
+        except (EOFError, TypeError, ValueError, IndexError) as e:
+            raise ValueError(f"Unreadable search index: {e}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported search index version {version}")
+        _, source_key, log_position, total_length, docs, postings = fields
+        index = cls()
+        index.source_key = source_key
+        index.log_position = log_position
+        index.total_length = total_length
+        index.docs = docs
+        index.postings = postings
+        return index
+
+    @classmethod
+    def read(cls, path: Path) -> "SearchIndex":
+        """Load an index file, or start an empty index if it's missing or unreadable"""
+        try:
+            return cls.loads(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return cls()
+
+    def write(self, path: Path) -> None:
+        """Atomically replace the index file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.kanban_tmp_')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(self.dumps())
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+def plain_key(key: Any) -> Any:
+    """A storage's search key as it reads back from JSON (tuples become lists)"""
+    return list(key) if isinstance(key, tuple) else key
+
+
+class ChangeLog:
+    """Which tasks each save changed, so search indexes update only those
+
+    A file of JSON lines after a header naming the log's generation. Each
+    line is one write: {"boards": {board id: [key before, key after, [task
+    ids]]}} for every board whose search key (see KanbanStorage._search_key)
+    changed or whose tasks did. From the key an index was synced at,
+    changes() follows one board's keys from line to line. A gap in the chain
+    is a write nobody logged (a hand edit, a restore), and the caller
+    re-syncs the whole board. Past MAX_BYTES the log starts over under a new
+    generation, which also makes older indexes re-sync once.
+    """
+
+    MAX_BYTES = 1 << 20
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def position(self) -> Optional[Tuple[str, int]]:
+        """(generation, size) of the log, or None if there's no readable log"""
+        try:
+            with open(self.path, 'rb') as f:
+                generation = json.loads(f.readline())["generation"]
+                return generation, f.seek(0, os.SEEK_END)
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
+
+    def append(self, before: Dict[str, Any], after: Dict[str, Any], changed: Dict[str, Set[int]]) -> None:
+        """Record one write: the boards' search keys before and after it and the ids of the tasks it changed"""
+        boards = {}
+        for board_id, key in after.items():
+            old = plain_key(before.get(board_id))
+            key = plain_key(key)
+            task_ids = changed.get(board_id, ())
+            if key != old or task_ids:
+                boards[board_id] = [old, key, sorted(task_ids)]
+        if not boards:
+            return
+        line = json.dumps({"boards": boards}, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b"\n"
+
+        position = self.position()
+        if position is not None and position[1] + len(line) <= self.MAX_BYTES:
+            with open(self.path, 'ab') as f:
+                f.write(line)
+            return
+        header = json.dumps({"generation": os.urandom(8).hex()}).encode('utf-8') + b"\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.kanban_tmp_')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(header + line)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def changes(
+        self,
+        board_id: str,
+        since_key: Any,
+        since: Optional[Tuple[str, int]],
+        key: Any,
+        until: Optional[Tuple[str, int]]
+    ) -> Optional[Set[int]]:
+        """Ids of a board's tasks written between two (key, position) states, or None if the log can't tell"""
+        if since_key is None or since is None or until is None or since[0] != until[0]:
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                if json.loads(f.readline()).get("generation") != until[0]:
+                    return None
+                f.seek(since[1])
+                lines = f.read(until[1] - since[1]).splitlines()
+        except (FileNotFoundError, ValueError, AttributeError):
+            return None
+
+        task_ids: Set[int] = set()
+        current = since_key
+        for line in lines:
+            try:
+                entry = json.loads(line)["boards"].get(board_id)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return None
+            if entry is None:
+                continue
+            old, new, ids = entry
+            if old != current:
+                return None
+            current = new
+            task_ids.update(ids)
+        return task_ids if current == plain_key(key) else None
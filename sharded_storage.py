@@ -0,0 +1,218 @@
+"""
+Sharded storage for Kanban data - a small manifest plus one file per board, loaded lazily
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from urllib.parse import quote
+
+from models import KanbanData, Board, DEFAULT_COLUMNS, BOARD_NO_HISTORY, now_utc
+from journal import board_ops, capture_board
+from storage import KanbanStorage, KanbanStorageError, BINARY_SUFFIX
+from snapshot import BinaryCodec
+from trusted import checksum, matches as checksum_matches
+
+
+MANIFEST_NAME = "manifest.json"
+BOARDS_DIR_NAME = "boards"
+HISTORY_DIR_NAME = "history"
+SEARCH_DIR_NAME = "search"
+
+
+class ShardedKanbanStorage(KanbanStorage):
+    """Stores each board in its own file under a directory, next to a manifest
+
+    The manifest holds board ids, names and task counts plus the default
+    board and the global `next_task_id`. load() only reads the manifest;
+    a board's file is read the first time its columns or tasks are
+    accessed, and save() rewrites only the boards that changed. Task
+    history goes to per-board logs under `history/`. Each manifest entry
+    also records its shard's checksum, so unchanged shards load without
+    validation (see trusted.py).
+    """
+
+    def __init__(self, data_path: Optional[str] = None, codec: str = "pretty", strict: bool = False):
+        path = data_path or str(Path.home() / ".kanban" / "data.d")
+        super().__init__(path, codec=codec, strict=strict)
+        self.manifest_path = self.data_path / MANIFEST_NAME
+        self.boards_dir = self.data_path / BOARDS_DIR_NAME
+        self.history_dir = self.data_path / HISTORY_DIR_NAME
+        self.search_dir = self.data_path / SEARCH_DIR_NAME
+        self._shard_suffix = BINARY_SUFFIX if isinstance(self._codec, BinaryCodec) else ".json"
+        # board id -> (board object, captured state) for boards materialized or saved by this instance
+        self._board_bases: Dict[str, tuple[Board, Dict[str, Any]]] = {}
+        self._manifest: Optional[Dict[str, Any]] = None
+
+    def _board_path(self, board_id: str) -> Path:
+        return self.boards_dir / f"{quote(board_id, safe='')}{self._shard_suffix}"
+
+    def _replace(self, path: Path, payload: bytes) -> None:
+        """Atomically replace one file (call with the exclusive lock held)"""
+        temp_fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.kanban_tmp_')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def load(self) -> KanbanData:
+        """Read the manifest and return data whose boards load on first access"""
+        if not self.manifest_path.exists():
+            return self._create_default_data()
+
+        with self._lock(shared=True):
+            manifest = self._read_manifest()
+
+        self._manifest = manifest
+        self._board_bases = {}
+        boards: List[Board] = []
+        data = KanbanData.model_construct(
+            version=manifest.get("version", "1.0"),
+            boards=boards,
+            default_board=manifest.get("default_board", "main"),
+            next_task_id=manifest.get("next_task_id", 1)
+        )
+        for entry in manifest["boards"]:
+            loader = partial(self._load_board, data, entry)
+            boards.append(Board.lazy(entry["id"], entry["name"], loader, entry.get("task_count", 0)))
+        return data
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        """The manifest as stored now (call with a lock held)"""
+        try:
+            return json.loads(self.manifest_path.read_bytes())
+        except json.JSONDecodeError as e:
+            raise KanbanStorageError(f"Manifest {self.manifest_path} is corrupted: {e}")
+
+    def _load_board(self, data: KanbanData, entry: Dict[str, Any], stub: Board) -> None:
+        """Fill in a lazy board stub from its shard file
+
+        `entry` is the board's manifest entry as load() read it. A shard that
+        doesn't match its checksum was saved since (or edited by hand), so
+        the manifest is read again under the shard's lock; if the shard
+        matches the current entry, the stub's name and `data`'s next_task_id
+        are brought up to that save, so ids allocated from `data` stay unique.
+        """
+        path = self._board_path(stub.id)
+        recorded = entry.get("checksum")
+        with self._lock(shared=True):
+            raw = path.read_bytes() if path.exists() else None
+            if raw is not None and not checksum_matches(raw, recorded):
+                manifest = self._read_manifest()
+                current = next((e for e in manifest["boards"] if e["id"] == stub.id), None)
+                if current is not None and checksum_matches(raw, current.get("checksum")):
+                    recorded = current["checksum"]
+                    stub.__dict__["name"] = current["name"]
+                    data.next_task_id = max(data.next_task_id, manifest.get("next_task_id", 1))
+            self._search_bases[stub.id] = (stub, self._search_key(stub.id))
+
+        if raw is not None:
+            board = self._decode(raw, Board, recorded)
+        else:
+            board = Board(id=stub.id, name=stub.name, columns=DEFAULT_COLUMNS)
+
+        # The manifest stays authoritative for fields already set on the stub (e.g. name)
+        for field in Board.model_fields:
+            stub.__dict__.setdefault(field, board.__dict__[field])
+        self._defer_history([stub])
+        self._board_bases[stub.id] = (stub, capture_board(stub))
+
+    def _search_key(self, board_id: Optional[str]) -> Any:
+        """The board's id and its shard file's (inode, mtime_ns, size)"""
+        try:
+            if board_id is None:
+                board_id = json.loads(self.manifest_path.read_bytes()).get("default_board", "main")
+            st = os.stat(self._board_path(board_id))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return (board_id, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def save(self, data: KanbanData) -> None:
+        """Write the manifest (if changed) and the shard files of changed boards"""
+        # Before saving marks the tasks clean
+        changed = {board.id: board.changed_task_ids() for board in data.boards}
+        with self._lock():
+            self.boards_dir.mkdir(parents=True, exist_ok=True)
+            # Boards never loaded can't have new history
+            self._flush_history([b for b in data.boards if b.is_loaded], [b.id for b in data.boards])
+
+            # Encoded before the manifest is built, so it can record their checksums
+            payloads: Dict[str, bytes] = {}
+            for board in data.boards:
+                if not board.is_loaded:
+                    continue  # never touched, so unchanged
+                entry = self._board_bases.get(board.id)
+                if entry is not None and entry[0] is board and board_ops(board, entry[1]) == []:
+                    continue
+                payloads[board.id] = self._codec.encode(board, exclude=BOARD_NO_HISTORY)
+
+            previous = {e["id"]: e.get("checksum") for e in (self._manifest or {}).get("boards", [])}
+            manifest = {
+                "version": data.version,
+                "default_board": data.default_board,
+                "next_task_id": data.next_task_id,
+                "boards": [
+                    {
+                        "id": b.id,
+                        "name": b.name,
+                        "task_count": b.task_count,
+                        "checksum": checksum(payloads[b.id]) if b.id in payloads else previous.get(b.id),
+                    }
+                    for b in data.boards
+                ],
+            }
+
+            # Manifest first: if we crash before the shards, next_task_id only skips ids
+            # (and the shards it has checksums for no longer match, so they're validated)
+            if manifest != self._manifest or not self.manifest_path.exists():
+                self._replace(self.manifest_path, json.dumps(manifest, indent=2).encode('utf-8'))
+                self._manifest = manifest
+
+            with self._logged_write({b.id: b for b in data.boards if b.id in payloads}, changed):
+                for board in data.boards:
+                    if board.id in payloads:
+                        self._replace(self._board_path(board.id), payloads[board.id])
+                        self._board_bases[board.id] = (board, capture_board(board))
+
+            live = {self._board_path(b.id).name for b in data.boards}
+            for path in self.boards_dir.glob(f"*{self._shard_suffix}"):
+                if path.name not in live:
+                    path.unlink()
+        self._mark_saved(data)
+
+    def backup(self, backup_path: Optional[str] = None) -> str:
+        """Copy the manifest and all board files to a new directory"""
+        if backup_path is None:
+            timestamp = now_utc().strftime("%Y%m%d_%H%M%S")
+            target_path: Path = self.data_path.parent / f"backup_{timestamp}.d"
+        else:
+            target_path = Path(backup_path)
+
+        with self._lock(shared=True):
+            shutil.copytree(self.data_path, target_path)
+        return str(target_path)
+
+    def _backup_files(self) -> List[Path]:
+        """The manifest, board files and history logs"""
+        if not self.data_path.exists():
+            return []
+        return sorted(
+            path for path in self.data_path.rglob("*")
+            if path.is_file() and not path.name.startswith(".kanban_tmp_") and path.parent != self.search_dir
+        )
+
+    def _forget_loaded(self) -> None:
+        super()._forget_loaded()
+        self._manifest = None
+        self._board_bases = {}
+
+    def compact(self) -> None:
+        """Nothing to fold: every save already writes whole shard files"""
@@ -0,0 +1,282 @@
+"""
+Binary snapshot format for Kanban data - typed fixed-size records for fast cold starts
+
+Layout (little-endian):
+
+    header     magic, format version, section counts and offsets, root fields
+    strings    u32 byte length per string, then the UTF-8 bytes of all strings
+    boards     one BOARD record per board, in order
+    columns    one COLUMN record per column, grouped by board
+    tasks      one TASK record per task, grouped by board
+    tags       u32 string index per tag, referenced by (start, count) from tasks
+
+Every string (ids, titles, tags, ...) is stored once in the string table
+and referenced by index. Timestamps are UTC epoch microseconds and
+priorities a small integer, so loading needs no text parsing and no
+pydantic validation. Task history is not part of a snapshot: it lives in
+the storage's history log.
+"""
+
+import gc
+import json
+import struct
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from models import KanbanData, Board, Column, Task, Priority
+from taskstore import TaskStore, PRIORITIES, PRIORITY_CODES, EPOCH
+from taskstore import to_micros as _micros, private_defaults as _private_defaults, construct_model as _construct
+
+
+MAGIC = b"KANBANB\x00"
+FORMAT_VERSION = 1
+
+# magic, format version, flags, counts (strings, boards, columns, tasks, tags),
+# offsets (strings, boards, columns, tasks, tags), version and default_board string ids, next_task_id
+HEADER = struct.Struct("<8sHHIIIIIQQQQQIIq")
+# id, name, created_at, updated_at, column count, task count
+BOARD = struct.Struct("<IIqqII")
+# id, name, limit, order
+COLUMN = struct.Struct("<IIqi")
+# id, board_id, column_id, title, description, priority, created_at, updated_at,
+# tag start, tag count, agent_context (JSON string)
+TASK = struct.Struct("<qIIIiBqqIIi")
+
+NONE = -1  # string index / limit standing in for None
+
+
+class SnapshotError(ValueError):
+    """Raised when bytes are not a readable binary snapshot"""
+    pass
+
+
+def is_snapshot(raw: bytes) -> bool:
+    """Whether `raw` starts with the binary snapshot magic"""
+    return raw[:len(MAGIC)] == MAGIC
+
+
+class BinaryCodec:
+    """Encodes KanbanData (or a single Board) as a binary snapshot
+
+    Same interface as the JSON codecs in storage.py. The raw-dict methods
+    go through the models, so journal replay on top of a binary snapshot
+    works but is slower than on JSON.
+    """
+
+    def encode(self, data: BaseModel, exclude: Optional[Dict[str, Any]] = None) -> bytes:
+        # Snapshots never hold task history, which is all `exclude` is used to drop
+        if isinstance(data, Board):
+            boards, root = [data], KanbanData(boards=[])
+        else:
+            boards, root = data.boards, data
+
+        strings: List[str] = []
+        string_ids: Dict[str, int] = {}
+
+        def intern(value: Optional[str]) -> int:
+            if value is None:
+                return NONE
+            idx = string_ids.get(value)
+            if idx is None:
+                idx = string_ids[value] = len(strings)
+                strings.append(value)
+            return idx
+
+        version_id = intern(root.version)
+        default_board_id = intern(root.default_board)
+
+        board_bytes = bytearray()
+        column_bytes = bytearray()
+        task_bytes = bytearray()
+        tags = array('I')
+        column_count = task_count = 0
+
+        for board in boards:
+            columns = board.columns
+            tasks = board.tasks
+            board_bytes += BOARD.pack(
+                intern(board.id), intern(board.name),
+                _micros(board.created_at), _micros(board.updated_at),
+                len(columns), len(tasks)
+            )
+            for col in columns:
+                column_bytes += COLUMN.pack(
+                    intern(col.id), intern(col.name),
+                    NONE if col.limit is None else col.limit, col.order
+                )
+            column_count += len(columns)
+
+            for task in tasks:
+                fields = task.__dict__
+                tag_start = len(tags)
+                for tag in fields["tags"]:
+                    tags.append(intern(tag))
+                context = fields["agent_context"]
+                task_bytes += TASK.pack(
+                    fields["id"], intern(fields["board_id"]), intern(fields["column_id"]),
+                    intern(fields["title"]), intern(fields["description"]),
+                    PRIORITY_CODES[Priority(fields["priority"])],
+                    _micros(fields["created_at"]), _micros(fields["updated_at"]),
+                    tag_start, len(tags) - tag_start,
+                    intern(json.dumps(context, ensure_ascii=False, default=str)) if context else NONE
+                )
+            task_count += len(tasks)
+
+        encoded = [s.encode('utf-8') for s in strings]
+        string_section = array('I', [len(b) for b in encoded]).tobytes() + b"".join(encoded)
+
+        strings_offset = HEADER.size
+        boards_offset = strings_offset + len(string_section)
+        columns_offset = boards_offset + len(board_bytes)
+        tasks_offset = columns_offset + len(column_bytes)
+        tags_offset = tasks_offset + len(task_bytes)
+
+        header = HEADER.pack(
+            MAGIC, FORMAT_VERSION, 0,
+            len(strings), len(boards), column_count, task_count, len(tags),
+            strings_offset, boards_offset, columns_offset, tasks_offset, tags_offset,
+            version_id, default_board_id, root.next_task_id
+        )
+        return b"".join((header, string_section, board_bytes, column_bytes, task_bytes, tags.tobytes()))
+
+    def decode(self, raw: bytes, model: type = KanbanData, columnar: bool = False) -> Any:
+        # Building ~100k objects in a row sets off the cyclic GC over and over, for nothing
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._decode(raw, model, columnar)
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise SnapshotError(f"Truncated or corrupted snapshot ({e})")
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def decode_columnar(self, raw: bytes) -> KanbanData:
+        """Decode with each board's tasks left in a TaskStore instead of Task models"""
+        return self.decode(raw, columnar=True)
+
+    def _decode(self, raw: bytes, model: type, columnar: bool) -> Any:
+        if len(raw) < HEADER.size or not is_snapshot(raw):
+            raise SnapshotError("Not a binary Kanban snapshot")
+        (_, format_version, _, string_count, board_count, column_count, task_count, tag_count,
+         strings_offset, boards_offset, columns_offset, tasks_offset, tags_offset,
+         version_id, default_board_id, next_task_id) = HEADER.unpack_from(raw)
+        if format_version != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format version {format_version}")
+        view = memoryview(raw)
+
+        lengths = array('I')
+        lengths.frombytes(view[strings_offset:strings_offset + 4 * string_count])
+        blob = bytes(view[strings_offset + 4 * string_count:boards_offset])
+        if len(lengths) != string_count or len(blob) != sum(lengths):
+            raise SnapshotError("Truncated string table")
+        strings: List[Optional[str]] = []
+        pos = 0
+        if blob.isascii():
+            # One decode, then slice: byte offsets equal character offsets
+            text = blob.decode('ascii')
+            for length in lengths:
+                strings.append(text[pos:pos + length])
+                pos += length
+        else:
+            for length in lengths:
+                strings.append(blob[pos:pos + length].decode('utf-8'))
+                pos += length
+        strings.append(None)  # so NONE (-1) resolves to None
+
+        tags = array('I')
+        tags.frombytes(view[tags_offset:tags_offset + 4 * tag_count])
+        tag_strings = [strings[i] for i in tags]
+
+        column_iter = COLUMN.iter_unpack(view[columns_offset:columns_offset + COLUMN.size * column_count])
+        task_iter = TASK.iter_unpack(view[tasks_offset:tasks_offset + TASK.size * task_count])
+
+        def when(micros: int) -> datetime:
+            return EPOCH + timedelta(microseconds=micros)
+
+        column_private = _private_defaults(Column)
+        task_private = _private_defaults(Task)
+        priorities = PRIORITIES
+        boards = []
+        for board_id, name, created, updated, n_columns, n_tasks in BOARD.iter_unpack(
+            view[boards_offset:boards_offset + BOARD.size * board_count]
+        ):
+            columns = []
+            for _ in range(n_columns):
+                col_id, col_name, limit, order = next(column_iter)
+                columns.append(_construct(Column, {
+                    "id": strings[col_id],
+                    "name": strings[col_name],
+                    "limit": None if limit == NONE else limit,
+                    "order": order,
+                }, column_private))
+
+            if columnar:
+                store = TaskStore()
+                for _ in range(n_tasks):
+                    (task_id, task_board, column_id, title, description, priority,
+                     task_created, task_updated, tag_start, n_tags, context) = next(task_iter)
+                    store.append(
+                        task_id, strings[task_board], strings[column_id], strings[title],
+                        strings[description], priorities[priority], task_created, task_updated,
+                        tag_strings[tag_start:tag_start + n_tags], strings[context]
+                    )
+                boards.append(Board.with_store(
+                    store,
+                    id=strings[board_id],
+                    name=strings[name],
+                    columns=columns,
+                    created_at=when(created),
+                    updated_at=when(updated),
+                ))
+                continue
+
+            tasks = []
+            for _ in range(n_tasks):
+                (task_id, task_board, column_id, title, description, priority,
+                 task_created, task_updated, tag_start, n_tags, context) = next(task_iter)
+                tasks.append(_construct(Task, {
+                    "id": task_id,
+                    "board_id": strings[task_board],
+                    "column_id": strings[column_id],
+                    "title": strings[title],
+                    "description": strings[description],
+                    "priority": priorities[priority],
+                    "tags": tag_strings[tag_start:tag_start + n_tags],
+                    "created_at": when(task_created),
+                    "updated_at": when(task_updated),
+                    "agent_context": json.loads(strings[context]) if context != NONE else {},
+                    "history": [],
+                }, task_private))
+
+            # Private defaults include mutable containers, so each board gets fresh ones
+            boards.append(_construct(Board, {
+                "id": strings[board_id],
+                "name": strings[name],
+                "columns": columns,
+                "tasks": tasks,
+                "created_at": when(created),
+                "updated_at": when(updated),
+            }, _private_defaults(Board)))
+
+        if model is Board:
+            if len(boards) != 1:
+                raise SnapshotError(f"Expected a single-board snapshot, found {len(boards)} boards")
+            return boards[0]
+        return KanbanData.model_construct(
+            version=strings[version_id],
+            boards=boards,
+            default_board=strings[default_board_id],
+            next_task_id=next_task_id
+        )
+
+    def encode_raw(self, payload: Dict[str, Any]) -> bytes:
+        """Encode an unvalidated dict (used when compacting the journal)"""
+        return self.encode(KanbanData.model_validate(payload))
+
+    def decode_raw(self, raw: bytes) -> Dict[str, Any]:
+        """Decode to a plain dict (used when journal records must be replayed first)"""
+        return self.decode(raw).model_dump(mode='json')
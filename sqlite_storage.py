@@ -0,0 +1,702 @@
+"""
+SQLite storage backend for Kanban data - indexed tables behind the KanbanStorage interface
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Set
+
+from models import KanbanData, Board, Task, Priority, BOARD_NO_HISTORY, now_utc
+from models import BoardNotFoundError, TaskNotFoundError, ColumnError, intern_strings
+from journal import capture_base, diff_ops
+from history import HistoryPolicy
+from storage import KanbanStorage, KanbanStorageLocked
+from search import SearchIndex
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS columns (
+    board_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    wip_limit INTEGER,
+    display_order INTEGER NOT NULL,
+    PRIMARY KEY (board_id, id)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    board_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    column_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    priority TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    agent_context TEXT NOT NULL,
+    PRIMARY KEY (board_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_id ON tasks (id);
+CREATE INDEX IF NOT EXISTS idx_tasks_column ON tasks (board_id, column_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (board_id, priority);
+CREATE TABLE IF NOT EXISTS task_tags (
+    board_id TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (board_id, task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags (board_id, tag);
+CREATE TABLE IF NOT EXISTS history (
+    board_id TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    PRIMARY KEY (board_id, task_id, seq)
+);
+CREATE TABLE IF NOT EXISTS retention (
+    board_id TEXT PRIMARY KEY,
+    policy TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS search_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    board_id TEXT NOT NULL,
+    task_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_search_log_board ON search_log (board_id, seq);
+"""
+
+# Rows of search_log kept; a search index older than that re-syncs its whole board
+SEARCH_LOG_ROWS = 100_000
+
+TASK_COLUMNS = "board_id, id, column_id, title, description, priority, created_at, updated_at, agent_context"
+
+
+class SQLiteKanbanStorage(KanbanStorage):
+    """Stores boards, columns, tasks, tags and history in an indexed SQLite database"""
+
+    def __init__(self, data_path: Optional[str] = None):
+        # Shared state (locks, caches, search indexes) from the base class; SQLite has no journal file
+        super().__init__(data_path or str(Path.home() / ".kanban" / "data.db"))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._write_depth = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit mode; writes are grouped explicitly with BEGIN IMMEDIATE
+            self._conn = sqlite3.connect(
+                self.data_path,
+                timeout=self.LOCK_TIMEOUT,
+                isolation_level=None
+            )
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one immediate (write-locked) transaction
+
+        SQLite's busy handler waits up to LOCK_TIMEOUT for other writers.
+        Nested calls join the enclosing transaction.
+        """
+        conn = self._connect()
+        if self._write_depth:
+            self._write_depth += 1
+            try:
+                yield conn
+            finally:
+                self._write_depth -= 1
+            return
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            raise KanbanStorageLocked(f"Database is locked by another process ({e})")
+        self._write_depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._write_depth = 0
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Run queries against one snapshot of the database
+
+        In WAL mode a deferred transaction reads the database as of its first
+        query, so writes committed meanwhile don't show up halfway through.
+        Joins an enclosing transaction.
+        """
+        conn = self._connect()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def transaction(self) -> Iterator[KanbanData]:
+        """Load, let the caller mutate, and save inside one write transaction"""
+        with self._write():
+            data = self.load()
+            yield data
+            self.save(data)
+
+    def _is_empty(self) -> bool:
+        return self._connect().execute("SELECT 1 FROM meta LIMIT 1").fetchone() is None
+
+    # -- reading -------------------------------------------------------------
+
+    def _meta(self) -> Dict[str, Any]:
+        rows = self._connect().execute("SELECT key, value FROM meta").fetchall()
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    def _board_rows(self, board_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Board dicts with columns (but no tasks), in board order"""
+        conn = self._connect()
+        if board_id is None:
+            rows = conn.execute("SELECT * FROM boards ORDER BY position").fetchall()
+        else:
+            rows = conn.execute("SELECT * FROM boards WHERE id = ?", (board_id,)).fetchall()
+
+        boards = []
+        for row in rows:
+            columns = conn.execute(
+                "SELECT id, name, wip_limit, display_order FROM columns "
+                "WHERE board_id = ? ORDER BY position",
+                (row["id"],)
+            ).fetchall()
+            boards.append({
+                "id": row["id"],
+                "name": row["name"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "columns": [
+                    {"id": c["id"], "name": c["name"], "limit": c["wip_limit"], "order": c["display_order"]}
+                    for c in columns
+                ],
+                "tasks": [],
+            })
+        return boards
+
+    def _task_dicts(self, where: str = "", params: tuple = ()) -> List[Dict[str, Any]]:
+        """Task dicts (with tags, without history) for rows matching `where`, in board order"""
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT {TASK_COLUMNS} FROM tasks {where} ORDER BY board_id, position",
+            params
+        ).fetchall()
+        if not rows:
+            return []
+
+        keys = {(r["board_id"], r["id"]) for r in rows}
+        tags: Dict[tuple, List[str]] = {}
+        if len(rows) <= 500:
+            # Few tasks: fetch their tags by key instead of scanning the table
+            for board_id, task_id in keys:
+                tags[(board_id, task_id)] = [
+                    r["tag"] for r in conn.execute(
+                        "SELECT tag FROM task_tags WHERE board_id = ? AND task_id = ? ORDER BY position",
+                        (board_id, task_id)
+                    )
+                ]
+        else:
+            for r in conn.execute("SELECT board_id, task_id, tag FROM task_tags ORDER BY position"):
+                key = (r["board_id"], r["task_id"])
+                if key in keys:
+                    tags.setdefault(key, []).append(r["tag"])
+
+        return [
+            {
+                "id": r["id"],
+                "board_id": r["board_id"],
+                "column_id": r["column_id"],
+                "title": r["title"],
+                "description": r["description"],
+                "priority": r["priority"],
+                "tags": tags.get((r["board_id"], r["id"]), []),
+                "created_at": r["created_at"],
+                "updated_at": r["updated_at"],
+                "agent_context": json.loads(r["agent_context"]),
+            }
+            for r in rows
+        ]
+
+    def load(self) -> KanbanData:
+        """Load all boards and tasks from the database"""
+        if self._is_empty():
+            return self._create_default_data()
+
+        with self._read():
+            meta = self._meta()
+            boards = self._board_rows()
+            tasks = self._task_dicts()
+        by_id = {b["id"]: b for b in boards}
+        for task in tasks:
+            if task["board_id"] in by_id:
+                by_id[task["board_id"]]["tasks"].append(task)
+
+        data = KanbanData.model_validate({**meta, "boards": boards})
+        intern_strings(data.boards)
+        self._defer_history(data.boards)
+        self._base = (data, capture_base(data))
+        return data
+
+    # -- writing -------------------------------------------------------------
+
+    def save(self, data: KanbanData) -> None:
+        """Save Kanban data; changes to loaded data become single-row updates"""
+        ops = None
+        if self._base and self._base[0] is data:
+            ops = diff_ops(self._base[1], data)
+
+        with self._write() as conn:
+            if ops is None:
+                for table in ("meta", "boards", "columns", "tasks", "task_tags"):
+                    conn.execute(f"DELETE FROM {table}")
+                self._put_root(conn, {"version": data.version, "default_board": data.default_board,
+                                      "next_task_id": data.next_task_id})
+                for board in data.boards:
+                    self._put_board(conn, board.model_dump(mode='json', exclude=BOARD_NO_HISTORY))
+                # Deferred history stays in place; drop only that of tasks that are gone
+                conn.execute(
+                    "DELETE FROM history WHERE NOT EXISTS (SELECT 1 FROM tasks "
+                    "WHERE tasks.board_id = history.board_id AND tasks.id = history.task_id)"
+                )
+                self._log_search(conn, [(board.id, None) for board in data.boards])
+            else:
+                for op in ops:
+                    self._apply(conn, op)
+                self._log_search(conn, [entry for entry in map(self._search_entry, ops) if entry])
+            self._flush_history(data.boards, [b.id for b in data.boards])
+
+        self._base = (data, capture_base(data))
+
+    def _apply(self, conn: sqlite3.Connection, op: Dict[str, Any]) -> None:
+        kind = op["op"]
+        if kind == "set_root":
+            self._put_root(conn, op["fields"])
+        elif kind == "put_board":
+            self._delete_board(conn, op["board"]["id"])
+            self._put_board(conn, op["board"])
+        elif kind == "delete_board":
+            self._delete_board(conn, op["board"])
+        elif kind == "put_board_meta":
+            meta = op["meta"]
+            conn.execute(
+                "UPDATE boards SET name = ?, created_at = ?, updated_at = ? WHERE id = ?",
+                (meta["name"], meta["created_at"], meta["updated_at"], op["board"])
+            )
+            self._put_columns(conn, op["board"], meta["columns"])
+        elif kind == "put_task":
+            self._put_task(conn, op["board"], op["task"])
+        elif kind == "delete_task":
+            for table, key in (("tasks", "id"), ("task_tags", "task_id"), ("history", "task_id")):
+                conn.execute(f"DELETE FROM {table} WHERE board_id = ? AND {key} = ?", (op["board"], op["task"]))
+
+    @staticmethod
+    def _search_entry(op: Dict[str, Any]) -> Optional[tuple[str, Optional[int]]]:
+        """(board id, task id) an op changes for search; no task id means the whole board"""
+        kind = op["op"]
+        if kind == "put_task":
+            return op["board"], op["task"]["id"]
+        if kind == "delete_task":
+            return op["board"], op["task"]
+        if kind == "put_board":
+            return op["board"]["id"], None
+        if kind == "delete_board":
+            return op["board"], None
+        return None
+
+    def _log_search(self, conn: sqlite3.Connection, entries: List[tuple[str, Optional[int]]]) -> None:
+        """Record written tasks in search_log, in the write's transaction, and trim old rows"""
+        if not entries:
+            return
+        conn.executemany("INSERT INTO search_log (board_id, task_id) VALUES (?, ?)", entries)
+        conn.execute(
+            "DELETE FROM search_log WHERE seq <= (SELECT MAX(seq) FROM search_log) - ?", (SEARCH_LOG_ROWS,)
+        )
+
+    def _put_root(self, conn: sqlite3.Connection, fields: Dict[str, Any]) -> None:
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            [(k, json.dumps(v)) for k, v in fields.items()]
+        )
+
+    def _delete_board(self, conn: sqlite3.Connection, board_id: str) -> None:
+        conn.execute("DELETE FROM boards WHERE id = ?", (board_id,))
+        for table in ("columns", "tasks", "task_tags", "history"):
+            conn.execute(f"DELETE FROM {table} WHERE board_id = ?", (board_id,))
+
+    def _put_board(self, conn: sqlite3.Connection, board: Dict[str, Any]) -> None:
+        position = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM boards").fetchone()[0]
+        conn.execute(
+            "INSERT INTO boards (id, position, name, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (board["id"], position, board["name"], board["created_at"], board["updated_at"])
+        )
+        self._put_columns(conn, board["id"], board["columns"])
+        for task in board["tasks"]:
+            self._put_task(conn, board["id"], task)
+
+    def _put_columns(self, conn: sqlite3.Connection, board_id: str, columns: List[Dict[str, Any]]) -> None:
+        conn.execute("DELETE FROM columns WHERE board_id = ?", (board_id,))
+        conn.executemany(
+            "INSERT INTO columns (board_id, id, position, name, wip_limit, display_order) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(board_id, c["id"], pos, c["name"], c["limit"], c["order"]) for pos, c in enumerate(columns)]
+        )
+
+    def _read_history(self, board_id: str, task: Task) -> List[Dict[str, Any]]:
+        return [
+            json.loads(r["entry"]) for r in self._connect().execute(
+                "SELECT entry FROM history WHERE board_id = ? AND task_id = ? ORDER BY seq",
+                (board_id, task.id)
+            )
+        ]
+
+    def _flush_history(self, boards: Iterable[Board], board_ids: Iterable[str]) -> None:
+        """Insert unlogged history entries as rows (deleted boards' rows go with the board)"""
+        policies = self.history_policies()
+        with self._write() as conn:
+            for board in boards:
+                policy = policies.get(board.id)
+                for task in board.tasks:
+                    replace, entries = task.unlogged_history()
+                    if entries:
+                        replace, entries = self._retain(policy, board.id, task, replace, entries)
+                        self._append_history(conn, board.id, task.id, entries, replace)
+                        task.mark_history_logged()
+            conn.execute("DELETE FROM retention WHERE board_id NOT IN (SELECT id FROM boards)")
+
+    def history_policies(self) -> Dict[str, HistoryPolicy]:
+        """Board id -> history retention policy, for boards that have one"""
+        return {
+            r["board_id"]: HistoryPolicy.model_validate_json(r["policy"])
+            for r in self._connect().execute("SELECT board_id, policy FROM retention")
+        }
+
+    def set_history_policy(self, board_id: str, policy: Optional[HistoryPolicy]) -> None:
+        """Set (or with None, remove) a board's history retention policy"""
+        with self._write() as conn:
+            if policy is None or policy.is_empty:
+                conn.execute("DELETE FROM retention WHERE board_id = ?", (board_id,))
+            else:
+                conn.execute(
+                    "INSERT INTO retention (board_id, policy) VALUES (?, ?) "
+                    "ON CONFLICT (board_id) DO UPDATE SET policy = excluded.policy",
+                    (board_id, policy.model_dump_json(exclude_none=True))
+                )
+
+    def _append_history(
+        self,
+        conn: sqlite3.Connection,
+        board_id: str,
+        task_id: int,
+        entries: List[Dict[str, Any]],
+        replace: bool = False
+    ) -> None:
+        """Append history rows for one task; `replace` drops its earlier rows first"""
+        if replace:
+            conn.execute("DELETE FROM history WHERE board_id = ? AND task_id = ?", (board_id, task_id))
+        start = conn.execute(
+            "SELECT COALESCE(MAX(seq) + 1, 0) FROM history WHERE board_id = ? AND task_id = ?",
+            (board_id, task_id)
+        ).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO history (board_id, task_id, seq, entry) VALUES (?, ?, ?, ?)",
+            [(board_id, task_id, start + i, json.dumps(entry, default=str)) for i, entry in enumerate(entries)]
+        )
+
+    def _put_task(self, conn: sqlite3.Connection, board_id: str, task: Dict[str, Any]) -> None:
+        """Upsert one task row with its tags (history is written by _flush_history)"""
+        values = (
+            task["column_id"], task["title"], task["description"], task["priority"],
+            task["created_at"], task["updated_at"], json.dumps(task["agent_context"], default=str),
+        )
+        updated = conn.execute(
+            "UPDATE tasks SET column_id = ?, title = ?, description = ?, priority = ?, "
+            "created_at = ?, updated_at = ?, agent_context = ? WHERE board_id = ? AND id = ?",
+            values + (board_id, task["id"])
+        ).rowcount
+        if not updated:
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM tasks WHERE board_id = ?", (board_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO tasks (board_id, id, position, column_id, title, description, priority, "
+                "created_at, updated_at, agent_context) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (board_id, task["id"], position) + values
+            )
+
+        conn.execute("DELETE FROM task_tags WHERE board_id = ? AND task_id = ?", (board_id, task["id"]))
+        conn.executemany(
+            "INSERT INTO task_tags (board_id, task_id, position, tag) VALUES (?, ?, ?, ?)",
+            [(board_id, task["id"], pos, tag) for pos, tag in enumerate(task["tags"])]
+        )
+
+    # -- indexed queries -----------------------------------------------------
+
+    def _resolve_board(self, board_id: Optional[str], task_id: Optional[int] = None) -> Dict[str, Any]:
+        """The given board, else the one holding `task_id` (if any), else the default board"""
+        if self._is_empty():
+            self._create_default_data()
+        default_id = self._meta().get("default_board", "main")
+        if board_id is None and task_id is not None:
+            # Task ids are global; idx_tasks_id finds the board. The default board wins
+            # duplicates left over from before ids were global.
+            row = self._connect().execute(
+                "SELECT board_id FROM tasks WHERE id = ? ORDER BY board_id != ? LIMIT 1",
+                (task_id, default_id)
+            ).fetchone()
+            if row is not None:
+                board_id = row[0]
+        target_id = board_id or default_id
+        boards = self._board_rows(target_id)
+        if not boards:
+            raise BoardNotFoundError(f"Board '{target_id}' not found")
+        return boards[0]
+
+    def _search_key(self, board_id: Optional[str]) -> Any:
+        """[seq] of the board's latest search_log row (0 if none); only writes to the board move it"""
+        if board_id is None:
+            board_id = self._meta().get("default_board", "main")
+        seq = self._connect().execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM search_log WHERE board_id = ?", (board_id,)
+        ).fetchone()[0]
+        return [seq]
+
+    def _search_state(self, board_id: Optional[str]) -> tuple[Any, Any]:
+        # search_log sequence numbers order writes; there's no change log file to position
+        return self._search_key(board_id), None
+
+    def _search_changes(self, board_id: str, index: SearchIndex, key: Any, position: Any) -> Optional[Set[int]]:
+        since = index.source_key
+        if not (isinstance(since, list) and len(since) == 1 and type(since[0]) is int and since[0] <= key[0]):
+            return None
+        conn = self._connect()
+        oldest = conn.execute("SELECT MIN(seq) FROM search_log").fetchone()[0]
+        if oldest is not None and oldest > since[0] + 1:
+            return None
+        task_ids: Set[int] = set()
+        for (task_id,) in conn.execute(
+            "SELECT task_id FROM search_log WHERE board_id = ? AND seq > ? AND seq <= ?",
+            (board_id, since[0], key[0])
+        ):
+            if task_id is None:
+                return None
+            task_ids.add(task_id)
+        return task_ids
+
+    def find_tasks(
+        self,
+        board_id: Optional[str] = None,
+        task_id: Optional[int] = None,
+        column: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        tags: Optional[List[str]] = None
+    ) -> tuple[Board, List[Task]]:
+        board = self._resolve_board(board_id, task_id)
+
+        clauses = ["board_id = ?"]
+        params: List[Any] = [board["id"]]
+        if task_id is not None:
+            clauses.append("id = ?")
+            params.append(task_id)
+        if column:
+            clauses.append("column_id = ?")
+            params.append(column)
+        if priority:
+            clauses.append("priority = ?")
+            params.append(Priority(priority).value)
+        for tag in tags or ():
+            clauses.append("id IN (SELECT task_id FROM task_tags WHERE board_id = ? AND tag = ?)")
+            params.extend([board["id"], tag])
+
+        tasks = [Task.model_validate(t) for t in self._task_dicts("WHERE " + " AND ".join(clauses), tuple(params))]
+        loader = partial(self._read_history, board["id"])
+        for task in tasks:
+            task.defer_history(loader)
+        return Board.model_validate(board), tasks
+
+    def iter_tasks(
+        self,
+        board_id: Optional[str] = None,
+        column: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        tags: Optional[List[str]] = None
+    ) -> tuple[Board, Iterator[Task]]:
+        # The indexed query, rather than the base class's full load
+        board, tasks = self.find_tasks(board_id, column=column, priority=priority, tags=tags)
+        return board, iter(tasks)
+
+    def move_task(
+        self,
+        task_id: int,
+        column: str,
+        reason: Optional[str] = None,
+        board_id: Optional[str] = None
+    ) -> tuple[Task, str]:
+        board_dict = self._resolve_board(board_id, task_id)
+        board = Board.model_validate(board_dict)
+
+        with self._write() as conn:
+            rows = self._task_dicts("WHERE board_id = ? AND id = ?", (board.id, task_id))
+            if not rows:
+                raise TaskNotFoundError(f"Task #{task_id} not found")
+            task = Task.model_validate(rows[0])
+            task.defer_history(partial(self._read_history, board.id))
+            old_column = task.column_id
+            if old_column == column:
+                return task, old_column
+
+            col = board.get_column(column)
+            if not col:
+                raise ColumnError(f"Column '{column}' not found")
+            if col.limit is not None:
+                count = conn.execute(
+                    "SELECT COUNT(*) FROM tasks WHERE board_id = ? AND column_id = ?", (board.id, column)
+                ).fetchone()[0]
+                if count >= col.limit:
+                    raise ColumnError(f"WIP limit ({col.limit}) reached for '{col.name}'")
+
+            task.move_to(column, reason)
+            conn.execute(
+                "UPDATE tasks SET column_id = ?, updated_at = ? WHERE board_id = ? AND id = ?",
+                (column, task.updated_at.isoformat(), board.id, task_id)
+            )
+            self._log_search(conn, [(board.id, task_id)])
+            replace, entries = task.unlogged_history()
+            replace, entries = self._retain(self.history_policies().get(board.id), board.id, task, replace, entries)
+            self._append_history(conn, board.id, task_id, entries, replace)
+            task.mark_history_logged()
+
+        self._base = None
+        return task, old_column
+
+    # -- maintenance ---------------------------------------------------------
+
+    def history_size(self) -> int:
+        """Total bytes of stored history entries"""
+        return self._connect().execute("SELECT COALESCE(SUM(LENGTH(entry)), 0) FROM history").fetchone()[0]
+
+    def compact_history(self, board_id: Optional[str] = None, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """Rewrite each board's history rows with its retention policy applied (see KanbanStorage)"""
+        if board_id is not None:
+            board_id = self._resolve_board(board_id)["id"]
+        policies = self.history_policies()
+        now = now_utc()
+
+        results = []
+        with (nullcontext(self._connect()) if dry_run else self._write()) as conn:
+            for (board,) in conn.execute("SELECT id FROM boards ORDER BY position").fetchall():
+                if board_id is not None and board != board_id:
+                    continue
+                policy = policies.get(board)
+                histories: Dict[int, List[str]] = {}
+                for r in conn.execute(
+                    "SELECT task_id, entry FROM history WHERE board_id = ? ORDER BY task_id, seq", (board,)
+                ):
+                    histories.setdefault(r["task_id"], []).append(r["entry"])
+
+                before = after = bytes_before = bytes_after = 0
+                for task_id, rows in histories.items():
+                    before += len(rows)
+                    bytes_before += sum(len(row.encode('utf-8')) for row in rows)
+                    entries = [json.loads(row) for row in rows]
+                    kept = policy.apply(entries, now) if policy else entries
+                    after += len(kept)
+                    bytes_after += sum(len(json.dumps(e, default=str).encode('utf-8')) for e in kept)
+                    if not dry_run and len(kept) != len(entries):
+                        self._append_history(conn, board, task_id, kept, replace=True)
+                results.append({
+                    "board": board,
+                    "policy": policy.model_dump(exclude_none=True) if policy else None,
+                    "entries_before": before,
+                    "entries_after": after,
+                    "bytes_before": bytes_before,
+                    "bytes_after": bytes_after,
+                })
+        if not dry_run:
+            self._base = None
+        return results
+
+    def trusted_load_report(self) -> Optional[Dict[str, Any]]:
+        """None: rows can be changed behind our back by any SQLite client, so loads always validate"""
+        return None
+
+    def backup(self, backup_path: Optional[str] = None) -> str:
+        """Create a consistent copy of the database using SQLite's online backup"""
+        if backup_path is None:
+            timestamp = now_utc().strftime("%Y%m%d_%H%M%S")
+            target_path: Path = self.data_path.parent / f"backup_{timestamp}.db"
+        else:
+            target_path = Path(backup_path)
+
+        target = sqlite3.connect(target_path)
+        try:
+            self._connect().backup(target)
+        finally:
+            target.close()
+        return str(target_path)
+
+    @contextmanager
+    def _backup_sources(self) -> Iterator[List[tuple[str, Path]]]:
+        """A consistent copy of the database (via the online backup API) to chunk"""
+        store = self.backup_store
+        store.root.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=store.root, prefix='.snapshot_', suffix='.db')
+        os.close(fd)
+        try:
+            self.backup(temp_path)
+            yield [(self.data_path.name, Path(temp_path))]
+        finally:
+            os.unlink(temp_path)
+
+    def restore_backup(self, backup_id: str) -> Dict[str, Any]:
+        """Replace the database with an incremental backup (stop other kanban processes first)"""
+        manifest = self._get_backup(backup_id)
+        if self._conn is not None:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+            self._conn = None
+        # A leftover WAL would be replayed into the restored file
+        for suffix in ("-wal", "-shm"):
+            Path(f"{self.data_path}{suffix}").unlink(missing_ok=True)
+        self._restore_files(manifest, [self.data_path.name])
+        self._base = None
+        # The restored search_log numbers its rows afresh; don't trust indexes keyed by the old ones
+        shutil.rmtree(self.search_dir, ignore_errors=True)
+        self._search_indexes = {}
+        return manifest
+
+    def compact(self) -> None:
+        """Reclaim free pages left behind by deletes"""
+        self._connect().execute("VACUUM")
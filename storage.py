@@ -7,12 +7,37 @@ import os
 import shutil
 import tempfile
 import fcntl
+import gc
+import hashlib
+import random
+import threading
+import time
+import zlib
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Set
 from datetime import datetime
 from contextlib import contextmanager
+from functools import partial
+from urllib.parse import quote
 
-from models import KanbanData, Board, Task, Column, DEFAULT_COLUMNS, now_utc
+from pydantic import BaseModel, ValidationError
+
+from models import KanbanData, Board, Task, Column, Priority, DEFAULT_COLUMNS, DATA_NO_HISTORY, now_utc
+from models import intern_strings
+from models import BoardNotFoundError, TaskNotFoundError, ColumnError
+from journal import Journal, capture_base, diff_ops, replay
+from history import HistoryLog, HistoryPolicy
+from backups import BackupStore
+from search import SearchIndex, ChangeLog, CHANGE_LOG_NAME, plain_key
+from taskstore import columnar_data
+from trusted import trusted_model, matches as checksum_matches, read_checksum, write_checksum
+from snapshot import BinaryCodec, SnapshotError, is_snapshot
+from packed import PackedCodec, PackedError, is_packed
+
+try:
+    import orjson
+except ImportError:  # optional faster encoder
+    orjson = None
 
 
 class KanbanStorageError(Exception):
@@ -25,12 +50,134 @@ class KanbanStorageLocked(KanbanStorageError):
     pass
 
 
+class JSONCodec:
+    """Serializes KanbanData straight to and from bytes with pydantic's JSON support
+    
+    indent=None writes compact JSON; any indent reads back either format.
+    """
+    
+    def __init__(self, indent: Optional[int] = 2):
+        self.indent = indent
+    
+    def encode(self, data: BaseModel, exclude: Optional[Dict[str, Any]] = None) -> bytes:
+        return data.model_dump_json(indent=self.indent, exclude=exclude).encode('utf-8')
+    
+    def decode(self, raw: bytes, model: type = KanbanData) -> Any:
+        return model.model_validate_json(raw)
+    
+    def encode_raw(self, payload: Dict[str, Any]) -> bytes:
+        """Encode an unvalidated dict (used when compacting the journal)"""
+        separators = (',', ':') if self.indent is None else None
+        return json.dumps(
+            payload,
+            indent=self.indent,
+            separators=separators,
+            ensure_ascii=False,
+            default=str
+        ).encode('utf-8')
+    
+    def decode_raw(self, raw: bytes) -> Dict[str, Any]:
+        """Decode to a plain dict (used when journal records must be replayed first)"""
+        return json.loads(raw)
+    
+    def decode_trusted(self, raw: bytes, model: type = KanbanData) -> Any:
+        """Decode without validation; only for bytes whose checksum sidecar matches (see trusted.py)"""
+        # Parsing is now most of the cost, so use orjson when it's there whatever the write format
+        payload = orjson.loads(raw) if orjson is not None else self.decode_raw(raw)
+        return trusted_model(payload, model)
+    
+    def decode_columnar(self, raw: bytes) -> KanbanData:
+        """Decode with each board's tasks in a TaskStore; raises like TaskStore.from_rows if validation is needed"""
+        # As in BinaryCodec.decode: no cyclic GC passes while building ~100k objects
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return columnar_data(self.decode_raw(raw))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+
+class OrjsonCodec(JSONCodec):
+    """Compact JSON, with orjson for plain-dict encoding
+    
+    Models still go through pydantic's serializer, which beats
+    model_dump() + orjson.dumps(); orjson only wins on plain dicts
+    (journal compaction). See benchmarks/bench_codecs.py.
+    """
+    
+    def __init__(self):
+        super().__init__(indent=None)
+    
+    def encode_raw(self, payload: Dict[str, Any]) -> bytes:
+        return orjson.dumps(payload, default=str)
+    
+    def decode_raw(self, raw: bytes) -> Dict[str, Any]:
+        return orjson.loads(raw)
+
+
+CODECS = ("pretty", "compact", "fast", "packed", "binary")
+BINARY_SUFFIX = ".kbin"
+
+
+def get_codec(name: str = "pretty") -> JSONCodec:
+    """Codec by name: pretty (indented, for humans), compact, fast (orjson if installed), packed or binary"""
+    if name == "pretty":
+        return JSONCodec(indent=2)
+    if name == "compact":
+        return JSONCodec(indent=None)
+    if name == "fast":
+        return OrjsonCodec() if orjson is not None else JSONCodec(indent=None)
+    if name == "packed":
+        return PackedCodec()
+    if name == "binary":
+        return BinaryCodec()
+    raise KanbanStorageError(f"Unknown codec '{name}' (expected one of: {', '.join(CODECS)})")
+
+
+def codec_for(raw: bytes, preferred: Any) -> Any:
+    """The codec that can read `raw`, so every codec reads files written by the others"""
+    if is_snapshot(raw):
+        return preferred if isinstance(preferred, BinaryCodec) else BinaryCodec()
+    if is_packed(raw):
+        return preferred if isinstance(preferred, PackedCodec) else PackedCodec()
+    return JSONCodec() if isinstance(preferred, (BinaryCodec, PackedCodec)) else preferred
+
+
+def _is_corrupt(exc: Exception) -> bool:
+    """Whether a load error means the file isn't valid JSON (as opposed to invalid data)"""
+    if isinstance(exc, (json.JSONDecodeError, SnapshotError, PackedError)):
+        return True
+    if isinstance(exc, ValidationError):
+        return any(err["type"] == "json_invalid" for err in exc.errors())
+    return False
+
+
 class KanbanStorage:
     """Handles JSON file storage with atomic write operations and file locking"""
     
     LOCK_TIMEOUT = 10  # seconds to wait for lock
+    LOCK_BACKOFF_MIN = 0.005  # first retry delay while waiting for the lock
+    LOCK_BACKOFF_MAX = 0.25  # cap on the retry delay
+    JOURNAL_COMPACT_BYTES = 1024 * 1024  # fold the journal into the snapshot past this size
+    
+    # Parsed-data cache (see load()); class defaults so subclasses without a cache still report stats
+    _cache: Optional[tuple[tuple, Optional[str], KanbanData]] = None
+    cache_hits = 0
+    cache_misses = 0
+    # Skip validation only when forced off; backends without checksums never skip it
+    _strict = False
     
-    def __init__(self, data_path: Optional[str] = None):
+    def __init__(
+        self,
+        data_path: Optional[str] = None,
+        journal: bool = False,
+        cache: bool = False,
+        cache_hash: bool = False,
+        codec: str = "pretty",
+        columnar: bool = False,
+        strict: bool = False
+    ):
         if data_path:
             self.data_path = Path(data_path)
         else:
@@ -38,74 +185,791 @@ class KanbanStorage:
             self.data_path = home / ".kanban" / "data.json"
         
         self._lock_file = self.data_path.with_suffix('.lock')
+        # Writers hold the gate while waiting for the data lock so new readers queue behind them
+        self._gate_file = self.data_path.with_suffix('.gate')
+        self._journal = Journal(self.data_path.with_suffix('.journal')) if journal else None
+        # Task history lives in one append-only log per board, outside the data file
+        self.history_dir = self.data_path.with_name(self.data_path.name + '.history')
+        self._history_logs: Dict[str, HistoryLog] = {}
+        # Full-text index per board, persisted so it's only updated for tasks that changed
+        self.search_dir = self.data_path.with_name(self.data_path.name + '.search')
+        self._search_indexes: Dict[str, SearchIndex] = {}
+        # board id -> (board object, search key of the stored state it was read from or saved as)
+        self._search_bases: Dict[str, tuple[Board, Any]] = {}
+        # (data object, persisted state) from the last load/save, used to diff journaled saves
+        self._base: Optional[tuple[KanbanData, Dict[str, Any]]] = None
+        self._compactor: Optional[threading.Thread] = None
+        self._cache_enabled = cache
+        self._cache_hash = cache_hash
+        self._codec = get_codec(codec)
+        # Keep loaded tasks in TaskStores (see taskstore.py); journaled loads need every Task anyway
+        # Strict mode validates every load, even of files with a matching checksum sidecar
+        self._strict = strict
+        self._columnar = columnar and not journal and not strict
+        self.checksum_path = self.data_path.with_name(self.data_path.name + '.checksum')
+        # Per-thread lock depth so load()/save() can run inside transaction()
+        self._held = threading.local()
         self._ensure_directory()
     
+    @property
+    def journaled(self) -> bool:
+        """Whether saves are appended to the operation journal"""
+        return self._journal is not None
+    
+    @property
+    def journal_path(self) -> Optional[Path]:
+        """Path of the operation journal (None when journaling is off)"""
+        return self._journal.path if self._journal else None
+    
+    def journal_size(self) -> int:
+        """Bytes of journal records not yet folded into the snapshot"""
+        return self._journal.size() if self._journal else 0
+    
+    def _history_log(self, board_id: str) -> HistoryLog:
+        log = self._history_logs.get(board_id)
+        if log is None:
+            log = HistoryLog(self.history_dir / f"{quote(board_id, safe='')}.log")
+            self._history_logs[board_id] = log
+        return log
+    
+    def _read_history(self, board_id: str, task: Task) -> List[Dict[str, Any]]:
+        with self._lock(shared=True):
+            return self._history_log(board_id).entries(task.id)
+    
+    def _defer_history(self, boards: Iterable[Board]) -> None:
+        """Make task histories load from the boards' history logs on first access"""
+        for board in boards:
+            loader = partial(self._read_history, board.id)
+            if board.has_task_store:
+                board.on_task_materialized(partial(Task.defer_history, loader=loader))
+                continue
+            for task in board.tasks:
+                task.defer_history(loader)
+    
+    @property
+    def _retention_path(self) -> Path:
+        return self.history_dir / "retention.json"
+    
+    def history_policies(self) -> Dict[str, HistoryPolicy]:
+        """Board id -> history retention policy, for boards that have one"""
+        try:
+            raw = json.loads(self._retention_path.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {board_id: HistoryPolicy.model_validate(policy) for board_id, policy in raw.items()}
+    
+    def set_history_policy(self, board_id: str, policy: Optional[HistoryPolicy]) -> None:
+        """Set (or with None, remove) a board's history retention policy"""
+        with self._lock():
+            policies = self.history_policies()
+            if policy is None or policy.is_empty:
+                policies.pop(board_id, None)
+            else:
+                policies[board_id] = policy
+            self._write_policies(policies)
+    
+    def _write_policies(self, policies: Dict[str, HistoryPolicy]) -> None:
+        """Atomically replace the retention policies (call with the exclusive lock held)"""
+        payload = json.dumps(
+            {board_id: p.model_dump(exclude_none=True) for board_id, p in policies.items()}, indent=2
+        ).encode('utf-8')
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.history_dir, prefix='.kanban_tmp_')
+        try:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, self._retention_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+    
+    def _retain(
+        self,
+        policy: Optional[HistoryPolicy],
+        board_id: str,
+        task: Task,
+        replace: bool,
+        entries: List[Dict[str, Any]]
+    ) -> tuple[bool, List[Dict[str, Any]]]:
+        """Apply a retention policy to a task's unlogged history on save
+        
+        Returns the (replace, entries) to write: unchanged unless trimming at
+        least halves the task's history, in which case the kept entries
+        replace it (in memory too).
+        """
+        if policy is None:
+            return replace, entries
+        if replace or task.history_loaded:
+            full = task.__dict__["history"] if task.history_loaded else entries
+        else:
+            full = self._read_history(board_id, task) + entries
+        kept = policy.worth_applying(full)
+        if kept is None:
+            return replace, entries
+        if task.history_loaded:
+            task.__dict__["history"] = kept
+        return True, kept
+    
+    def _flush_history(self, boards: Iterable[Board], board_ids: Iterable[str]) -> None:
+        """Append unlogged history of `boards` to their logs and drop logs of boards not in `board_ids`
+        
+        Boards with a retention policy get it applied to tasks with new
+        history (see _retain). Call with the exclusive lock held, before the
+        data itself is written.
+        """
+        board_ids = list(board_ids)
+        policies = self.history_policies()
+        for board in boards:
+            policy = policies.get(board.id)
+            records = []
+            flushed = []
+            for task in board.tasks:
+                replace, entries = task.unlogged_history()
+                if not entries:
+                    continue
+                replace, entries = self._retain(policy, board.id, task, replace, entries)
+                if replace:
+                    records.append((task.id, None))
+                    # Rewrite the task too, so inline history from older files is dropped
+                    task._dirty = True
+                records.extend((task.id, entry) for entry in entries)
+                flushed.append(task)
+            if records:
+                self._history_log(board.id).append(records)
+                for task in flushed:
+                    task.mark_history_logged()
+        
+        if self.history_dir.exists():
+            live = {f"{quote(board_id, safe='')}.log" for board_id in board_ids}
+            for path in self.history_dir.glob("*.log"):
+                if path.name not in live:
+                    path.unlink()
+        if set(policies) - set(board_ids):
+            self._write_policies({b: p for b, p in policies.items() if b in board_ids})
+    
+    def compact_history(self, board_id: Optional[str] = None, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """Rewrite the history logs with each board's retention policy applied
+        
+        Also drops entries superseded by a reset and those of deleted tasks.
+        Returns, per board, its policy and the entries and bytes before and
+        after; with `dry_run` nothing is written.
+        """
+        with self._lock(shared=dry_run):
+            data = self.load()
+            boards = [b for b in data.boards if board_id is None or b.id == board_id]
+            if board_id is not None and not boards:
+                raise BoardNotFoundError(f"Board '{board_id}' not found")
+            policies = self.history_policies()
+            now = now_utc()
+            
+            results = []
+            for board in boards:
+                policy = policies.get(board.id)
+                log = self._history_log(board.id)
+                bytes_before = log.size()
+                payload, before, after = log.compacted(
+                    set(board.task_ids()), partial(policy.apply, now=now) if policy else list
+                )
+                if not dry_run and len(payload) != bytes_before:
+                    log.rewrite(payload)
+                results.append({
+                    "board": board.id,
+                    "policy": policy.model_dump(exclude_none=True) if policy else None,
+                    "entries_before": before,
+                    "entries_after": after,
+                    "bytes_before": bytes_before,
+                    "bytes_after": len(payload),
+                })
+            if not dry_run:
+                # Tasks of the cached data may hold histories that were just trimmed
+                self.invalidate_cache()
+            return results
+    
+    def history_size(self) -> int:
+        """Total bytes of the task history logs"""
+        if not self.history_dir.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.history_dir.glob("*.log"))
+    
     def _ensure_directory(self):
         """Ensure the data directory exists"""
         self.data_path.parent.mkdir(parents=True, exist_ok=True)
     
     @contextmanager
-    def _lock(self):
-        """Acquire exclusive lock for concurrent access protection"""
+    def _lock(self, shared: bool = False):
+        """Acquire the data lock for concurrent access protection
+        
+        Readers take it shared (LOCK_SH) and run in parallel; writers take it
+        exclusive. A writer first takes the gate exclusively and holds it
+        while waiting, and readers must pass the gate, so a steady stream of
+        readers can't starve writers.
+        
+        Waits up to LOCK_TIMEOUT seconds, retrying with jittered exponential
+        backoff. Re-entrant within a thread, so nested load()/save() calls
+        inside transaction() reuse the lock already held.
+        """
+        depth = getattr(self._held, "depth", 0)
+        if depth:
+            if not shared and self._held.shared:
+                raise KanbanStorageError("Cannot take an exclusive lock while holding a shared one")
+            self._held.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._held.depth -= 1
+            return
+        
+        mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        gate_fd = os.open(self._gate_file, os.O_CREAT | os.O_RDWR)
         lock_fd = os.open(self._lock_file, os.O_CREAT | os.O_RDWR)
         try:
-            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            yield
-        except BlockingIOError:
-            raise KanbanStorageLocked("Data file is locked by another process")
+            self._acquire(gate_fd, mode, deadline)
+            try:
+                self._acquire(lock_fd, mode, deadline)
+            finally:
+                fcntl.flock(gate_fd, fcntl.LOCK_UN)
+            
+            self._held.depth = 1
+            self._held.shared = shared
+            try:
+                yield
+            finally:
+                self._held.depth = 0
+                fcntl.flock(lock_fd, fcntl.LOCK_UN)
         finally:
-            fcntl.flock(lock_fd, fcntl.LOCK_UN)
             os.close(lock_fd)
+            os.close(gate_fd)
+    
+    def _acquire(self, lock_fd: int, mode: int, deadline: float) -> None:
+        """flock() with bounded backoff until the deadline, then KanbanStorageLocked"""
+        delay = self.LOCK_BACKOFF_MIN
+        while True:
+            try:
+                fcntl.flock(lock_fd, mode | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise KanbanStorageLocked(
+                        f"Data file is locked by another process (waited {self.LOCK_TIMEOUT}s)"
+                    )
+                time.sleep(min(remaining, delay * random.uniform(0.5, 1.0)))
+                delay = min(delay * 2, self.LOCK_BACKOFF_MAX)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[KanbanData]:
+        """Load, let the caller mutate, and save - all under one exclusive lock
+        
+        The data is saved when the block exits normally and discarded if it
+        raises, so concurrent read-modify-write cycles can't lose updates.
+        """
+        with self._lock():
+            data = self.load()
+            try:
+                yield data
+            except BaseException:
+                # The (possibly cached) object was mutated but won't be saved
+                self.invalidate_cache()
+                raise
+            self.save(data)
+    
+    def _cache_key(self) -> tuple:
+        """(inode, mtime_ns, size) of the data file, plus the journal's when journaling"""
+        st = os.stat(self.data_path)
+        key: tuple = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._journal:
+            try:
+                jst = os.stat(self._journal.path)
+                key += (jst.st_ino, jst.st_mtime_ns, jst.st_size)
+            except FileNotFoundError:
+                key += (None,)
+        return key
+    
+    def invalidate_cache(self) -> None:
+        """Drop the cached data so the next load() re-reads the file"""
+        self._cache = None
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the parsed-data cache"""
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
     
     def load(self) -> KanbanData:
-        """Load Kanban data from JSON file with locking"""
+        """Load Kanban data from JSON file under a shared lock
+        
+        With caching enabled, the last loaded (or saved) object is returned
+        as-is while the file's stat key - and content hash, if requested -
+        is unchanged. The object is shared: callers that mutate it must
+        save() or invalidate_cache().
+        """
         if not self.data_path.exists():
             return self._create_default_data()
         
-        with self._lock():
+        # Recovery writes a fresh file, which needs the exclusive lock, so it happens after release
+        with self._lock(shared=True):
             try:
-                with open(self.data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return KanbanData.model_validate(data)
-            except json.JSONDecodeError as e:
-                # Backup corrupted file and create fresh data
-                backup_path = self.data_path.with_suffix('.json.corrupted')
-                try:
-                    shutil.copy2(self.data_path, backup_path)
-                    print(f"Warning: Data file corrupted. Backed up to: {backup_path}")
-                except Exception:
-                    pass
-                return self._create_default_data()
+                key = self._cache_key() if self._cache_enabled else None
+                if key is not None and self._cache and self._cache[0] == key and not self._cache_hash:
+                    self.cache_hits += 1
+                    return self._note_loaded(self._cache[2])
+                
+                raw_bytes = self.data_path.read_bytes()
+                digest = hashlib.blake2b(raw_bytes).hexdigest() if self._cache_hash else None
+                if key is not None and self._cache and self._cache[0] == key and self._cache[1] == digest:
+                    self.cache_hits += 1
+                    return self._note_loaded(self._cache[2])
+                
+                if self._journal and self._journal.size():
+                    raw = replay(codec_for(raw_bytes, self._codec).decode_raw(raw_bytes), self._journal.records())
+                    data = KanbanData.model_validate(raw)
+                    intern_strings(data.boards)
+                elif self._columnar:
+                    data = self._decode_columnar(raw_bytes)
+                else:
+                    data = self._decode(raw_bytes, recorded=read_checksum(self.checksum_path))
+                self._defer_history(data.boards)
+                if self._journal:
+                    self._base = (data, capture_base(data))
+                if key is not None:
+                    self.cache_misses += 1
+                    self._cache = (key, digest, data)
+                return self._note_loaded(data)
             except Exception as e:
-                # Log validation errors but don't silently overwrite
-                print(f"Warning: Error loading data ({type(e).__name__}: {e}). Creating fresh data.")
-                return self._create_default_data()
+                if _is_corrupt(e):
+                    # Backup corrupted file and create fresh data
+                    backup_path = self.data_path.with_name(self.data_path.name + '.corrupted')
+                    try:
+                        shutil.copy2(self.data_path, backup_path)
+                        print(f"Warning: Data file corrupted. Backed up to: {backup_path}")
+                    except Exception:
+                        pass
+                else:
+                    # Log validation errors but don't silently overwrite
+                    print(f"Warning: Error loading data ({type(e).__name__}: {e}). Creating fresh data.")
+        
+        return self._create_default_data()
+    
+    def _note_loaded(self, data: KanbanData) -> KanbanData:
+        """Note that `data` is what's stored now (call with the lock it was read under), for the search change log"""
+        key = self._search_key(None)
+        for board in data.boards:
+            self._search_bases[board.id] = (board, key)
+        return data
+    
+    def _is_trusted(self, raw_bytes: bytes, recorded: Optional[Dict[str, Any]]) -> bool:
+        """Whether `raw_bytes` is a file this code saved, unchanged since, per its recorded checksum"""
+        return not self._strict and checksum_matches(raw_bytes, recorded)
+    
+    def _decode(self, raw_bytes: bytes, model: type = KanbanData, recorded: Optional[Dict[str, Any]] = None) -> Any:
+        """Decode into models, validating unless the recorded checksum vouches for the bytes"""
+        codec = codec_for(raw_bytes, self._codec)
+        if isinstance(codec, BinaryCodec):
+            # Snapshots are built without validation by design; strict mode re-checks them
+            decoded = codec.decode(raw_bytes, model)
+            if self._strict:
+                decoded = model.model_validate(decoded.model_dump())
+                intern_strings(decoded.boards if model is KanbanData else [decoded])
+            return decoded
+        if self._is_trusted(raw_bytes, recorded):
+            try:
+                return codec.decode_trusted(raw_bytes, model)
+            except (KeyError, TypeError, ValueError):
+                pass  # Can't happen for a file we wrote, but validation is the safe answer
+        # Single pass: bytes straight to validated models
+        decoded = codec.decode(raw_bytes, model)
+        intern_strings(decoded.boards if model is KanbanData else [decoded])
+        return decoded
+    
+    def _decode_columnar(self, raw_bytes: bytes) -> KanbanData:
+        """Decode into TaskStores, or into validated models unless the file is known to be ours
+        
+        TaskStores skip most validation, so like decode_trusted() they're only
+        used for binary snapshots and for files whose recorded checksum matches.
+        """
+        codec = codec_for(raw_bytes, self._codec)
+        recorded = read_checksum(self.checksum_path)
+        if isinstance(codec, BinaryCodec) or self._is_trusted(raw_bytes, recorded):
+            try:
+                return codec.decode_columnar(raw_bytes)
+            except (KeyError, TypeError, ValueError):
+                pass  # Validation is the safe answer, as in _decode()
+        return self._decode(raw_bytes, recorded=recorded)
+    
+    def trusted_load_report(self) -> Optional[Dict[str, Any]]:
+        """Time a trusted and a validated decode of the current data file
+        
+        Returns None when there's no JSON data file to time. `trusted` says
+        whether loads currently skip validation (checksum matches and strict
+        mode is off); the timings are taken either way.
+        """
+        with self._lock(shared=True):
+            if not self.data_path.is_file():
+                return None
+            raw_bytes = self.data_path.read_bytes()
+            trusted = self._is_trusted(raw_bytes, read_checksum(self.checksum_path))
+        codec = codec_for(raw_bytes, self._codec)
+        if isinstance(codec, BinaryCodec):
+            return None
+        
+        # Collected first so neither timing pays for the other's garbage
+        gc.collect()
+        start = time.perf_counter()
+        try:
+            codec.decode_trusted(raw_bytes)
+        except (KeyError, TypeError, ValueError):
+            return None  # Not in the shape this schema writes, so never trusted anyway
+        trusted_seconds = time.perf_counter() - start
+        gc.collect()
+        start = time.perf_counter()
+        try:
+            codec.decode(raw_bytes)
+        except ValidationError:
+            return None
+        validated_seconds = time.perf_counter() - start
+        return {
+            "trusted": trusted,
+            "strict": self._strict,
+            "trusted_seconds": trusted_seconds,
+            "validated_seconds": validated_seconds,
+            "saved_seconds": validated_seconds - trusted_seconds,
+        }
     
     def save(self, data: KanbanData) -> None:
-        """Save Kanban data atomically to JSON file with locking"""
+        """Save Kanban data atomically to JSON file with locking
+        
+        In journaled mode, data previously returned by `load()` is saved by
+        appending only the changed records to the journal. New task history
+        entries are appended to the history logs first.
+        """
+        # Taken before capture_base() marks the tasks clean
+        changed = {board.id: board.changed_task_ids() for board in data.boards}
+        with self._lock():
+            self._flush_history(data.boards, [b.id for b in data.boards])
+        
+        if self._journal and self._base and self._base[0] is data:
+            ops = diff_ops(self._base[1], data)
+            if ops is not None:
+                if ops:
+                    with self._lock(), self._logged_write({b.id: b for b in data.boards}, changed):
+                        # Only re-cache if no other process appended since `data` was loaded
+                        current = self._is_cached(data)
+                        self._journal.append(ops)
+                        if current:
+                            self._remember(data)
+                        else:
+                            self.invalidate_cache()
+                    self._base = (data, capture_base(data))
+                    self._maybe_compact()
+                self._mark_saved(data)
+                return
+        
+        self._write_snapshot(self._codec.encode(data, exclude=DATA_NO_HISTORY), data, changed)
+        if self._journal:
+            self._base = (data, capture_base(data))
+        self._mark_saved(data)
+    
+    @staticmethod
+    def _mark_saved(data: KanbanData) -> None:
+        """Reset the boards' changed_task_ids() once `data` is written"""
+        for board in data.boards:
+            board.mark_saved()
+    
+    @property
+    def _change_log(self) -> ChangeLog:
+        """The log of which tasks each save wrote, kept with the search indexes"""
+        return ChangeLog(self.search_dir / CHANGE_LOG_NAME)
+    
+    @contextmanager
+    def _logged_write(
+        self,
+        boards: Dict[str, Optional[Board]],
+        changed: Optional[Dict[str, Set[int]]] = None
+    ) -> Iterator[None]:
+        """Record a write in the search change log (call with the exclusive lock held)
+        
+        `boards` maps the ids of the boards written to the objects written,
+        or to None when the write leaves their tasks as they were (journal
+        compaction). `changed` maps board ids to the ids of the tasks the
+        write changed. Those are only trusted for a board object this
+        storage read from the state the write replaces; any other board is
+        logged without a starting key, as is a write that raises, and the
+        gap makes the next search re-sync it in full.
+        """
+        before = {}
+        for board_id, board in boards.items():
+            key = self._search_key(board_id)
+            base = self._search_bases.get(board_id)
+            if board is not None and (base is None or base[0] is not board or base[1] != key):
+                key = None
+            before[board_id] = key
+        yield
+        after = {board_id: self._search_key(board_id) for board_id in boards}
+        for board_id, board in boards.items():
+            base = self._search_bases.get(board_id)
+            if board is not None:
+                self._search_bases[board_id] = (board, after[board_id])
+            elif base is not None and base[1] == before[board_id]:
+                self._search_bases[board_id] = (base[0], after[board_id])
+        self._change_log.append(before, after, changed or {})
+    
+    def _is_cached(self, data: KanbanData) -> bool:
+        """Whether `data` is the cached object and the files haven't changed since"""
+        return bool(self._cache) and self._cache[2] is data and self._cache[0] == self._cache_key()
+    
+    def _remember(self, data: KanbanData) -> None:
+        """Cache what was just written (call with the exclusive lock held)"""
+        if not self._cache_enabled:
+            return
+        digest = hashlib.blake2b(self.data_path.read_bytes()).hexdigest() if self._cache_hash else None
+        self._cache = (self._cache_key(), digest, data)
+    
+    def _write_temp(self, payload: bytes) -> str:
+        """Write encoded payload to a temp file next to the data file and return its path"""
         temp_fd, temp_path = tempfile.mkstemp(
             dir=self.data_path.parent,
             prefix='.kanban_tmp_'
         )
         
         try:
-            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                json.dump(
-                    data.model_dump(mode='json'),
-                    f,
-                    indent=2,
-                    ensure_ascii=False,
-                    default=str
-                )
-            
-            with self._lock():
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(payload)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        return temp_path
+    
+    def _write_snapshot(
+        self,
+        payload: bytes,
+        data: Optional[KanbanData] = None,
+        changed: Optional[Dict[str, Set[int]]] = None
+    ) -> None:
+        """Atomically replace the snapshot file (and reset the journal it supersedes)
+        
+        With `data`, the write is recorded in the search change log, with the
+        task ids in `changed`; other writes leave a gap there.
+        """
+        temp_path = self._write_temp(payload)
+        boards = {b.id: b for b in data.boards} if data is not None else {}
+        
+        try:
+            with self._lock(), self._logged_write(boards, changed):
                 shutil.move(temp_path, self.data_path)
-            
+                # After the data: a crash in between leaves a stale sidecar, which only costs validation
+                write_checksum(self.checksum_path, payload)
+                if self._journal:
+                    self._journal.truncate()
+                if data is not None:
+                    self._remember(data)
+                else:
+                    self.invalidate_cache()
         except Exception:
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
             raise
     
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot and truncate it"""
+        if not self._journal or not self.data_path.exists():
+            return
+        
+        with self._lock():
+            cached = self._cache[2] if self._cache and self._is_cached(self._cache[2]) else None
+            snapshot = self.data_path.read_bytes()
+            # Journal records come from validated saves, so the result is as trusted as the snapshot
+            trusted = checksum_matches(snapshot, read_checksum(self.checksum_path))
+            raw = replay(codec_for(snapshot, self._codec).decode_raw(snapshot), self._journal.records())
+            payload = self._codec.encode_raw(raw)
+            temp_path = self._write_temp(payload)
+            try:
+                # Same tasks, new search keys: logged so searches don't re-sync
+                with self._logged_write({board["id"]: None for board in raw["boards"]}):
+                    # Ops are idempotent, so a crash between these two steps only replays twice
+                    shutil.move(temp_path, self.data_path)
+                    if trusted:
+                        write_checksum(self.checksum_path, payload)
+                    self._journal.truncate()
+                # Same content, new stat key: re-key rather than force a reparse
+                if cached is not None:
+                    self._remember(cached)
+                else:
+                    self.invalidate_cache()
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+    
+    def _maybe_compact(self) -> None:
+        """Start a background compaction once the journal passes the size threshold
+        
+        The thread is non-daemon, so a CLI process finishes compacting after
+        printing its result instead of abandoning it.
+        """
+        if self._journal.size() < self.JOURNAL_COMPACT_BYTES:
+            return
+        if self._compactor and self._compactor.is_alive():
+            return
+        
+        def run():
+            try:
+                self.compact()
+            except KanbanStorageLocked:
+                pass  # Another process holds the lock; the next save retries
+        
+        self._compactor = threading.Thread(target=run, name="kanban-compact")
+        self._compactor.start()
+    
+    def find_tasks(
+        self,
+        board_id: Optional[str] = None,
+        task_id: Optional[int] = None,
+        column: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        tags: Optional[List[str]] = None
+    ) -> tuple[Board, List[Task]]:
+        """Return a board (default if not specified) and its tasks matching all filters (and all `tags`)
+        
+        With a `task_id` and no `board_id`, the board is whichever holds the
+        task. Callers should only rely on the returned board's metadata and
+        columns; indexed backends return it without its task list.
+        """
+        data = self.load()
+        board = None
+        if board_id is None and task_id is not None:
+            board = data.locate_task(task_id)
+        if board is None:
+            board = data.get_board(board_id)
+        if not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        
+        return board, board.find_tasks(task_id, column, priority, tags or ())
+    
+    def iter_tasks(
+        self,
+        board_id: Optional[str] = None,
+        column: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        tags: Optional[List[str]] = None
+    ) -> tuple[Board, Iterator[Task]]:
+        """find_tasks() with the tasks as an iterator, for output streamed one task at a time"""
+        data = self.load()
+        board = data.get_board(board_id)
+        if not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        return board, board.iter_tasks(column, priority, tags or ())
+    
+    def move_task(
+        self,
+        task_id: int,
+        column: str,
+        reason: Optional[str] = None,
+        board_id: Optional[str] = None
+    ) -> tuple[Task, str]:
+        """Move a task to another column, enforcing WIP limits
+        
+        Returns the task and the column it was in; nothing is saved when
+        the task is already in the target column. Without a `board_id` the
+        task is looked up on every board, and the WIP limit checked is that
+        of the board holding it.
+        """
+        # Lookup, WIP check and save under one exclusive lock, like transaction(),
+        # but a task already in the column isn't written back
+        with self._lock():
+            data = self.load()
+            if board_id is None:
+                board = data.locate_task(task_id)
+                if not board:
+                    raise TaskNotFoundError(f"Task #{task_id} not found")
+            else:
+                board = data.get_board(board_id)
+                if not board:
+                    raise BoardNotFoundError(f"Board '{board_id}' not found")
+            
+            task = board.get_task(task_id)
+            if not task:
+                raise TaskNotFoundError(f"Task #{task_id} not found")
+            
+            old_column = task.column_id
+            if old_column == column:
+                return task, old_column
+            
+            can_add, error_msg = board.can_add_to_column(column)
+            if not can_add:
+                raise ColumnError(error_msg)
+            
+            task.move_to(column, reason)
+            self.save(data)
+            return task, old_column
+    
+    def _search_key(self, board_id: Optional[str]) -> Any:
+        """Identifies the stored state of a board; taken before it's read (None if unknown)"""
+        try:
+            return self._cache_key()
+        except FileNotFoundError:
+            return None
+    
+    def _search_state(self, board_id: Optional[str]) -> tuple[Any, Any]:
+        """(search key of a board, position of the change log), taken together before the board is read"""
+        with self._lock(shared=True):
+            return plain_key(self._search_key(board_id)), self._change_log.position()
+    
+    def _search_changes(self, board_id: str, index: SearchIndex, key: Any, position: Any) -> Optional[Set[int]]:
+        """Ids of the board's tasks written since `index` was synced, or None if it needs a full sync"""
+        return self._change_log.changes(board_id, index.source_key, index.log_position, key, position)
+    
+    def search_tasks(
+        self,
+        query: str,
+        board_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> tuple[Board, List[tuple[Task, float]]]:
+        """Return a board (default if not specified) and its tasks matching `query`, best first
+        
+        The board's index is read from `search_dir` and, if the board
+        changed since it was written, updated for the tasks the change log
+        says were written since; a change the log can't account for (a
+        hand edit, say) re-syncs the whole board.
+        """
+        # Before loading: if the data changes in between, the next search notices
+        key, position = self._search_state(board_id)
+        data = self.load()
+        board = data.get_board(board_id)
+        if not board:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        
+        path = self.search_dir / f"{quote(board.id, safe='')}.idx"
+        index = self._search_indexes.get(board.id)
+        if index is None:
+            index = self._search_indexes[board.id] = SearchIndex.read(path)
+        if key is None or index.source_key != key:
+            task_ids = self._search_changes(board.id, index, key, position) if key is not None else None
+            if task_ids is None:
+                changed = index.sync(board.tasks)
+            elif board.has_task_store:
+                changed = index.update(task_ids, board.get_task)
+            else:
+                # Cheaper for a few ids than get_task(), whose first call indexes the whole board
+                found = {task.id: task for task in board.tasks if task.id in task_ids}
+                changed = index.update(task_ids, found.get)
+            if changed or key is not None:
+                index.source_key = key
+                index.log_position = position
+                index.write(path)
+            
+            # Indexes of deleted boards
+            live = {f"{quote(b.id, safe='')}.idx" for b in data.boards}
+            for stale in self.search_dir.glob("*.idx"):
+                if stale.name not in live:
+                    stale.unlink(missing_ok=True)
+        
+        results = []
+        for task_id, score in index.search(query, limit):
+            task = board.get_task(task_id)
+            if task:
+                results.append((task, score))
+        return board, results
+    
     def _create_default_data(self) -> KanbanData:
         """Create default Kanban data with initial board"""
         board = Board(
@@ -122,6 +986,22 @@ class KanbanStorage:
         self.save(data)
         return data
     
+    def import_json(self, json_path: str) -> KanbanData:
+        """One-time import of an existing data.json file, replacing this storage's contents"""
+        source = Path(json_path)
+        if not source.exists():
+            raise KanbanStorageError(f"No JSON data file at {source}")
+        return self.import_data(KanbanStorage(str(source)).load())
+    
+    def import_data(self, data: KanbanData) -> KanbanData:
+        """Replace this storage's contents with data loaded from another storage"""
+        for board in data.boards:
+            for task in board.tasks:
+                # Reassigning marks the whole history as unsaved, so it's copied into this storage
+                task.history = task.load_history()
+        self.save(data)
+        return data
+    
     def backup(self, backup_path: Optional[str] = None) -> str:
         """Create a backup of the current data file"""
         if backup_path is None:
@@ -130,5 +1010,116 @@ class KanbanStorage:
         else:
             target_path = Path(backup_path)
         
-        shutil.copy2(self.data_path, target_path)
+        # The backup must be self-contained, so fold pending journal records in first
+        self.compact()
+        with self._lock(shared=True):
+            shutil.copy2(self.data_path, target_path)
+            # Next to the copy, where a storage opened on the backup file looks for it
+            if self.history_dir.exists():
+                shutil.copytree(self.history_dir, target_path.with_name(target_path.name + '.history'))
         return str(target_path)
+    
+    @property
+    def backup_store(self) -> BackupStore:
+        """Chunk store for incremental backups, next to the data file"""
+        return BackupStore(self.data_path.with_name(self.data_path.name + '.backups'))
+    
+    def _backup_files(self) -> List[Path]:
+        """Files that make up the stored data (call with a lock held)"""
+        files = [self.data_path, self.data_path.with_suffix('.journal'), self.checksum_path, self._retention_path]
+        if self.history_dir.exists():
+            files.extend(sorted(self.history_dir.glob("*.log")))
+        return [path for path in files if path.is_file()]
+    
+    @contextmanager
+    def _backup_sources(self) -> Iterator[List[tuple[str, Path]]]:
+        """(name relative to the data directory, path to read) for a consistent view of the data"""
+        with self._lock(shared=True):
+            base = self.data_path.parent
+            yield [(str(path.relative_to(base)), path) for path in self._backup_files()]
+    
+    def incremental_backup(self) -> Dict[str, Any]:
+        """Back up only the chunks that changed since earlier backups; returns the manifest"""
+        with self._backup_sources() as files:
+            return self.backup_store.create(files)
+    
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """Manifests of the incremental backups, oldest first"""
+        return self.backup_store.list()
+    
+    def prune_backups(self, keep: int) -> tuple[List[str], int]:
+        """Keep the newest `keep` incremental backups; returns removed ids and deleted chunk count"""
+        return self.backup_store.prune(keep)
+    
+    def _get_backup(self, backup_id: str) -> Dict[str, Any]:
+        manifest = self.backup_store.get(backup_id)
+        if manifest is None:
+            raise KanbanStorageError(f"No backup '{backup_id}' (see `backup list`)")
+        return manifest
+    
+    def _restore_files(self, manifest: Dict[str, Any], current: List[str]) -> None:
+        try:
+            self.backup_store.restore(manifest, self.data_path.parent, current)
+        except (FileNotFoundError, ValueError, zlib.error) as e:
+            raise KanbanStorageError(f"Cannot restore backup {manifest['id']}: {e}")
+    
+    def restore_backup(self, backup_id: str) -> Dict[str, Any]:
+        """Replace the data files with an incremental backup; returns its manifest"""
+        manifest = self._get_backup(backup_id)
+        with self._lock():
+            base = self.data_path.parent
+            self._restore_files(manifest, [str(path.relative_to(base)) for path in self._backup_files()])
+            self._forget_loaded()
+        return manifest
+    
+    def _forget_loaded(self) -> None:
+        """Drop state tied to previously loaded data (after the files were replaced)"""
+        self.invalidate_cache()
+        self._base = None
+        self._search_bases = {}
+
+
+BACKENDS = ("json", "sqlite", "sharded")
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+SHARDED_SUFFIX = ".d"
+
+
+def open_storage(
+    data_path: Optional[str] = None,
+    backend: Optional[str] = None,
+    journal: bool = False,
+    cache: bool = False,
+    codec: Optional[str] = None,
+    columnar: bool = False,
+    strict: bool = False
+) -> KanbanStorage:
+    """Create the storage backend for a data path
+    
+    The backend is inferred from the path unless given explicitly: `.db`,
+    `.sqlite` and `.sqlite3` files select SQLite, and a directory or a `.d`
+    path selects the sharded (one file per board) layout. Without an
+    explicit codec, a `.kbin` path is written as a binary snapshot and
+    anything else as pretty JSON. `columnar` (JSON backend only) keeps
+    loaded tasks in TaskStores. `strict` validates every load, even of
+    files whose checksum says they're unchanged since they were saved.
+    """
+    if codec is None:
+        codec = "binary" if data_path and Path(data_path).suffix == BINARY_SUFFIX else "pretty"
+    if backend is None:
+        backend = "json"
+        if data_path:
+            path = Path(data_path)
+            if path.suffix.lower() in SQLITE_SUFFIXES:
+                backend = "sqlite"
+            elif path.suffix == SHARDED_SUFFIX or path.is_dir():
+                backend = "sharded"
+    
+    if backend == "sqlite":
+        from sqlite_storage import SQLiteKanbanStorage
+        return SQLiteKanbanStorage(data_path)
+    if backend == "sharded":
+        from sharded_storage import ShardedKanbanStorage
+        return ShardedKanbanStorage(data_path, codec=codec, strict=strict)
+    if backend == "json":
+        return KanbanStorage(data_path, journal=journal, cache=cache, codec=codec, columnar=columnar, strict=strict)
+    raise KanbanStorageError(f"Unknown storage backend '{backend}' (expected one of: {', '.join(BACKENDS)})")
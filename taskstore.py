@@ -0,0 +1,307 @@
+"""
+Columnar task storage for Kanban boards - parallel arrays instead of one model per task
+
+A TaskStore keeps a board's tasks as typed arrays (ids, column and
+priority codes, epoch-microsecond timestamps, interned tag ids) plus
+plain string lists, which takes a fraction of the memory of Task models
+and lets filters and counts run without building any. Board uses it for
+tasks loaded from disk and materializes Task models only for the rows a
+caller actually touches.
+"""
+
+import json
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from models import KanbanData, Board, Column, Task, Priority
+
+
+PRIORITIES = tuple(Priority)
+PRIORITY_CODES: Dict[Any, int] = {p: i for i, p in enumerate(PRIORITIES)}
+PRIORITY_CODES.update({p.value: i for i, p in enumerate(PRIORITIES)})
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_micros(value: datetime) -> int:
+    """Epoch microseconds; naive datetimes are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_micros(micros: int) -> datetime:
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def parse_micros(value: str) -> int:
+    """Epoch microseconds of an ISO 8601 timestamp as written by the JSON codecs"""
+    if not isinstance(value, str):
+        raise TypeError(f"Expected a timestamp string, got {type(value).__name__}")
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return to_micros(datetime.fromisoformat(value))
+
+
+def private_defaults(cls: type) -> Dict[str, Any]:
+    # get_default() doesn't call a default_factory, so mutable defaults are made here
+    return {
+        name: attr.default_factory() if attr.default_factory is not None else attr.get_default()
+        for name, attr in cls.__private_attributes__.items()
+    }
+
+
+def construct_model(cls: type, values: Dict[str, Any], private: Dict[str, Any]) -> Any:
+    """Build a model from already-typed values, skipping validation (and model_construct's overhead)"""
+    obj = cls.__new__(cls)
+    object.__setattr__(obj, '__dict__', values)
+    object.__setattr__(obj, '__pydantic_fields_set__', set(values))
+    object.__setattr__(obj, '__pydantic_extra__', None)
+    object.__setattr__(obj, '__pydantic_private__', dict(private))
+    return obj
+
+
+class TaskStore:
+    """One board's tasks as parallel arrays, one row per task in board order"""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.column_codes = array('H')  # index into column_ids
+        self.column_counts = array('I')  # rows per column code, kept current by append/update
+        self.priority_codes = array('B')  # index into PRIORITIES
+        self.created = array('q')  # epoch microseconds
+        self.updated = array('q')
+        # Each row's tags are tag_codes[tag_start:tag_start + tag_count], indexes into tag_names
+        self.tag_start = array('I')
+        self.tag_count = array('H')
+        self.tag_codes = array('I')
+        self.titles: List[str] = []
+        self.descriptions: List[Optional[str]] = []
+        self.contexts: List[Optional[str]] = []  # agent_context as JSON text, None when empty
+        self.board_ids: List[str] = []
+        self.column_ids: List[str] = []
+        self.tag_names: List[str] = []
+        self._column_lookup: Dict[str, int] = {}
+        self._tag_lookup: Dict[str, int] = {}
+        self._rows: Optional[Dict[int, int]] = None  # task id -> row, built on first lookup
+        self._private = private_defaults(Task)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _column_code(self, column_id: str) -> int:
+        code = self._column_lookup.get(column_id)
+        if code is None:
+            code = self._column_lookup[column_id] = len(self.column_ids)
+            self.column_ids.append(column_id)
+            self.column_counts.append(0)
+        return code
+
+    def _tag_code(self, tag: str) -> int:
+        code = self._tag_lookup.get(tag)
+        if code is None:
+            code = self._tag_lookup[tag] = len(self.tag_names)
+            self.tag_names.append(tag)
+        return code
+
+    def append(
+        self,
+        task_id: int,
+        board_id: str,
+        column_id: str,
+        title: str,
+        description: Optional[str],
+        priority: Any,
+        created: int,
+        updated: int,
+        tags: Iterable[str],
+        context: Optional[str]
+    ) -> None:
+        """Add a row; timestamps in epoch microseconds, `context` as JSON text (None if empty)"""
+        self.ids.append(task_id)
+        code = self._column_code(column_id)
+        self.column_codes.append(code)
+        self.column_counts[code] += 1
+        self.priority_codes.append(PRIORITY_CODES[priority])
+        self.created.append(created)
+        self.updated.append(updated)
+        self.tag_start.append(len(self.tag_codes))
+        count = 0
+        for tag in tags:
+            self.tag_codes.append(self._tag_code(tag))
+            count += 1
+        self.tag_count.append(count)
+        self.titles.append(title)
+        self.descriptions.append(description)
+        self.contexts.append(context)
+        self.board_ids.append(board_id)
+        if self._rows is not None:
+            self._rows.setdefault(task_id, len(self.ids) - 1)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "TaskStore":
+        """Build a store from task dicts as written by the JSON codecs
+
+        Raises ValueError, KeyError or TypeError on anything the Task model
+        would have to coerce or reject, and on inline history (which needs
+        the model path to be migrated), so the caller can fall back to
+        validating the data.
+        """
+        store = cls()
+        for row in rows:
+            if row.get("history"):
+                raise ValueError("Inline task history")
+            task_id = row["id"]
+            title = row["title"]
+            description = row.get("description")
+            tags = row.get("tags", [])
+            context = row.get("agent_context") or None
+            board_id = row.get("board_id", "main")
+            column_id = row["column_id"]
+            priority = row.get("priority", "medium")
+            if (type(task_id) is not int or not isinstance(title, str) or not 1 <= len(title) <= 200
+                    or not (description is None or isinstance(description, str))
+                    or not isinstance(tags, list) or not all(isinstance(t, str) for t in tags)
+                    or not (context is None or isinstance(context, dict))
+                    or not isinstance(board_id, str) or not isinstance(column_id, str)
+                    or not isinstance(priority, str) or priority not in PRIORITY_CODES):
+                raise TypeError(f"Task {task_id!r} needs validation")
+            store.append(
+                task_id, board_id, column_id, title, description,
+                priority,
+                parse_micros(row["created_at"]), parse_micros(row["updated_at"]),
+                tags, json.dumps(context, ensure_ascii=False) if context else None
+            )
+        return store
+
+    def row_of(self, task_id: int) -> Optional[int]:
+        """Row of a task id (the first, if duplicated)"""
+        if self._rows is None:
+            rows: Dict[int, int] = {}
+            for row, value in enumerate(self.ids):
+                rows.setdefault(value, row)
+            self._rows = rows
+        return self._rows.get(task_id)
+
+    def _tags_of(self, row: int) -> List[str]:
+        start = self.tag_start[row]
+        names = self.tag_names
+        return [names[code] for code in self.tag_codes[start:start + self.tag_count[row]]]
+
+    def rows(
+        self,
+        task_id: Optional[int] = None,
+        column: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        tags: Iterable[str] = ()
+    ) -> List[int]:
+        """Rows matching all given filters, in board order, found by scanning the arrays"""
+        candidates: Optional[List[int]] = None
+        if task_id is not None:
+            row = self.row_of(task_id)
+            candidates = [] if row is None else [row]
+        if column:
+            code = self._column_lookup.get(column)
+            if code is None:
+                return []
+            codes = self.column_codes
+            if candidates is None:
+                candidates = [row for row, value in enumerate(codes) if value == code]
+            else:
+                candidates = [row for row in candidates if codes[row] == code]
+        if priority is not None:
+            code = PRIORITY_CODES[priority]
+            codes = self.priority_codes
+            if candidates is None:
+                candidates = [row for row, value in enumerate(codes) if value == code]
+            else:
+                candidates = [row for row in candidates if codes[row] == code]
+        for tag in tags:
+            code = self._tag_lookup.get(tag)
+            if code is None:
+                return []
+            if candidates is None:
+                candidates = range(len(self.ids))
+            tag_codes, starts, counts = self.tag_codes, self.tag_start, self.tag_count
+            candidates = [
+                row for row in candidates
+                if code in tag_codes[starts[row]:starts[row] + counts[row]]
+            ]
+        return list(range(len(self.ids))) if candidates is None else candidates
+
+    def column_count(self, column_id: str) -> int:
+        """Number of rows in a column"""
+        code = self._column_lookup.get(column_id)
+        return 0 if code is None else self.column_counts[code]
+
+    def tags_in_use(self) -> List[str]:
+        """Tags of at least one row, sorted"""
+        used = set()
+        for start, count in zip(self.tag_start, self.tag_count):
+            used.update(self.tag_codes[start:start + count])
+        return sorted(self.tag_names[code] for code in used)
+
+    def update(self, row: int, field: str, value: Any) -> None:
+        """Mirror a change to an indexed field (column_id, priority or tags) of a materialized row"""
+        if field == "column_id":
+            code = self._column_code(value)
+            self.column_counts[self.column_codes[row]] -= 1
+            self.column_counts[code] += 1
+            self.column_codes[row] = code
+        elif field == "priority":
+            self.priority_codes[row] = PRIORITY_CODES[value]
+        elif field == "tags":
+            # The old span stays behind unused; it's only memory
+            self.tag_start[row] = len(self.tag_codes)
+            self.tag_codes.extend(self._tag_code(tag) for tag in value)
+            self.tag_count[row] = len(value)
+
+    def task(self, row: int) -> Task:
+        """Materialize one row as a Task model"""
+        context = self.contexts[row]
+        return construct_model(Task, {
+            "id": self.ids[row],
+            "board_id": self.board_ids[row],
+            "column_id": self.column_ids[self.column_codes[row]],
+            "title": self.titles[row],
+            "description": self.descriptions[row],
+            "priority": PRIORITIES[self.priority_codes[row]],
+            "tags": self._tags_of(row),
+            "created_at": from_micros(self.created[row]),
+            "updated_at": from_micros(self.updated[row]),
+            "agent_context": json.loads(context) if context is not None else {},
+            "history": [],
+        }, self._private)
+
+
+def columnar_data(payload: Dict[str, Any]) -> KanbanData:
+    """KanbanData whose boards keep their tasks in TaskStores, from a decoded JSON payload
+
+    Raises like TaskStore.from_rows when the payload needs validation,
+    including root or board fields of a type the models would coerce.
+    """
+    version = payload.get("version", "1.0")
+    default_board = payload.get("default_board", "main")
+    next_task_id = payload.get("next_task_id", 1)
+    if (not isinstance(version, str) or not isinstance(default_board, str)
+            or type(next_task_id) is not int or not isinstance(payload["boards"], list)):
+        raise TypeError("Data needs validation")
+    boards = []
+    for board in payload["boards"]:
+        if not isinstance(board, dict) or not isinstance(board["id"], str) or not isinstance(board["name"], str):
+            raise TypeError("Board needs validation")
+        boards.append(Board.with_store(
+            TaskStore.from_rows(board.get("tasks", [])),
+            id=board["id"],
+            name=board["name"],
+            columns=[Column.model_validate(col) for col in board.get("columns", [])],
+            created_at=from_micros(parse_micros(board["created_at"])),
+            updated_at=from_micros(parse_micros(board["updated_at"])),
+        ))
+    return KanbanData.model_construct(
+        version=version,
+        boards=boards,
+        default_board=default_board,
+        next_task_id=next_task_id
+    )
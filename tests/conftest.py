@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from models import KanbanData, Board, Task, DEFAULT_COLUMNS
+
+
+def make_data(tasks_per_board=3, board_ids=("main",)) -> KanbanData:
+    """Boards with the default columns and `tasks_per_board` todo tasks each, ids counting up across boards"""
+    boards = []
+    task_id = 1
+    for board_id in board_ids:
+        board = Board(id=board_id, name=board_id.title(), columns=[col.model_copy() for col in DEFAULT_COLUMNS])
+        for _ in range(tasks_per_board):
+            board.add_task(Task(id=task_id, board_id=board_id, column_id="todo", title=f"Task {task_id}"))
+            task_id += 1
+        boards.append(board)
+    return KanbanData(boards=boards, default_board=board_ids[0], next_task_id=task_id)
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch, tmp_path):
+    """No daemon and no KANBAN_* settings from the environment running the tests"""
+    for name in ("KANBAN_BACKEND", "KANBAN_JOURNAL", "KANBAN_STRICT", "KANBAN_COLUMNAR", "KANBAN_CODEC"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("KANBAN_NO_DAEMON", "1")
+    monkeypatch.setenv("KANBAN_DATA_PATH", str(tmp_path / "data.json"))
+    monkeypatch.setenv("HOME", str(tmp_path))
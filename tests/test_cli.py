@@ -0,0 +1,83 @@
+import json
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+import kanban
+import queries
+from conftest import make_data
+from storage import KanbanStorage
+
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    storage = KanbanStorage(str(path))
+    storage.save(make_data(board_ids=("main", "other")))
+    storage.move_task(2, "inprogress", reason="started")
+    monkeypatch.setattr(kanban, "_storage", None)
+    return path
+
+
+def cli(*argv):
+    kanban._storage = None
+    result = CliRunner().invoke(kanban.app, list(argv))
+    return result.exit_code, result.stdout
+
+
+def fast_path(capsys, *argv):
+    exit_code = queries.run_json_command(list(argv))
+    assert exit_code is not None, f"fast path declined {argv}"
+    return exit_code, capsys.readouterr().out
+
+
+@pytest.mark.parametrize("name", sorted(queries.JSON_COMMANDS))
+def test_fast_path_options_match_typer_commands(name):
+    command = typer.main.get_command(kanban.app).commands[name]
+    arguments = [p.name for p in command.params if p.param_type_name == "argument"]
+    options = {
+        flag: p.name for p in command.params if p.param_type_name == "option"
+        for flag in p.opts + p.secondary_opts if flag != "--help"
+    }
+    expected = queries.json_command_options(name)
+    expected.update(dict.fromkeys(queries.JSON_FLAGS, "json_output"))
+    if name in queries.NDJSON_COMMANDS:
+        expected[queries.NDJSON_FLAG] = "ndjson"
+    if name in queries.HISTORY_COMMANDS:
+        expected[queries.NO_HISTORY_FLAG] = "no_history"
+
+    assert arguments == queries.JSON_COMMANDS[name][1]
+    assert options == expected
+
+
+@pytest.mark.parametrize("argv", [
+    ["show", "--json"],
+    ["show", "--json", "-b", "other", "--sort", "-id", "-n", "1"],
+    ["show", "--ndjson", "--no-history"],
+    ["list-tasks", "--json", "-c", "todo", "--priority", "medium"],
+    ["list-tasks", "--ndjson", "--limit=2", "--sort", "title"],
+    ["search", "task", "--json", "-n", "2"],
+    ["info", "2", "--json"],
+    ["list-boards", "--json", "--no-history"],
+])
+def test_fast_path_output_matches_cli(data_path, capsys, argv):
+    assert fast_path(capsys, *argv) == cli(*argv)
+
+
+@pytest.mark.parametrize("argv", [
+    ["info", "999", "--json"],
+    ["show", "--json", "--board", "missing"],
+    ["search", "task", "--json", "-b", "missing"],
+])
+def test_fast_path_reports_errors_like_cli(data_path, capsys, argv):
+    exit_code, output = fast_path(capsys, *argv)
+    assert exit_code == 1
+    assert output.startswith("Error: ") and "\n" == output[-1] and output.count("\n") == 1
+    assert (exit_code, output) == cli(*argv)
+
+
+def test_status_json_fast_path(data_path, capsys):
+    exit_code, output = fast_path(capsys, "status", "--json")
+    assert exit_code == 0
+    assert json.loads(output)["total_tasks"] == 6
@@ -0,0 +1,78 @@
+from conftest import make_data
+from models import Board, Task, DATA_NO_HISTORY, DEFAULT_COLUMNS
+from storage import KanbanStorage
+
+
+def state(data):
+    return data.model_dump(mode="json", exclude=DATA_NO_HISTORY)
+
+
+def edit(data):
+    """One save's worth of every kind of change the journal records"""
+    board = data.get_board()
+    board.name = "Renamed"
+    board.get_task(1).move_to("inprogress", "started")
+    board.get_task(2).tags = ["api"]
+    board.remove_task(3)
+    board.add_task(Task(id=data.allocate_task_id(), board_id="main", column_id="todo", title="New"))
+    data.boards.append(Board(id="ops", name="Ops", columns=[c.model_copy() for c in DEFAULT_COLUMNS]))
+
+
+def test_saves_append_to_journal_and_replay(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = KanbanStorage(path, journal=True)
+    storage.save(make_data())
+    snapshot = (tmp_path / "data.json").read_bytes()
+
+    data = storage.load()
+    edit(data)
+    storage.save(data)
+
+    assert storage.journal_size() > 0
+    assert (tmp_path / "data.json").read_bytes() == snapshot
+    replayed = KanbanStorage(path, journal=True).load()
+    assert state(replayed) == state(data)
+    assert replayed.get_board().get_task(1).load_history()[-1]["to_column"] == "inprogress"
+
+
+def test_compact_folds_journal_into_snapshot(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = KanbanStorage(path, journal=True)
+    storage.save(make_data())
+    data = storage.load()
+    edit(data)
+    storage.save(data)
+
+    storage.compact()
+    assert storage.journal_size() == 0
+    # The snapshot alone now holds the data, as a storage without the journal reads it
+    assert state(KanbanStorage(path).load()) == state(data)
+    assert state(KanbanStorage(path, journal=True).load()) == state(data)
+
+
+def test_torn_trailing_record_is_skipped(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = KanbanStorage(path, journal=True)
+    storage.save(make_data())
+    data = storage.load()
+    data.get_board().get_task(1).title = "Saved"
+    storage.save(data)
+    expected = state(data)
+
+    with open(storage.journal_path, "a") as f:
+        f.write('{"ts": "2026-01-01T00:00:00+00:00", "ops": [{"op": "del')
+    assert state(KanbanStorage(path, journal=True).load()) == expected
+
+
+def test_journal_compacts_in_background_past_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(KanbanStorage, "JOURNAL_COMPACT_BYTES", 1)
+    path = str(tmp_path / "data.json")
+    storage = KanbanStorage(path, journal=True)
+    storage.save(make_data())
+    data = storage.load()
+    data.get_board().get_task(1).title = "Compacted"
+    storage.save(data)
+
+    storage._compactor.join(timeout=10)
+    assert storage.journal_size() == 0
+    assert KanbanStorage(path).load().get_board().get_task(1).title == "Compacted"
@@ -0,0 +1,92 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from conftest import make_data
+from models import Task
+from storage import KanbanStorage, KanbanStorageLocked
+
+WORKERS = 4
+TASKS_PER_WORKER = 10
+
+
+def add_tasks(path, worker):
+    storage = KanbanStorage(path)
+    for n in range(TASKS_PER_WORKER):
+        with storage.transaction() as data:
+            task_id = data.allocate_task_id()
+            data.get_board().add_task(Task(id=task_id, board_id="main", column_id="todo", title=f"{worker}-{n}"))
+
+
+def run_workers(target, *args):
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=target, args=(*args, worker)) for worker in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    assert [worker.exitcode for worker in workers] == [0] * WORKERS
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_concurrent_transactions_lose_no_updates(tmp_path, journal):
+    path = str(tmp_path / "data.json")
+    KanbanStorage(path, journal=journal).save(make_data(tasks_per_board=0))
+
+    run_workers(add_tasks, path)
+
+    data = KanbanStorage(path, journal=journal).load()
+    ids = [task.id for task in data.get_board().tasks]
+    assert sorted(ids) == list(range(1, WORKERS * TASKS_PER_WORKER + 1))
+    assert data.next_task_id == WORKERS * TASKS_PER_WORKER + 1
+
+
+def test_transaction_discards_changes_when_block_raises(tmp_path):
+    storage = KanbanStorage(str(tmp_path / "data.json"), cache=True)
+    storage.save(make_data())
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction() as data:
+            data.get_board().get_task(1).title = "Not saved"
+            raise RuntimeError("abort")
+    assert storage.load().get_board().get_task(1).title == "Task 1"
+
+
+def test_lock_wait_times_out(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.json")
+    holder = KanbanStorage(path)
+    holder.save(make_data())
+    waiter = KanbanStorage(path)
+    monkeypatch.setattr(waiter, "LOCK_TIMEOUT", 0.2)
+
+    with holder.transaction():
+        with pytest.raises(KanbanStorageLocked):
+            waiter.load()
+    assert waiter.load().get_board().get_task(1).title == "Task 1"
+
+
+def test_readers_share_the_lock_and_queue_behind_a_waiting_writer(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.json")
+    reader = KanbanStorage(path)
+    reader.save(make_data())
+    other_reader = KanbanStorage(path)
+    monkeypatch.setattr(other_reader, "LOCK_TIMEOUT", 0.2)
+    writer = KanbanStorage(path)
+
+    with reader._lock(shared=True):
+        assert other_reader.load().get_board().get_task(1).title == "Task 1"
+
+        # The writer waits for the reader, holding the gate so no new reader gets in ahead of it
+        saved = threading.Event()
+        thread = threading.Thread(target=lambda: (writer.move_task(1, "done"), saved.set()))
+        thread.start()
+        time.sleep(0.1)
+        with pytest.raises(KanbanStorageLocked):
+            other_reader.load()
+        assert not saved.is_set()
+
+    thread.join(timeout=10)
+    assert saved.is_set()
+    assert other_reader.load().get_board().get_task(1).column_id == "done"
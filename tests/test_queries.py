@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+import queries
+from conftest import make_data
+from storage import KanbanStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = KanbanStorage(str(tmp_path / "data.json"))
+    storage.save(make_data())
+    storage.move_task(2, "inprogress", reason="started")
+    return KanbanStorage(str(tmp_path / "data.json"))
+
+
+def moved_history(task):
+    return [entry["to_column"] for entry in task["history"] if entry["action"] == "moved"]
+
+
+def test_json_output_includes_history(storage):
+    show = queries.show_output(storage)
+    assert moved_history(show["tasks_by_column"]["inprogress"][0]) == ["inprogress"]
+    assert moved_history(show["board"]["tasks"][1]) == ["inprogress"]
+
+    by_id = {t["id"]: t for t in queries.list_tasks_output(storage)}
+    assert moved_history(by_id[2]) == ["inprogress"]
+    assert by_id[1]["history"] == []
+
+    assert moved_history(queries.search_output(storage, "task 2")[0]) == ["inprogress"]
+    assert moved_history(queries.list_boards_output(storage)["boards"][0]["tasks"][1]) == ["inprogress"]
+
+
+def test_ndjson_output_includes_history(storage):
+    lines = [json.loads(line) for line in queries.list_tasks_lines(storage)]
+    assert moved_history({t["id"]: t for t in lines}[2]) == ["inprogress"]
+    lines = [json.loads(line) for line in queries.show_lines(storage)]
+    assert "board" in lines[0]
+    assert moved_history({t["id"]: t for t in lines[1:]}[2]) == ["inprogress"]
+
+
+def test_no_history_leaves_it_out(storage):
+    assert all("history" not in t for t in queries.list_tasks_output(storage, history=False))
+    assert all("history" not in json.loads(line) for line in queries.list_tasks_lines(storage, history=False))
+    show = queries.show_output(storage, history=False)
+    assert all("history" not in t for t in show["board"]["tasks"])
+    assert all("history" not in t for t in queries.search_output(storage, "task", history=False))
+
+
+def test_fast_path_parses_no_history():
+    _, kwargs, _ = queries.parse_json_command(["list-tasks", "--json", "--no-history"])
+    assert kwargs == {"history": False}
+    assert queries.parse_json_command(["info", "1", "--json", "--no-history"]) is None
+
+
+def test_columnar_streams_include_history(storage):
+    columnar = KanbanStorage(str(storage.data_path), columnar=True)
+    board = columnar.load().get_board()
+    assert board.has_task_store
+    lines = [json.loads(line) for line in queries.list_tasks_lines(columnar)]
+    assert moved_history({t["id"]: t for t in lines}[2]) == ["inprogress"]
+    assert board.has_task_store
@@ -0,0 +1,33 @@
+from conftest import make_data
+from models import Task
+from sharded_storage import ShardedKanbanStorage
+
+
+def test_lazy_board_saved_since_load_pairs_with_current_manifest(tmp_path):
+    path = str(tmp_path / "data.d")
+    ShardedKanbanStorage(path).save(make_data(board_ids=("main", "ops")))
+    reader = ShardedKanbanStorage(path)
+    data = reader.load()
+
+    # Another process saves before the reader first touches the board
+    writer = ShardedKanbanStorage(path)
+    with writer.transaction() as current:
+        board = current.get_board("ops")
+        board.name = "Operations"
+        board.add_task(Task(id=current.allocate_task_id(), board_id="ops", column_id="todo", title="Late"))
+
+    board = data.get_board("ops")
+    assert [task.id for task in board.tasks] == [4, 5, 6, 7]
+    assert board.name == "Operations"
+    assert data.allocate_task_id() == 8
+
+
+def test_hand_edited_shard_loads_validated(tmp_path):
+    path = tmp_path / "data.d"
+    ShardedKanbanStorage(str(path)).save(make_data())
+    shard = path / "boards" / "main.json"
+    shard.write_text(shard.read_text().replace('"Task 2"', '"Edited by hand"'))
+
+    data = ShardedKanbanStorage(str(path)).load()
+    assert data.get_board().get_task(2).title == "Edited by hand"
+    assert data.next_task_id == 4
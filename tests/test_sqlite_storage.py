@@ -0,0 +1,43 @@
+from conftest import make_data
+from models import Task
+from sqlite_storage import SQLiteKanbanStorage
+
+
+def test_initializes_base_state(tmp_path):
+    storage = SQLiteKanbanStorage(str(tmp_path / "data.db"))
+    storage.save(make_data())
+    # The base class's lock and bookkeeping, for inherited code
+    with storage._lock():
+        assert storage.load().get_board().get_task(1).title == "Task 1"
+
+    with storage.transaction() as data:
+        data.get_board().get_task(1).title = "Renamed"
+    board, results = storage.search_tasks("renamed")
+    assert [task.id for task, _ in results] == [1]
+    assert storage.cache_stats() == {"hits": 0, "misses": 0}
+    assert storage.incremental_backup()["id"] in [b["id"] for b in storage.list_backups()]
+
+
+def test_load_reads_one_snapshot(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.db")
+    storage = SQLiteKanbanStorage(path)
+    storage.save(make_data())
+    writer = SQLiteKanbanStorage(path)
+
+    board_rows = storage._board_rows
+
+    def write_between_queries(*args):
+        # Another process adds a task after the boards are read but before the tasks are
+        rows = board_rows(*args)
+        with writer.transaction() as data:
+            task_id = data.allocate_task_id()
+            data.get_board().add_task(Task(id=task_id, board_id="main", column_id="todo", title="Late"))
+        return rows
+
+    monkeypatch.setattr(storage, "_board_rows", write_between_queries)
+    data = storage.load()
+    assert [task.id for task in data.get_board().tasks] == [1, 2, 3]
+    assert data.next_task_id == 4
+
+    monkeypatch.undo()
+    assert [task.id for task in storage.load().get_board().tasks] == [1, 2, 3, 4]
@@ -0,0 +1,70 @@
+import pytest
+
+import client
+from conftest import make_data
+from models import Priority
+from storage import CODECS, KanbanStorage
+
+
+def saved(tmp_path, codec, name="data.json"):
+    """Path of a data file written with `codec`, with tags, a priority and a move to round-trip"""
+    path = str(tmp_path / name)
+    data = make_data()
+    task = data.get_board().get_task(1)
+    task.tags = ["api", "urgent"]
+    task.priority = Priority.HIGH
+    task.description = "Line one\nline two"
+    KanbanStorage(path, codec=codec).save(data)
+    KanbanStorage(path, codec=codec).move_task(3, "done", reason="shipped")
+    return path
+
+
+def dump(data):
+    for board in data.boards:
+        for task in board.tasks:
+            task.load_history()
+    return data.model_dump(mode="json")
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_trusted_and_columnar_loads_match_validated(tmp_path, codec):
+    path = saved(tmp_path, codec)
+    validated = dump(KanbanStorage(path, codec=codec, strict=True).load())
+    assert dump(KanbanStorage(path, codec=codec).load()) == validated
+
+    columnar = KanbanStorage(path, codec=codec, columnar=True).load()
+    assert columnar.get_board().has_task_store
+    assert dump(columnar) == validated
+
+
+def test_columnar_save_round_trips(tmp_path):
+    path = saved(tmp_path, "compact")
+    storage = KanbanStorage(path, codec="compact", columnar=True)
+    data = storage.load()
+    data.get_board().get_task(1).title = "Renamed"
+    storage.save(data)
+
+    reloaded = KanbanStorage(path, codec="compact", strict=True).load().get_board()
+    assert reloaded.get_task(1).title == "Renamed"
+    assert reloaded.get_task(1).tags == ["api", "urgent"]
+    assert reloaded.get_task(3).column_id == "done"
+
+
+def test_edited_file_loads_validated(tmp_path):
+    path = saved(tmp_path, "pretty")
+    with open(path) as f:
+        text = f.read()
+    with open(path, "w") as f:
+        f.write(text.replace('"Task 2"', '"Edited by hand"'))
+
+    storage = KanbanStorage(path, columnar=True)
+    assert storage.trusted_load_report()["trusted"] is False
+    board = storage.load().get_board()
+    assert not board.has_task_store
+    assert board.get_task(2).title == "Edited by hand"
+
+
+def test_columnar_is_opt_in(monkeypatch):
+    assert client.storage_settings()["columnar"] is False
+    monkeypatch.setenv("KANBAN_COLUMNAR", "1")
+    assert client.storage_settings()["columnar"] is True
@@ -0,0 +1,80 @@
+import json
+
+from conftest import make_data
+from models import Task
+from storage import KanbanStorage
+from versions import VersionCache
+
+
+def cache_for(tmp_path, data=None):
+    storage = KanbanStorage(str(tmp_path / "data.json"))
+    storage.save(data or make_data(board_ids=("main", "other")))
+    return storage, VersionCache(storage)
+
+
+def test_draft_remove_add_commit(tmp_path):
+    storage, cache = cache_for(tmp_path)
+    base = cache.current()
+    draft = base.edit()
+    removed = draft.board("other").remove_task(4)
+    draft.board("main").add_task(Task(id=draft.data.allocate_task_id(), board_id="main", column_id="todo", title="New"))
+    version = cache.commit(draft)
+
+    assert version.number == base.number + 1
+    assert removed is not None
+    saved = KanbanStorage(str(tmp_path / "data.json")).load()
+    assert [t.id for t in saved.get_board("other").tasks] == [5, 6]
+    assert [t.title for t in saved.get_board("main").tasks][-1] == "New"
+    # The version the draft started from is as it was
+    assert [t.id for t in base.data.get_board("other").tasks] == [4, 5, 6]
+    assert base.data.get_board("main").task_count == 3
+
+
+def test_draft_task_edit_forks_task(tmp_path):
+    storage, cache = cache_for(tmp_path)
+    base = cache.current()
+    draft = base.edit()
+    draft.task(2).title = "Renamed"
+    version = cache.commit(draft)
+
+    assert base.data.get_task(2).title == "Task 2"
+    assert KanbanStorage(str(tmp_path / "data.json")).load().get_task(2).title == "Renamed"
+    # Untouched boards are shared, not copied
+    assert version.data.get_board("other") is base.data.get_board("other")
+
+
+def test_commit_leaves_shared_objects_untouched(tmp_path):
+    storage, cache = cache_for(tmp_path)
+    base = cache.current()
+    old_board = base.data.get_board("other")
+    old_task = old_board.get_task(4)
+
+    draft = base.edit()
+    draft.board("other").remove_task(4)
+    cache.commit(draft)
+
+    # Still the old board's task, and the old board still finds it
+    assert old_task.__pydantic_private__["_board"] is old_board
+    assert old_board.get_task(4) is old_task
+    assert old_board.changed_task_ids() == set()
+
+
+def test_commit_forks_tasks_whose_history_it_migrates(tmp_path):
+    raw = make_data(board_ids=("main", "other")).model_dump(mode="json")
+    raw["boards"][0]["tasks"][0]["history"] = [{"action": "created", "timestamp": "2024-01-01T00:00:00+00:00"}]
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(raw))
+    cache = VersionCache(KanbanStorage(str(path)))
+    base = cache.current()
+    old_task = base.data.get_task(1)
+    assert old_task.unlogged_history()[1]
+
+    draft = base.edit()
+    draft.task(5).title = "Changed"
+    version = cache.commit(draft)
+
+    # Saving migrated the inline history to the log, on the draft's own copy
+    assert version.data.get_task(1) is not old_task
+    assert not version.data.get_task(1).unlogged_history()[1]
+    assert old_task.unlogged_history()[1]
+    assert KanbanStorage(str(path)).load().get_task(1).history[0]["action"] == "created"
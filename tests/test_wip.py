@@ -0,0 +1,63 @@
+import multiprocessing
+
+import pytest
+
+from conftest import make_data
+from models import ColumnError, Task
+from storage import open_storage
+
+WORKERS = 6
+
+
+def move_in(path, outcomes, worker):
+    try:
+        open_storage(path).move_task(worker + 1, "inprogress")
+        outcomes.put("moved")
+    except ColumnError:
+        outcomes.put("refused")
+
+
+@pytest.mark.parametrize("name", ["data.json", "data.db", "data.d"])
+def test_concurrent_moves_respect_wip_limit(tmp_path, name):
+    path = str(tmp_path / name)
+    open_storage(path).save(make_data(tasks_per_board=WORKERS))
+
+    ctx = multiprocessing.get_context("fork")
+    outcomes = ctx.Queue()
+    workers = [ctx.Process(target=move_in, args=(path, outcomes, worker)) for worker in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    results = sorted(outcomes.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert results == ["moved"] * 3 + ["refused"] * 3
+    assert open_storage(path).load().get_board().column_task_count("inprogress") == 3
+
+
+def test_column_counts_follow_adds_moves_and_removals():
+    board = make_data(tasks_per_board=4).get_board()
+    board.get_task(1).move_to("inprogress")
+    board.get_task(2).move_to("inprogress")
+    board.get_task(2).column_id = "done"
+    board.remove_task(3)
+    board.add_task(Task(id=5, board_id="main", column_id="inprogress", title="New"))
+
+    for column in board.columns:
+        expected = sum(1 for task in board.tasks if task.column_id == column.id)
+        assert board.column_task_count(column.id) == expected
+    assert board.can_add_to_column("inprogress") == (True, None)
+
+
+def test_batch_moves_are_admitted_as_a_whole():
+    board = make_data(tasks_per_board=5).get_board()
+    board.move_tasks({1: "inprogress", 2: "inprogress", 3: "inprogress"})
+
+    # Moving one out makes room for the one moved in
+    moved = board.move_tasks({1: "done", 4: "inprogress"})
+    assert [task.id for task in moved] == [1, 4]
+
+    with pytest.raises(ColumnError, match="In Progress"):
+        board.move_tasks({5: "inprogress"})
+    assert board.get_task(5).column_id == "todo"
+    assert board.column_task_count("inprogress") == 3
@@ -0,0 +1,140 @@
+"""
+Immutable versions of Kanban data - shared by every reader, edited copy-on-write
+
+A DataVersion is loaded data that nobody changes in place, so any number
+of readers (GUI sessions and reruns) can hold the same objects without
+copying them. To change it, take a Draft: the draft's data starts as a
+shallow copy, and a board or task is copied only when the draft is about
+to change it. Committing the draft yields the next version, which shares
+every untouched board and task with the previous one.
+"""
+
+import threading
+from typing import Dict, List, Optional, Set
+
+from models import KanbanData, Board, Task, BoardNotFoundError, TaskNotFoundError
+from storage import KanbanStorage
+
+
+class DataVersion:
+    """One version of the data; treat `data` and everything reachable from it as read-only"""
+
+    __slots__ = ("data", "number")
+
+    def __init__(self, data: KanbanData, number: int = 0):
+        self.data = data
+        self.number = number
+
+    def edit(self) -> "Draft":
+        """Start a copy-on-write edit of this version"""
+        return Draft(self)
+
+
+class Draft:
+    """Copy-on-write changes to a DataVersion
+
+    board() and task() return copies the draft owns, made on first use;
+    change those, never the objects of the version the draft started from.
+    Reading through `data` is fine, but tasks reached that way (e.g. from
+    board().get_task()) are still shared until task() forks them.
+    """
+
+    def __init__(self, base: DataVersion):
+        self.base = base
+        self.data = base.data.fork()
+        self._boards: Set[str] = set()  # ids of boards forked (or added) by this draft
+        self._tasks: Set[tuple[str, int]] = set()  # (board id, task id) forked by this draft
+
+    def board(self, board_id: Optional[str] = None) -> Board:
+        """The draft's own copy of a board (default board if not specified)"""
+        board_id = board_id or self.data.default_board
+        if board_id in self._boards:
+            return self.data.get_board(board_id)
+        board = self.data.fork_board(board_id)
+        if board is None:
+            raise BoardNotFoundError(f"Board '{board_id}' not found")
+        self._boards.add(board_id)
+        return board
+
+    def task(self, task_id: int, board_id: Optional[str] = None) -> Task:
+        """The draft's own copy of a task, from any board unless `board_id` is given"""
+        if board_id is None:
+            located = self.data.locate_task(task_id)
+            if located is None:
+                raise TaskNotFoundError(f"Task #{task_id} not found")
+            board_id = located.id
+        board = self.board(board_id)
+        if (board_id, task_id) in self._tasks:
+            task = board.get_task(task_id)
+        else:
+            task = board.fork_task(task_id)
+        if task is None:
+            raise TaskNotFoundError(f"Task #{task_id} not found")
+        self._tasks.add((board_id, task_id))
+        return task
+
+    def add_board(self, board: Board) -> None:
+        """Append a new board, which the draft owns"""
+        self.data.boards.append(board)
+        self._boards.add(board.id)
+
+    def move_tasks(self, moves: Dict[int, str], board_id: Optional[str] = None, reason: Optional[str] = None) -> List[Task]:
+        """Board.move_tasks() on the draft's copies; the board is only copied if something moves"""
+        board = self.data.get_board(board_id)
+        if board is None:
+            raise BoardNotFoundError(f"Board '{board_id or self.data.default_board}' not found")
+        planned = board.admit_moves(moves)
+        moved = []
+        for task, column_id in planned:
+            task = self.task(task.id, board.id)
+            task.move_to(column_id, reason)
+            moved.append(task)
+        return moved
+
+    def commit(self) -> DataVersion:
+        """The version this draft's changes make; the draft shouldn't be changed after this
+
+        Tasks with changes not yet saved that the draft didn't fork (history
+        still to be migrated to the storage's log, say) are forked first,
+        because saving marks them written.
+        """
+        for board in list(self.data.boards):
+            for task in board.unsaved_tasks():
+                if (board.id, task.id) not in self._tasks:
+                    self.task(task.id, board.id)
+        return DataVersion(self.data, self.base.number + 1)
+
+
+class VersionCache:
+    """The current DataVersion of a storage, shared by every caller
+
+    current() re-checks the storage on each call (a stat while the file is
+    unchanged, see KanbanStorage.load) and starts a new version when the
+    data on disk changed. The storage should cache what it loads and
+    saves, or every call yields a new version.
+    """
+
+    def __init__(self, storage: KanbanStorage):
+        self.storage = storage
+        self._current: Optional[DataVersion] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> DataVersion:
+        with self._lock:
+            data = self.storage.load()
+            current = self._current
+            if current is None or current.data is not data:
+                current = self._current = DataVersion(data, current.number + 1 if current else 0)
+            return current
+
+    def commit(self, draft: Draft) -> DataVersion:
+        """Save a draft and make it the current version
+
+        As with load/save, the last commit wins if two drafts were started
+        from the same version.
+        """
+        with self._lock:
+            version = draft.commit()
+            self.storage.save(version.data)
+            self._current = version
+            return version